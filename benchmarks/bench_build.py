@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark the site build on synthetic corpora 10x to 100x today's size.
+
+For each scale, generates a corpus with benchmarks/corpus.py in a
+temporary directory and times every stage of the pipeline over all of it:
+
+- frontmatter   parse_frontmatter, cold cache
+- wiki_links    convert_wiki_links
+- markdown      the reused markdown engine
+- template      create_html_page
+- navigation    build_metadata_index and every navigation page
+- questions     aggregate, bundle, shard and block the question bank
+- search        index the built pages and the questions
+- full_build    convert-markdown.py main(force=True) without the render cache
+- cached_build  main(force=True) with a warm render cache, as in CI
+- noop_build    convert-markdown.py main() with nothing changed
+
+Results are compared with benchmarks/baseline.json, and stages slower than
+the baseline by more than --tolerance are reported (exit status 1 with
+--check). --save records the current run as the new baseline. Timings only
+compare between runs on the same machine; the baseline records which.
+
+Run from anywhere: python3 benchmarks/bench_build.py [--scale 10 --scale 100]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from corpus import generate_corpus  # noqa: E402
+from sitebuild import frontmatter, navigation, questions, search  # noqa: E402
+from sitebuild.build import load_converter  # noqa: E402
+
+STAGES = ('frontmatter', 'wiki_links', 'markdown', 'template', 'navigation',
+          'questions', 'search', 'full_build', 'cached_build', 'noop_build')
+DEFAULT_SCALES = (10, 100)
+
+def measure(run, repeat):
+    """Call run() repeat times; return the median seconds and the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+def machine():
+    """Describe the machine, to tell whether a baseline is comparable."""
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count()
+    }
+
+def time_stages(converter, root, repeat=1, jobs=1):
+    """Time every stage on the corpus under root. Returns {stage: seconds}."""
+    study_output = root / 'study'
+    exam_dir = root / 'exam'
+    exam_dir.mkdir(exist_ok=True)
+
+    pages = converter.collect_pages(root, study_output)
+    link_index = converter.build_link_index(pages)
+    sources = [page['source'].read_text(encoding='utf-8') for page in pages]
+    timings = {}
+
+    def parse_all():
+        frontmatter._cache.clear()
+        return [frontmatter.parse_frontmatter(source) for source in sources]
+
+    timings['frontmatter'], parsed = measure(parse_all, repeat)
+
+    timings['wiki_links'], bodies = measure(lambda: [
+        converter.convert_wiki_links(body, link_index, page['link_prefix'])
+        for page, (_, body) in zip(pages, parsed)
+    ], repeat)
+
+    timings['markdown'], rendered = measure(lambda: [
+        converter.get_markdown_engine().convert(body) for body in bodies
+    ], repeat)
+
+    def titled():
+        for (meta, _), page in zip(parsed, pages):
+            yield meta.get('title', navigation.DEFAULT_TITLE), meta, page['base_path']
+
+    timings['template'], _ = measure(lambda: [
+        converter.create_html_page(title, content, meta, base_path)
+        for (title, meta, base_path), content in zip(titled(), rendered)
+    ], repeat)
+
+    def build_navigation():
+        index = navigation.build_metadata_index(
+            {
+                'source_rel': page['source_rel'],
+                'output_rel': page['output_rel'],
+                'domain': page['domain'],
+                'title': title,
+                'frontmatter': meta,
+                'words': converter.count_words(content)
+            }
+            for page, (title, meta, _), content in zip(pages, titled(), rendered)
+        )
+        return [create(*args) for create, args in navigation.navigation_pages(index).values()]
+
+    timings['navigation'], _ = measure(build_navigation, repeat)
+
+    def build_questions():
+        question_sets, _ = questions.aggregate_questions(root / 'questions')
+        questions.write_question_bundle(question_sets, exam_dir, compact=True)
+        questions.write_question_shards(question_sets, exam_dir, compact=True)
+        questions.write_exam_blueprint(question_sets, exam_dir, compact=True)
+        return question_sets
+
+    timings['questions'], question_sets = measure(build_questions, repeat)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        timings['full_build'], _ = measure(
+            lambda: converter.main(force=True, jobs=jobs, project_root=root, cache_dir=None), repeat)
+        converter.main(force=True, jobs=jobs, project_root=root)
+        timings['cached_build'], _ = measure(
+            lambda: converter.main(force=True, jobs=jobs, project_root=root), repeat)
+        timings['noop_build'], _ = measure(
+            lambda: converter.main(jobs=jobs, project_root=root), repeat)
+
+    def build_search():
+        documents = list(search.page_documents(study_output)) + list(search.question_documents(question_sets))
+        docs, postings = search.build_index(documents)
+        return search.write_search_index(docs, postings, study_output)
+
+    timings['search'], _ = measure(build_search, repeat)
+
+    return {stage: timings[stage] for stage in STAGES}
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'machine': None, 'scales': {}}
+
+def print_results(scale, counts, timings, baseline, tolerance):
+    """Print one scale's timings against the baseline; return the regressions."""
+    page_count, question_count = counts
+    previous = baseline['scales'].get(str(scale), {}).get('stages', {})
+    regressions = []
+
+    print(f"\nScale {scale}x: {page_count:,} pages, {question_count:,} question files")
+    print(f"  {'Stage':<13}{'Seconds':>10}{'ms/page':>10}{'Baseline':>10}{'Change':>9}")
+    for stage, seconds in timings.items():
+        line = f"  {stage:<13}{seconds:>10.3f}{seconds / page_count * 1000:>10.2f}"
+        if stage in previous:
+            change = seconds / previous[stage] - 1
+            line += f"{previous[stage]:>10.3f}{change * 100:>+8.0f}%"
+            if change > tolerance:
+                line += '  ⚠️'
+                regressions.append((scale, stage, change))
+        print(line)
+
+    return regressions
+
+def print_scaling(results):
+    """Print how much each stage slowed down per step in corpus size."""
+    scales = sorted(results)
+    for smaller, larger in zip(scales, scales[1:]):
+        growth = larger / smaller
+        print(f"\nScaling {smaller}x → {larger}x ({growth:.0f}x the content; ~{growth:.0f}x is linear):")
+        for stage in STAGES:
+            ratio = results[larger][stage] / results[smaller][stage]
+            print(f"  {stage:<13}{ratio:>8.1f}x{'  superlinear' if ratio > growth * 1.5 else ''}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the build on synthetic corpora.')
+    parser.add_argument('--scale', type=int, action='append',
+                        help='corpus size as a multiple of the real one; repeatable (default: 10 and 100)')
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per stage, the median is kept')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='worker processes for the full build')
+    parser.add_argument('--seed', type=int, default=1, help='corpus random seed')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='slowdown over the baseline reported as a regression (default: 0.25)')
+    parser.add_argument('--save', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--check', action='store_true', help='exit with status 1 on a regression')
+    args = parser.parse_args()
+
+    converter = load_converter()
+    baseline = load_baseline(BASELINE_PATH)
+    if baseline['machine'] and baseline['machine'] != machine():
+        print(f"Note: the baseline was recorded on {baseline['machine']['platform']} "
+              f"with {baseline['machine']['cpus']} CPUs; timings may not compare")
+
+    results = {}
+    regressions = []
+    for scale in args.scale or DEFAULT_SCALES:
+        with tempfile.TemporaryDirectory(prefix=f'corpus-{scale}x-') as directory:
+            root = Path(directory)
+            counts = generate_corpus(root, scale, args.seed)
+            results[scale] = time_stages(converter, root, args.repeat, args.jobs)
+        regressions += print_results(scale, counts, results[scale], baseline, args.tolerance)
+
+    print_scaling(results)
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} stage(s) more than {args.tolerance:.0%} slower than the baseline")
+
+    if args.save:
+        baseline['machine'] = machine()
+        for scale, timings in results.items():
+            baseline['scales'][str(scale)] = {
+                'seed': args.seed,
+                'jobs': args.jobs,
+                'stages': {stage: round(seconds, 4) for stage, seconds in timings.items()}
+            }
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+
+    if args.check and regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
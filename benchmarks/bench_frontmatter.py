@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: the old split-based frontmatter parser vs sitebuild.frontmatter.
+
+Parses every study page's frontmatter with content.split('---', 2) and
+yaml.safe_load, then with the line scanner and the C loader, cold and with
+a warm cache, and reports the per-page cost.
+Run from anywhere: python3 benchmarks/bench_frontmatter.py
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sitebuild import frontmatter  # noqa: E402
+
+def split_parse(content):
+    """The parser convert-markdown.py used before sitebuild.frontmatter."""
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            try:
+                return yaml.safe_load(parts[1]), parts[2].strip()
+            except yaml.YAMLError:
+                pass
+    return {}, content
+
+def load_documents():
+    """Return the contents of every markdown source with frontmatter."""
+    sources = sorted(PROJECT_ROOT.glob('*.md')) + sorted(PROJECT_ROOT.glob('*/*.md'))
+    return [
+        content for content in (path.read_text(encoding='utf-8') for path in sources)
+        if content.startswith('---')
+    ]
+
+def time_pass(documents, parse):
+    """Parse every document once and return the elapsed seconds."""
+    start = time.perf_counter()
+    for content in documents:
+        parse(content)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5, help='timed passes per variant')
+    args = parser.parse_args()
+
+    documents = load_documents()
+
+    # Both parsers must agree wherever the old one split correctly
+    for content in documents:
+        old, _ = split_parse(content)
+        new, _ = frontmatter.parse_frontmatter(content)
+        assert old == new
+
+    def cold(content):
+        frontmatter._cache.clear()
+        return frontmatter.parse_frontmatter(content)
+
+    variants = [
+        ('split + yaml.safe_load', split_parse),
+        (f'scanner + {frontmatter.SafeLoader.__name__}', cold),
+        ('scanner + warm cache', frontmatter.parse_frontmatter)
+    ]
+
+    print(f"Documents per pass:       {len(documents)}")
+    baseline = None
+    for name, parse in variants:
+        per_page = statistics.median(time_pass(documents, parse) for _ in range(args.repeat)) / len(documents)
+        baseline = baseline or per_page
+        print(f"{name + ':':<26}{per_page * 1000:.3f} ms/page ({baseline / per_page:.1f}x)")
+
+if __name__ == '__main__':
+    main()
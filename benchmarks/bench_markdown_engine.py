@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: a new markdown.Markdown per page vs one reused engine.
+
+Converts every study page body both ways and reports the per-page cost.
+Reusing the engine can save at most its construction per page; with the
+extensions the build uses (Pygments highlighting included), converting a
+page costs far more than that, and any larger difference between the
+two variants is timing noise, in either direction.
+
+Run from anywhere: python3 benchmarks/bench_markdown_engine.py
+"""
+
+import argparse
+import importlib.util
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import markdown
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+def load_converter():
+    """Import convert-markdown.py, whose file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location(
+        'convert_markdown',
+        PROJECT_ROOT / 'convert-markdown.py'
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def load_bodies(converter):
+    """Return the markdown bodies of every page the build converts."""
+    study_output = PROJECT_ROOT / 'study'
+    bodies = []
+
+    for page in converter.collect_pages(PROJECT_ROOT, study_output):
+        md_content = page['source'].read_text(encoding='utf-8')
+        _, body = converter.parse_frontmatter(md_content)
+        bodies.append(converter.convert_wiki_links(body))
+
+    return bodies
+
+def time_pass(bodies, convert):
+    """Convert every body once and return the elapsed seconds."""
+    start = time.perf_counter()
+    for body in bodies:
+        convert(body)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5, help='timed passes per variant')
+    args = parser.parse_args()
+
+    converter = load_converter()
+    extensions = converter.MARKDOWN_EXTENSIONS
+    configs = converter.MARKDOWN_EXTENSION_CONFIGS
+    bodies = load_bodies(converter)
+
+    def fresh(body):
+        return markdown.Markdown(extensions=extensions, extension_configs=configs).convert(body)
+
+    engine = markdown.Markdown(extensions=extensions, extension_configs=configs)
+
+    def reused(body):
+        return engine.reset().convert(body)
+
+    # Both variants must produce identical HTML
+    for body in bodies:
+        assert fresh(body) == reused(body)
+
+    # Construction alone, without any document
+    start = time.perf_counter()
+    for _ in range(200):
+        markdown.Markdown(extensions=extensions, extension_configs=configs)
+    construct = (time.perf_counter() - start) / 200
+
+    fresh_times = [time_pass(bodies, fresh) for _ in range(args.repeat)]
+    reused_times = [time_pass(bodies, reused) for _ in range(args.repeat)]
+
+    fresh_page = statistics.median(fresh_times) / len(bodies)
+    reused_page = statistics.median(reused_times) / len(bodies)
+
+    print(f"Pages per pass:           {len(bodies)}")
+    print(f"Engine construction:      {construct * 1000:.3f} ms ({construct / fresh_page * 100:.1f}% of a page)")
+    print(f"New engine per page:      {fresh_page * 1000:.3f} ms/page")
+    print(f"Reused engine per page:   {reused_page * 1000:.3f} ms/page")
+    print(f"Reused minus new:         {(reused_page - fresh_page) * 1000:+.3f} ms/page "
+          f"({(reused_page / fresh_page - 1) * 100:+.1f}%)")
+    print(f"Reuse saves at most:      {construct * 1000:.3f} ms/page, the construction; the rest is noise")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Synthetic study corpus for the build benchmarks.
+
+generate_corpus() writes a project tree laid out like this repository, with
+the pages the build converts (3 root documents, comparisons/ and four
+domain-N-*/ directories) and questions/, multiplied by a scale factor:
+scale 10 is ten times today's 45 converted pages and 34 question files.
+
+Pages have frontmatter with tasks and exam topics, dense wiki links (with
+display text and heading anchors) to other generated pages, large tables,
+lists and code fences, and are about as long as the real ones. Text is
+drawn from the vocabulary of the real sources, so tokenizing and search
+see realistic words. Output depends only on scale and seed.
+
+Run from anywhere: python3 benchmarks/corpus.py OUTPUT_DIR --scale 10
+"""
+
+import argparse
+import json
+import random
+import re
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Converted pages per scale unit, as in the real tree
+ROOT_DOCUMENTS = ('INDEX.md', 'MASTER_STUDY_PLAN.md', 'AWS-SA-PRO-CHEATSHEET.md')
+COMPARISON_PAGES = 12
+DOMAIN_PAGES = {1: 8, 2: 5, 3: 9, 4: 8}
+QUESTION_FILES = 34
+QUESTIONS_PER_FILE = 30
+
+DOMAIN_DIRS = {
+    1: 'domain-1-organizational-complexity',
+    2: 'domain-2-new-solutions',
+    3: 'domain-3-continuous-improvement',
+    4: 'domain-4-migration-modernization'
+}
+DOMAIN_TITLES = {
+    1: ('Design Solutions for Organizational Complexity', '26%'),
+    2: ('Design for New Solutions', '29%'),
+    3: ('Continuous Improvement for Existing Solutions', '25%'),
+    4: ('Accelerate Workload Migration and Modernization', '20%')
+}
+
+SERVICES = (
+    'VPC', 'Transit Gateway', 'Direct Connect', 'PrivateLink', 'Route 53', 'CloudFront',
+    'S3', 'EBS', 'EFS', 'FSx', 'DynamoDB', 'Aurora', 'RDS', 'ElastiCache', 'Lambda',
+    'ECS', 'EKS', 'Fargate', 'SQS', 'SNS', 'EventBridge', 'Kinesis', 'Glue', 'Athena',
+    'KMS', 'IAM', 'Organizations', 'Control Tower', 'GuardDuty', 'Security Hub',
+    'CloudWatch', 'CloudTrail', 'Config', 'DMS', 'MGN', 'DataSync', 'Snowball'
+)
+SECTION_WORDS = ('Overview', 'Architecture', 'Decision Criteria', 'Limits', 'Pricing',
+                 'Resilience', 'Security', 'Exam Tips', 'Scenarios', 'Comparison')
+
+FALLBACK_WORDS = '''
+account application architecture availability backup bandwidth capacity
+cluster compliance configuration connection cost cross database deployment
+encryption endpoint failover gateway global hybrid latency migration network
+organization performance policy primary region replication requirement
+resilient routing scaling security service storage throughput traffic
+workload zone
+'''.split()
+
+WORD_PATTERN = re.compile(r'\b[a-z]{3,14}\b')
+
+def load_vocabulary():
+    """Return the distinct words of the real markdown sources."""
+    words = set()
+    for path in list(PROJECT_ROOT.glob('*.md')) + list(PROJECT_ROOT.glob('*/*.md')):
+        words.update(WORD_PATTERN.findall(path.read_text(encoding='utf-8').lower()))
+    return sorted(words) or FALLBACK_WORDS
+
+def slug(words):
+    return '-'.join(words).lower().replace(' ', '-')
+
+def plan_pages(scale, rng, vocabulary):
+    """Return the generated pages as dicts with their source path and title."""
+    pages = [
+        {'source': name, 'title': name[:-3].replace('-', ' ').title(), 'domain': None, 'task': None}
+        for name in ROOT_DOCUMENTS
+    ]
+
+    for i in range(COMPARISON_PAGES * scale):
+        words = rng.sample(vocabulary, 2)
+        pages.append({
+            'source': f'comparisons/{slug(words)}-{i}-comparison.md',
+            'title': f'{" ".join(words).title()} Comparison',
+            'domain': None,
+            'task': None
+        })
+
+    for domain, count in DOMAIN_PAGES.items():
+        pages.append({'source': f'{DOMAIN_DIRS[domain]}/README.md', 'title': f'Domain {domain} Overview',
+                      'domain': domain, 'task': None})
+        for i in range(1, count * scale):
+            words = rng.sample(vocabulary, 3)
+            task = f'{domain}.{i}'
+            pages.append({
+                'source': f'{DOMAIN_DIRS[domain]}/task-{task}-{slug(words)}.md',
+                'title': f'Task {task}: {" ".join(words).title()}',
+                'domain': domain,
+                'task': task
+            })
+
+    return pages
+
+class PageWriter:
+    """Random markdown in the style of the study pages."""
+
+    def __init__(self, rng, vocabulary, pages, topics):
+        self.rng = rng
+        self.vocabulary = vocabulary
+        self.pages = pages
+        self.topics = topics
+
+    def words(self, count):
+        return ' '.join(self.rng.choice(self.vocabulary) for _ in range(count))
+
+    def wiki_link(self):
+        target = self.rng.choice(self.pages)
+        path = target['source'][:-3]
+        kind = self.rng.random()
+        if kind < 0.4:
+            return f'[[{path}|{target["title"]}]]'
+        if kind < 0.7:
+            return f'[[{path}#{self.rng.choice(SECTION_WORDS)}]]'
+        return f'[[{path}]]'
+
+    def sentence(self, links=0):
+        parts = [self.words(self.rng.randint(6, 14))]
+        for _ in range(links):
+            parts.append(self.wiki_link())
+            parts.append(self.words(self.rng.randint(3, 8)))
+        if self.rng.random() < 0.3:
+            parts.insert(1, f'**{self.rng.choice(SERVICES)}**')
+        if self.rng.random() < 0.2:
+            parts.append(f'`{self.rng.choice(self.vocabulary)}-{self.rng.randint(1, 99)}`')
+        text = ' '.join(parts)
+        return text[0].upper() + text[1:] + '.'
+
+    def paragraph(self):
+        return ' '.join(self.sentence(self.rng.randint(0, 2)) for _ in range(self.rng.randint(3, 6)))
+
+    def bullet_list(self):
+        return '\n'.join(f'- **{self.rng.choice(SERVICES)}**: {self.sentence(self.rng.randint(0, 1))}'
+                         for _ in range(self.rng.randint(4, 8)))
+
+    def table(self, rows):
+        columns = self.rng.randint(4, 6)
+        header = ['Service'] + [self.words(2).title() for _ in range(columns - 1)]
+        lines = ['| ' + ' | '.join(header) + ' |', '|' + '---|' * columns]
+        for _ in range(rows):
+            cells = [f'**{self.rng.choice(SERVICES)}**']
+            for _ in range(columns - 1):
+                roll = self.rng.random()
+                if roll < 0.1:
+                    cells.append(self.wiki_link())
+                elif roll < 0.3:
+                    cells.append(self.rng.choice(('✅', '❌', '⚠️ Partial')))
+                else:
+                    cells.append(self.words(self.rng.randint(1, 5)))
+            lines.append('| ' + ' | '.join(cells) + ' |')
+        return '\n'.join(lines)
+
+    def code_block(self):
+        lines = [f'{self.rng.choice(self.vocabulary)} = "{self.words(3)}"' for _ in range(self.rng.randint(3, 10))]
+        return '```python\n' + '\n'.join(lines) + '\n```'
+
+    def frontmatter(self, page):
+        lines = ['---', f'title: "{page["title"]}"']
+        if page['domain']:
+            name, weight = DOMAIN_TITLES[page['domain']]
+            lines += [f'domain: {page["domain"]}', f'domain_name: "{name}"']
+            if page['task']:
+                # Quoted, or task 1.10 would load as the number 1.1
+                lines.append(f'task: "{page["task"]}"')
+            lines.append(f'weight: "{weight}"')
+        lines.append('exam_topics:')
+        lines += [f'  - {topic}' for topic in self.rng.sample(self.topics, self.rng.randint(3, 8))]
+        lines += ['status: complete', 'last_updated: "2025-11-18"', '---']
+        return '\n'.join(lines)
+
+    def page(self, page, sections, table_rows):
+        blocks = [self.frontmatter(page), '', f'# {page["title"]}', '', '## Overview', self.paragraph()]
+        for i in range(sections):
+            blocks += ['', '---', '', f'## {i + 1}. {self.rng.choice(SECTION_WORDS)}', self.paragraph()]
+            for _ in range(self.rng.randint(1, 3)):
+                blocks += ['', f'### {self.words(3).title()}', self.paragraph(), '', self.bullet_list()]
+            if self.rng.random() < 0.6:
+                blocks += ['', self.table(self.rng.randint(table_rows // 2, table_rows))]
+            if self.rng.random() < 0.3:
+                blocks += ['', self.code_block()]
+        return '\n'.join(blocks) + '\n'
+
+def question_file(rng, writer, index):
+    """Return one question file in the simple (flat questions array) layout."""
+    domain = index % 4 + 1
+    task = f'{domain}.{index // 4 + 1}'
+    questions = []
+
+    for _ in range(QUESTIONS_PER_FILE):
+        options = [writer.sentence() for _ in range(rng.choice((4, 4, 4, 5)))]
+        if rng.random() < 0.15:
+            answer = sorted(rng.sample(range(len(options)), 2))
+            question_type = 'multiple'
+        else:
+            answer = rng.randrange(len(options))
+            question_type = 'single'
+        questions.append({
+            'type': question_type,
+            'question': ' '.join(writer.sentence() for _ in range(rng.randint(3, 5))) + ' What should they do?',
+            'options': options,
+            'correctAnswer': answer,
+            'explanation': ' '.join(writer.sentence() for _ in range(rng.randint(4, 7)))
+        })
+
+    return {
+        'domain': f'Domain {domain}: {DOMAIN_TITLES[domain][0]}',
+        'task': f'Task {task}: {writer.words(3).title()}',
+        'question_count': len(questions),
+        'questions': questions
+    }
+
+def generate_corpus(root, scale=10, seed=1):
+    """Write a synthetic corpus of the given scale under root.
+
+    Returns the number of pages and question files written.
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+    vocabulary = load_vocabulary()
+
+    pages = plan_pages(scale, rng, vocabulary)
+    # The number of distinct topics grows more slowly than the corpus
+    topics = [slug(rng.sample(vocabulary, 2)) for _ in range(40 + 8 * scale)]
+    writer = PageWriter(rng, vocabulary, pages, topics)
+
+    for page in pages:
+        path = root / page['source']
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if page['source'] == 'AWS-SA-PRO-CHEATSHEET.md':
+            # One very large document with long tables, like the real cheatsheet
+            content = writer.page(page, sections=24, table_rows=60)
+        else:
+            content = writer.page(page, sections=rng.randint(3, 9), table_rows=30)
+        path.write_text(content, encoding='utf-8')
+
+    questions_dir = root / 'questions'
+    questions_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(QUESTION_FILES * scale):
+        data = question_file(rng, writer, index)
+        (questions_dir / f'synthetic-{index:05d}.json').write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+    return len(pages), QUESTION_FILES * scale
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic study corpus.')
+    parser.add_argument('output', type=Path, help='directory to write the corpus to')
+    parser.add_argument('--scale', type=int, default=10, help='multiple of the real corpus size (default: 10)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    pages, question_files = generate_corpus(args.output, args.scale, args.seed)
+    print(f"Wrote {pages} pages and {question_files} question files to {args.output}")
+
+if __name__ == '__main__':
+    main()
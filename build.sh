@@ -3,27 +3,30 @@
 
 set -e  # Exit on error
 
-echo "🔨 Building AWS SA Pro Kit website..."
-echo ""
+# Run from the repository root so `python3 -m sitebuild...` resolves
+cd "$(dirname "$0")"
 
-# Check for Python dependencies
-echo "📦 Installing dependencies..."
-pip install -q pyyaml markdown 2>/dev/null || pip install pyyaml markdown
+echo "🔨 Building AWS SA Pro Kit website..."
 
-# Convert markdown files to HTML
-echo "📝 Converting markdown files to HTML..."
-python3 convert-markdown.py
+# Only install the Python dependencies when they are missing. Pygments is
+# optional: without it code blocks are highlighted by highlight.js at run time
+if ! python3 -c "import markdown, yaml" 2>/dev/null; then
+    echo "📦 Installing dependencies..."
+    pip install -q pyyaml markdown pygments 2>/dev/null || pip install pyyaml markdown pygments
+fi
 
-# Build navigation pages
-echo "🗺️  Building navigation pages..."
-python3 build-navigation.py
+# Every stage runs in one process (see sitebuild/build.py). Arguments are
+# passed on: targets such as `exam`, --minify, --force, -j N
+python3 -m sitebuild.build "$@"
 
-echo ""
-echo "✅ Build complete!"
 echo ""
 echo "📂 Generated files in:"
 echo "   - study/          (Main study materials)"
 echo "   - study/domain-*/ (Domain-specific content)"
+echo "   - study/search/   (Search index shards)"
+echo "   - exam/data/      (Exam question shards)"
+echo "   - dist/           (Everything the deploy publishes)"
 echo ""
 echo "To test locally, run: python3 -m http.server 8000"
 echo "Then visit: http://localhost:8000"
+echo "While editing, run: python3 convert-markdown.py --watch (rebuilds and reloads on save)"
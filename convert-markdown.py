@@ -6,68 +6,150 @@ Handles YAML frontmatter, wiki-style links, and standard markdown.
 
 import os
 import re
-import yaml
+import posixpath
+import json
+import hashlib
+import inspect
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import markdown
 from pathlib import Path
-from markdown.extensions import tables, fenced_code, toc
+from markdown.extensions import toc
 import html
 
-def parse_frontmatter(content):
-    """Extract YAML frontmatter from markdown content."""
-    frontmatter = {}
-    body = content
-
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            try:
-                frontmatter = yaml.safe_load(parts[1])
-                body = parts[2].strip()
-            except yaml.YAMLError:
-                pass
-
-    return frontmatter, body
-
-def convert_wiki_links(content):
-    """Convert Obsidian wiki-style links to HTML links."""
-    # Pattern: [[path/to/file|Display Text]] or [[path/to/file]]
+from sitebuild import assets, devserver, highlight, navigation, output, profiling, related, rendercache, sections, template
+from sitebuild.frontmatter import frontmatter_hash, parse_frontmatter, seed_cache, split_frontmatter
+from sitebuild.profiling import timed
+from sitebuild.template import inline_asset_overhead, render_page
+
+MARKDOWN_EXTENSIONS = [
+    'tables',
+    'fenced_code',
+    'toc',
+    'nl2br',
+    'sane_lists'
+]
+MARKDOWN_EXTENSION_CONFIGS = {}
+
+# Highlight fenced code at build time when Pygments is installed
+if highlight.STYLESHEET is not None:
+    MARKDOWN_EXTENSIONS.append(highlight.EXTENSION)
+    MARKDOWN_EXTENSION_CONFIGS[highlight.EXTENSION] = highlight.EXTENSION_CONFIG
+
+# Incremental build manifest, stored next to the generated pages
+MANIFEST_NAME = '.build-manifest.json'
+# Written by --profile, next to the manifest
+PROFILE_TRACE_NAME = '.build-profile.json'
+MANIFEST_VERSION = 7
+
+# Markdown converter reused across pages, created lazily once per process
+_markdown_engine = None
+
+WIKI_LINK_PATTERN = re.compile(r'\[\[([^\]]+)\]\]')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+# Highlighted code wraps each token in a span, inside words as well
+SPAN_TAG_PATTERN = re.compile(r'</?span\b[^>]*>')
+
+# Source directory prefixes and their output directories, used for links
+# whose target is not a page of this build
+SOURCE_DIR_OUTPUTS = {
+    'domain-1-organizational-complexity/': 'domain-1/',
+    'domain-2-new-solutions/': 'domain-2/',
+    'domain-3-continuous-improvement/': 'domain-3/',
+    'domain-4-migration-modernization/': 'domain-4/'
+}
+SOURCE_DIR_PATTERN = re.compile('|'.join(re.escape(d) for d in SOURCE_DIR_OUTPUTS))
+
+# Documents rendered as an overview and one page per heading of the given
+# level, see sitebuild.sections
+SPLIT_DOCUMENTS = {
+    'AWS-SA-PRO-CHEATSHEET.md': sections.SPLIT_LEVEL,
+    'MASTER_STUDY_PLAN.md': sections.SPLIT_LEVEL
+}
+
+def wiki_link_key(path):
+    """Normalise a wiki-link target to the source path it refers to."""
+    path = path.strip()
+    if not path.endswith('.md') and not path.endswith('.html'):
+        path += '.md'
+    return path
+
+def build_link_index(pages):
+    """Map each page's source path to its output path, relative to study/.
+
+    Headings of split documents that moved to a section page are mapped
+    as 'source#anchor' to that page.
+    """
+    link_index = {page['source_rel']: page['output_rel'] for page in pages}
+
+    for page in pages:
+        for anchor, output_rel in page.get('sections', {}).items():
+            link_index[f"{page['source_rel']}#{anchor}"] = output_rel
+
+    return link_index
+
+def fallback_link_path(key):
+    """Guess an output path for a target missing from the link index."""
+    html_path = SOURCE_DIR_PATTERN.sub(lambda m: SOURCE_DIR_OUTPUTS[m.group(0)], key)
+    if html_path.endswith('.md'):
+        html_path = html_path[:-3] + '.html'
+    return html_path
+
+def convert_wiki_links(content, link_index=None, link_prefix=''):
+    """Convert Obsidian wiki-style links to HTML links.
+
+    Each target is resolved with a single lookup in link_index (see
+    build_link_index) and prefixed with link_prefix to make it relative to
+    the page. Targets missing from the index get a best-guess href; main()
+    reports them as broken links.
+    """
+    if link_index is None:
+        link_index = {}
+
+    # Pattern: [[path/to/file|Display Text]], [[path/to/file]] or [[file#Heading]]
     def replace_link(match):
-        full_match = match.group(0)
-        link_content = match.group(1)
+        target, _, display = match.group(1).partition('|')
+        path, _, anchor = target.partition('#')
 
-        if '|' in link_content:
-            path, display = link_content.split('|', 1)
-        else:
-            path = link_content
+        if not display:
             # Use the last part of the path as display text
             display = path.split('/')[-1].replace('-', ' ').title()
 
-        # Convert file path to HTML path
-        html_path = path.strip()
+        key = wiki_link_key(path)
+        html_path = link_index.get(key)
 
-        # Map source directory names to output directory names
-        html_path = html_path.replace('domain-1-organizational-complexity/', 'domain-1/')
-        html_path = html_path.replace('domain-2-new-solutions/', 'domain-2/')
-        html_path = html_path.replace('domain-3-continuous-improvement/', 'domain-3/')
-        html_path = html_path.replace('domain-4-migration-modernization/', 'domain-4/')
+        if html_path is None:
+            html_path = fallback_link_path(key)
 
-        if not html_path.endswith('.html'):
-            html_path = html_path.replace('.md', '.html')
-            if '/' not in html_path:
-                html_path += '.html'
-            else:
-                # Add .html if path doesn't have it
-                html_path += '.html'
+        if anchor:
+            anchor = toc.slugify(anchor, '-')
+            html_path = link_index.get(f'{key}#{anchor}', html_path) + '#' + anchor
 
-        return f'<a href="{html_path}">{display.strip()}</a>'
+        return f'<a href="{link_prefix}{html_path}">{display.strip()}</a>'
 
     # Replace wiki-style links
-    content = re.sub(r'\[\[([^\]]+)\]\]', replace_link, content)
+    content = WIKI_LINK_PATTERN.sub(replace_link, content)
 
     return content
 
-def create_html_page(title, content, frontmatter=None, base_path='..'):
-    """Create a complete HTML page with navigation and styling."""
+def related_pages_html(related_pages):
+    """Return the block listing (href, title) pairs of related pages."""
+    items = ''.join(
+        f'\n                    <li><a href="{href}">{html.escape(title)}</a></li>'
+        for href, title in related_pages
+    )
+    return f'''
+            <aside class="related-pages">
+                <h2>Related pages</h2>
+                <ul>{items}
+                </ul>
+            </aside>'''
+
+def page_chunks(title, content, frontmatter=None, base_path='..', related_pages=None):
+    """Yield a complete HTML page with navigation and styling, chunk by chunk.
+
+    related_pages, (href, title) pairs, are listed after the content.
+    """
 
     # Extract metadata for page header
     domain = frontmatter.get('domain', '') if frontmatter else ''
@@ -95,6 +177,14 @@ def create_html_page(title, content, frontmatter=None, base_path='..'):
         if task:
             meta_items.append(f'<span class="meta-item"><strong>Task:</strong> {task}</span>')
 
+        topics = frontmatter.get('exam_topics') or []
+        if topics:
+            topic_links = ' '.join(
+                f'<a href="{base_path}/study/{navigation.TAGS_DIR}/{navigation.topic_slug(topic)}.html" class="topic-tag">{html.escape(str(topic))}</a>'
+                for topic in topics
+            )
+            meta_items.append(f'<span class="meta-item"><strong>Topics:</strong> {topic_links}</span>')
+
         if meta_items:
             metadata_html = f'''
             <div class="page-metadata">
@@ -102,119 +192,71 @@ def create_html_page(title, content, frontmatter=None, base_path='..'):
             </div>
             '''
 
-    html_template = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{html.escape(title)} - AWS SA Pro Kit</title>
-    <link rel="stylesheet" href="{base_path}/styles/study.css">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/github-dark.min.css">
-</head>
-<body>
-    <button id="darkModeToggle" class="dark-mode-toggle" aria-label="Toggle dark mode">
-        <span class="icon">🌙</span>
-    </button>
-
-    <nav class="top-nav">
-        <div class="nav-container">
-            <a href="{base_path}/index.html" class="nav-brand">AWS SA Pro Kit</a>
-            <div class="nav-links">
-                <a href="{base_path}/index.html">Home</a>
-                <a href="{base_path}/study/index.html" class="active">Study Materials</a>
-                <a href="{base_path}/exam/index.html">Practice Exam</a>
-                <a href="https://github.com/bkondakor/aws-sa-pro-kit" target="_blank">GitHub</a>
-            </div>
-        </div>
-    </nav>
-
-    <div class="container">
-        {breadcrumb}
-        <main class="content">
-            <article>
-                {metadata_html}
-                {content}
-            </article>
-        </main>
-
-        <aside class="sidebar">
-            <div class="sidebar-section">
-                <h3>Navigation</h3>
-                <ul>
-                    <li><a href="{base_path}/study/index.html">Study Home</a></li>
-                    <li><a href="{base_path}/study/domain-1.html">Domain 1 (26%)</a></li>
-                    <li><a href="{base_path}/study/domain-2.html">Domain 2 (29%)</a></li>
-                    <li><a href="{base_path}/study/domain-3.html">Domain 3 (25%)</a></li>
-                    <li><a href="{base_path}/study/domain-4.html">Domain 4 (20%)</a></li>
-                    <li><a href="{base_path}/study/comparisons/index.html">🔀 Service Comparisons</a></li>
-                </ul>
-            </div>
-            <div class="sidebar-section">
-                <h3>Quick Links</h3>
-                <ul>
-                    <li><a href="{base_path}/study/cheatsheet.html" style="background: linear-gradient(135deg, #FFB84D 0%, #FF8C42 100%); padding: 8px 12px; border-radius: 6px; color: #0f0f1e; font-weight: 700; display: block; text-align: center; margin-bottom: 8px;">📋 Cheatsheet</a></li>
-                    <li><a href="{base_path}/exam/index.html">Practice Exam</a></li>
-                    <li><a href="https://aws.amazon.com/certification/certified-solutions-architect-professional/" target="_blank">Official Exam</a></li>
-                </ul>
-            </div>
-        </aside>
-    </div>
-
-    <footer class="footer">
-        <p>AWS Solutions Architect Professional Exam Preparation Kit</p>
-        <p>Last updated: {frontmatter.get('last_updated', '2025') if frontmatter else '2025'}</p>
-    </footer>
-
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js"></script>
-    <script>hljs.highlightAll();</script>
-    <script>
-        // Dark Mode Functionality
-        const darkModeToggle = document.getElementById('darkModeToggle');
-        const icon = darkModeToggle.querySelector('.icon');
-
-        // Check for saved theme preference or default to light mode
-        const savedTheme = localStorage.getItem('theme');
-        if (savedTheme === 'dark') {{
-            document.body.classList.add('dark-mode');
-            icon.textContent = '☀️';
-        }}
-
-        // Toggle dark mode
-        darkModeToggle.addEventListener('click', () => {{
-            document.body.classList.toggle('dark-mode');
-
-            // Update icon and save preference
-            if (document.body.classList.contains('dark-mode')) {{
-                icon.textContent = '☀️';
-                localStorage.setItem('theme', 'dark');
-            }} else {{
-                icon.textContent = '🌙';
-                localStorage.setItem('theme', 'light');
-            }}
-        }});
-    </script>
-</body>
-</html>'''
-
-    return html_template
-
-def convert_markdown_to_html(md_content, title='Study Material'):
-    """Convert markdown content to HTML."""
+    last_updated = frontmatter.get('last_updated', '2025') if frontmatter else '2025'
+
+    if related_pages:
+        content += related_pages_html(related_pages)
+
+    return render_page(
+        title,
+        content,
+        base_path=base_path,
+        breadcrumb=breadcrumb,
+        metadata=metadata_html,
+        last_updated=str(last_updated),
+        highlight='<pre' in content
+    )
+
+def create_html_page(title, content, frontmatter=None, base_path='..', related_pages=None):
+    """Create a complete HTML page with navigation and styling."""
+    return ''.join(page_chunks(title, content, frontmatter, base_path, related_pages))
+
+def get_markdown_engine():
+    """Return this process's Markdown converter, reset for a new document.
+
+    Constructing markdown.Markdown registers every extension and compiles
+    their patterns, so one instance is kept per process and reset before
+    each page. Pool workers each build their own; the instance must not be
+    shared between threads.
+    """
+    global _markdown_engine
+
+    if _markdown_engine is None:
+        _markdown_engine = markdown.Markdown(
+            extensions=MARKDOWN_EXTENSIONS,
+            extension_configs=MARKDOWN_EXTENSION_CONFIGS
+        )
+
+    return _markdown_engine.reset()
+
+def render_markdown(body, render_cache=None):
+    """Convert a Markdown body to HTML, through render_cache if given."""
+    html_content = render_cache.get(body) if render_cache is not None else None
+    if html_content is None:
+        html_content = get_markdown_engine().convert(body)
+        if render_cache is not None:
+            render_cache.put(body, html_content)
+    return html_content
+
+def convert_markdown_to_html(md_content, title='Study Material', link_index=None, link_prefix='', profile=None,
+                             render_cache=None):
+    """Convert markdown content to HTML.
+
+    profile, a sitebuild.profiling.Profile, records the time of each step.
+    render_cache, a sitebuild.rendercache.RenderCache, holds the HTML of
+    bodies converted before, by this or an earlier build.
+    """
     # Parse frontmatter
-    frontmatter, body = parse_frontmatter(md_content)
+    with timed(profile, 'frontmatter'):
+        frontmatter, body = parse_frontmatter(md_content)
 
     # Convert wiki-style links
-    body = convert_wiki_links(body)
+    with timed(profile, 'wiki_links'):
+        body = convert_wiki_links(body, link_index, link_prefix)
 
     # Convert markdown to HTML
-    md = markdown.Markdown(extensions=[
-        'tables',
-        'fenced_code',
-        'toc',
-        'nl2br',
-        'sane_lists'
-    ])
-    html_content = md.convert(body)
+    with timed(profile, 'markdown'):
+        html_content = render_markdown(body, render_cache)
 
     # Extract title from frontmatter or content
     if frontmatter and 'title' in frontmatter:
@@ -222,82 +264,246 @@ def convert_markdown_to_html(md_content, title='Study Material'):
 
     return html_content, frontmatter, title
 
-def process_markdown_file(input_path, output_path, base_path='..'):
-    """Process a single markdown file and convert to HTML."""
-    print(f"Processing: {input_path}")
+def convert_split_markdown(md_content, split_level, title='Study Material', link_index=None, link_prefix='',
+                           profile=None, render_cache=None):
+    """Convert a document split into sections (see sitebuild.sections).
 
-    with open(input_path, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+    Returns the HTML of the introduction, the sections of
+    sitebuild.sections.split_markdown() with their 'html' added, the
+    frontmatter and the title.
+    """
+    with timed(profile, 'frontmatter'):
+        frontmatter, body = parse_frontmatter(md_content)
 
-    html_content, frontmatter, title = convert_markdown_to_html(md_content)
-    full_html = create_html_page(title, html_content, frontmatter, base_path)
+    intro, parts = sections.split_markdown(body, split_level)
 
-    # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(full_html)
+    with timed(profile, 'wiki_links'):
+        intro = convert_wiki_links(intro, link_index, link_prefix)
+        for part in parts:
+            part['markdown'] = convert_wiki_links(part['markdown'], link_index, link_prefix)
 
-    print(f"Created: {output_path}")
-    return title, frontmatter
+    with timed(profile, 'markdown'):
+        intro_html = render_markdown(intro, render_cache)
+        for part in parts:
+            part['html'] = render_markdown(part['markdown'], render_cache)
 
-def main():
-    """Main conversion process."""
-    project_root = Path(__file__).parent
-    study_output = project_root / 'study'
+    if frontmatter and 'title' in frontmatter:
+        title = frontmatter['title']
 
-    # Create output directory
-    study_output.mkdir(exist_ok=True)
+    return intro_html, parts, frontmatter, title
+
+def count_words(html_content):
+    """Count the words of a page's text, ignoring its markup."""
+    return len(HTML_TAG_PATTERN.sub(' ', SPAN_TAG_PATTERN.sub('', html_content)).split())
+
+def process_markdown_file(input_path, output_path, base_path='..', link_index=None, link_prefix='',
+                          profile=False, writer=None, render_cache=None, split_level=None, related_pages=None):
+    """Process a single markdown file and convert to HTML.
+
+    The page is written with sitebuild.output, or queued on writer, a
+    sitebuild.output.OutputWriter, when one is given. The Markdown is
+    converted through render_cache, if given. With split_level, the page
+    is written as an overview and section pages (see sitebuild.sections),
+    and its results describe the whole document. related_pages,
+    [output path, title] pairs of pages relative to study/, are listed at
+    the end of the page (of the overview of a split document).
+
+    Returns the page's title, frontmatter, word count, (path, written)
+    for each file of the page (written is False if the file already held
+    the page; the list is None if the writes were queued), whether its
+    HTML came from render_cache and, with profile, its stage timings as a
+    sitebuild.profiling.Profile (otherwise None). Writes queued on writer
+    add their 'write' stage to it once they are done.
+    """
+    print(f"Processing: {input_path}")
+    page_profile = profiling.Profile(str(input_path)) if profile else None
+
+    with timed(page_profile, 'read'):
+        with open(input_path, 'r', encoding='utf-8') as f:
+            md_content = f.read()
+
+    hits = render_cache.hits if render_cache is not None else 0
+    if split_level:
+        intro_html, parts, frontmatter, title = convert_split_markdown(
+            md_content,
+            split_level,
+            link_index=link_index,
+            link_prefix=link_prefix,
+            profile=page_profile,
+            render_cache=render_cache
+        )
+        html_content = intro_html + ''.join(part['html'] for part in parts)
+        layout = sections.section_pages(output_path.name, title, intro_html, parts, split_level)
+    else:
+        html_content, frontmatter, title = convert_markdown_to_html(
+            md_content,
+            link_index=link_index,
+            link_prefix=link_prefix,
+            profile=page_profile,
+            render_cache=render_cache
+        )
+        layout = [(output_path.name, title, html_content)]
+    cached = render_cache is not None and render_cache.hits > hits
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Track all files for navigation
-    domain_files = {
-        1: [],
-        2: [],
-        3: [],
-        4: []
+    with timed(page_profile, 'template'):
+        links = [(link_prefix + output_rel, title) for output_rel, title in related_pages or []]
+        page_htmls = [
+            (output_path.with_name(name),
+             ''.join(page_chunks(page_title, content, frontmatter, base_path, links if i == 0 else None)))
+            for i, (name, page_title, content) in enumerate(layout)
+        ]
+
+    if writer is None:
+        with timed(page_profile, 'write'):
+            written = [(path, output.write_file(path, page_html)) for path, page_html in page_htmls]
+    else:
+        # The writer thread times the write itself, not just its queueing
+        for path, page_html in page_htmls:
+            writer.write(path, page_html, page_profile)
+        written = None
+
+    unchanged = written is not None and not any(changed for _, changed in written)
+    print(f"{'Unchanged' if unchanged else 'Created'}: {output_path}")
+
+    if page_profile is not None:
+        page_profile.bytes_in = len(md_content.encode('utf-8'))
+        page_profile.bytes_out = sum(len(page_html.encode('utf-8')) for _, page_html in page_htmls)
+
+    return title, frontmatter, count_words(html_content), written, cached, page_profile
+
+def hash_content(data):
+    """Return a hex digest for raw file contents."""
+    return hashlib.sha256(data).hexdigest()
+
+def build_fingerprints():
+    """Hash the page template and converter settings shared by every page."""
+    template_source = (
+        inspect.getsource(template)
+        + inspect.getsource(assets)
+        + inspect.getsource(page_chunks)
+        + inspect.getsource(navigation.topic_slug)
+        + (highlight.STYLESHEET or '')
+    )
+
+    settings = json.dumps({
+        'manifest_version': MANIFEST_VERSION,
+        'markdown_version': markdown.__version__,
+        'extensions': MARKDOWN_EXTENSIONS,
+        'split_documents': SPLIT_DOCUMENTS,
+        'extension_configs': MARKDOWN_EXTENSION_CONFIGS,
+        'pygments_version': highlight.VERSION,
+        'converter': [
+            inspect.getsource(inspect.getmodule(parse_frontmatter)),
+            inspect.getsource(wiki_link_key),
+            inspect.getsource(fallback_link_path),
+            inspect.getsource(convert_wiki_links),
+            inspect.getsource(sections),
+            inspect.getsource(render_markdown),
+            inspect.getsource(convert_markdown_to_html),
+            inspect.getsource(convert_split_markdown),
+            inspect.getsource(count_words)
+        ]
+    }, sort_keys=True)
+
+    return {
+        'template': hash_content(template_source.encode('utf-8')),
+        'settings': hash_content(settings.encode('utf-8'))
     }
 
-    # Convert INDEX.md to the main study page
-    index_md = project_root / 'INDEX.md'
-    if index_md.exists():
-        process_markdown_file(
-            index_md,
-            study_output / 'index.html',
-            base_path='..'
-        )
-
-    # Convert MASTER_STUDY_PLAN.md
-    plan_md = project_root / 'MASTER_STUDY_PLAN.md'
-    if plan_md.exists():
-        process_markdown_file(
-            plan_md,
-            study_output / 'study-plan.html',
-            base_path='..'
-        )
+def wiki_link_targets(md_content):
+    """Return the source paths referenced by wiki-style links."""
+    targets = set()
+
+    for match in WIKI_LINK_PATTERN.finditer(md_content):
+        path = match.group(1).split('|', 1)[0].split('#', 1)[0]
+        targets.add(wiki_link_key(path))
+
+    return sorted(targets)
+
+def load_manifest(manifest_path, fingerprints):
+    """Load the page entries of a previous build, if it is still valid."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    # A changed template or converter invalidates every page
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    if manifest.get('template') != fingerprints['template']:
+        return {}
+    if manifest.get('settings') != fingerprints['settings']:
+        return {}
+
+    return manifest.get('pages', {})
+
+def save_manifest(manifest_path, fingerprints, pages):
+    """Write the build manifest for the next incremental run."""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'template': fingerprints['template'],
+        'settings': fingerprints['settings'],
+        'pages': pages
+    }
 
-    # Convert AWS-SA-PRO-CHEATSHEET.md
-    cheatsheet_md = project_root / 'AWS-SA-PRO-CHEATSHEET.md'
-    if cheatsheet_md.exists():
-        process_markdown_file(
-            cheatsheet_md,
-            study_output / 'cheatsheet.html',
-            base_path='..'
-        )
+    # Frontmatter may contain YAML dates, store them as strings
+    output.write_file(manifest_path, json.dumps(manifest, indent=2, sort_keys=True, default=str))
+
+def needs_rebuild(entry, source_hash, output_rel, output_path, link_state):
+    """Check whether a page differs from what the manifest recorded."""
+    if entry is None:
+        return True
+    if entry.get('source') != source_hash or entry.get('output') != output_rel:
+        return True
+    if not output_path.exists():
+        return True
+    if not all(output_path.with_name(posixpath.basename(rel)).exists() for rel in entry.get('sections', [])):
+        return True
+
+    # Rebuild when any wiki-link target was added, removed, edited or moved
+    for target, state in entry.get('links', {}).items():
+        if link_state(target) != state:
+            return True
+
+    return False
+
+def collect_pages(project_root, study_output):
+    """List every markdown source with its output path and base path."""
+    pages = []
+
+    # Root documents: the main study page, study plan and cheatsheet
+    root_documents = [
+        ('INDEX.md', 'index.html'),
+        ('MASTER_STUDY_PLAN.md', 'study-plan.html'),
+        ('AWS-SA-PRO-CHEATSHEET.md', 'cheatsheet.html')
+    ]
+
+    for source_name, output_name in root_documents:
+        source = project_root / source_name
+        if source.exists():
+            pages.append({
+                'source': source,
+                'output': study_output / output_name,
+                'base_path': '..',
+                'domain': None
+            })
 
     # Process comparison files
     comparisons_dir = project_root / 'comparisons'
     if comparisons_dir.exists():
         comparisons_output = study_output / 'comparisons'
-        comparisons_output.mkdir(exist_ok=True)
 
         for md_file in sorted(comparisons_dir.glob('*.md')):
             if md_file.name != '.gitkeep':
-                output_file = comparisons_output / md_file.with_suffix('.html').name
-                process_markdown_file(
-                    md_file,
-                    output_file,
-                    base_path='../..'
-                )
+                pages.append({
+                    'source': md_file,
+                    'output': comparisons_output / md_file.with_suffix('.html').name,
+                    'base_path': '../..',
+                    'domain': None
+                })
 
     # Process each domain
     domain_names = {
@@ -314,28 +520,432 @@ def main():
             continue
 
         domain_output = study_output / f'domain-{domain_num}'
-        domain_output.mkdir(exist_ok=True)
 
-        # Process all markdown files in domain
         for md_file in sorted(domain_dir.glob('*.md')):
-            output_file = domain_output / md_file.with_suffix('.html').name
-            title, frontmatter = process_markdown_file(
-                md_file,
-                output_file,
-                base_path='../..'
+            pages.append({
+                'source': md_file,
+                'output': domain_output / md_file.with_suffix('.html').name,
+                'base_path': '../..',
+                'domain': domain_num
+            })
+
+    for page in pages:
+        page['source_rel'] = page['source'].relative_to(project_root).as_posix()
+        page['output_rel'] = page['output'].relative_to(study_output).as_posix()
+
+        # The section page of each heading of a split document
+        page['split'] = SPLIT_DOCUMENTS.get(page['source_rel'])
+        if page['split']:
+            _, body = parse_frontmatter(page['source'].read_text(encoding='utf-8'))
+            page['sections'] = sections.section_outputs(body, page['output_rel'], page['split'])
+
+        # Wiki links resolve to paths relative to study/
+        page['link_prefix'] = '../' * page['output_rel'].count('/')
+
+    return pages
+
+def watch_paths(project_root):
+    """Return the (directory, recursive) pairs holding markdown sources and styles."""
+    directories = [project_root / 'comparisons', project_root / 'styles']
+    directories += sorted(project_root.glob('domain-*-*'))
+    return [(project_root, False)] + [(d, True) for d in directories if d.is_dir()]
+
+def render_pages(pages, link_index, jobs=1, frontmatter_cache=None, profile=False, writer=None,
+                 render_cache=None):
+    """Convert a list of pages, returning (title, frontmatter, words, written,
+    cached, profile) in page order.
+
+    frontmatter_cache seeds the frontmatter cache of pool workers; see
+    sitebuild.frontmatter.seed_cache(). A single process queues its writes
+    on writer, if given; pool workers write their own pages, and their
+    outcomes are recorded on writer. Every process reads and fills
+    render_cache, if given.
+
+    With more than one job the pages are spread over a process pool. The
+    largest sources are submitted first so a big page such as the cheatsheet
+    does not end up as the last task holding up the whole pool.
+    """
+    if jobs <= 1 or len(pages) <= 1:
+        return [
+            process_markdown_file(
+                page['source'],
+                page['output'],
+                page['base_path'],
+                link_index,
+                page['link_prefix'],
+                profile,
+                writer,
+                render_cache,
+                page['split'],
+                page['related']
             )
+            for page in pages
+        ]
+
+    order = sorted(
+        range(len(pages)),
+        key=lambda i: pages[i]['source'].stat().st_size,
+        reverse=True
+    )
+    results = [None] * len(pages)
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(pages)),
+        initializer=seed_cache,
+        initargs=(frontmatter_cache or {},)
+    ) as executor:
+        futures = {
+            executor.submit(
+                process_markdown_file,
+                pages[i]['source'],
+                pages[i]['output'],
+                pages[i]['base_path'],
+                link_index,
+                pages[i]['link_prefix'],
+                profile,
+                None,
+                render_cache,
+                pages[i]['split'],
+                pages[i]['related']
+            ): i
+            for i in order
+        }
+        for future, i in futures.items():
+            results[i] = future.result()
+            if writer is not None:
+                # A split document writes several files
+                for path, changed in results[i][3]:
+                    writer.record(path, changed)
+
+    return results
+
+def render_site(force=False, jobs=1, profile=False, project_root=None, write_threads=output.DEFAULT_THREADS,
+                all_pages=None, cache_dir=rendercache.CACHE_DIR, cache_size=rendercache.DEFAULT_MAX_BYTES):
+    """Render every stale page and save the build manifest.
+
+    all_pages is the result of collect_pages(), which is called when it is
+    not given. Returns the build state that build_site_navigation() and
+    finish_build() continue from: the pages, their manifest entries and the
+    counts and profiles of this run. See main() for the other arguments.
+    """
+    project_root = Path(project_root or Path(__file__).parent)
+    study_output = project_root / 'study'
+    build_profile = profiling.Profile('build') if profile else None
 
-            domain_files[domain_num].append({
-                'path': f'domain-{domain_num}/{output_file.name}',
-                'title': title,
-                'frontmatter': frontmatter,
-                'filename': md_file.stem
-            })
+    # Create output directory
+    study_output.mkdir(exist_ok=True)
+
+    fingerprints = build_fingerprints()
+    manifest_path = study_output / MANIFEST_NAME
+    previous = {} if force else load_manifest(manifest_path, fingerprints)
+
+    # Markdown bodies convert the same way as long as the converter does
+    render_cache = None
+    if cache_dir is not None:
+        render_cache = rendercache.RenderCache(project_root / cache_dir, fingerprints['settings'], cache_size)
+
+    # Hash every source once; link targets outside the page set are hashed on demand
+    hashes = {}
+
+    def current_hash(rel_path):
+        if rel_path not in hashes:
+            path = project_root / rel_path
+            hashes[rel_path] = hash_content(path.read_bytes()) if path.is_file() else None
+        return hashes[rel_path]
+
+    if all_pages is None:
+        all_pages = collect_pages(project_root, study_output)
+    link_index = build_link_index(all_pages)
+
+    def link_state(target):
+        # What a link renders from: the target's content and its output path
+        return [current_hash(target), link_index.get(target)]
+
+    # Terms of every page for its related pages (sitebuild.related), from
+    # the manifest unless the source changed
+    titles = {}
+    terms = {}
+    changed = {page['source_rel'] for page in all_pages} != set(previous)
+
+    for page in all_pages:
+        page['hash'] = current_hash(page['source_rel'])
+        entry = previous.get(page['source_rel'])
+
+        if entry and entry.get('source') == page['hash'] and 'terms' in entry:
+            titles[page['source_rel']] = entry['title']
+            terms[page['source_rel']] = entry['terms']
+        else:
+            frontmatter, body = parse_frontmatter(page['source'].read_text(encoding='utf-8'))
+            titles[page['source_rel']] = frontmatter.get('title', navigation.DEFAULT_TITLE)
+            terms[page['source_rel']] = related.page_terms(
+                str(titles[page['source_rel']]), frontmatter.get('exam_topics'), body
+            )
+            changed = True
+
+    if changed:
+        neighbours = related.related_pages(terms)
+        for page in all_pages:
+            page['related'] = [
+                [link_index[source_rel], navigation.page_label(link_index[source_rel], str(titles[source_rel]))]
+                for source_rel in neighbours[page['source_rel']]
+            ]
+    else:
+        for page in all_pages:
+            page['related'] = previous[page['source_rel']].get('related', [])
+    profiling.lap(build_profile, 'related')
+
+    stale = []
+
+    for page in all_pages:
+        entry = previous.get(page['source_rel'])
+
+        if (needs_rebuild(entry, page['hash'], page['output_rel'], page['output'], link_state)
+                or entry.get('related') != page['related']):
+            stale.append(page)
+
+    # Frontmatter of earlier builds, so pages whose edits did not touch
+    # their frontmatter skip the YAML parse
+    frontmatter_cache = {
+        entry['frontmatter_hash']: entry['frontmatter']
+        for entry in previous.values()
+        if entry.get('frontmatter_hash')
+    }
+    seed_cache(frontmatter_cache)
+    profiling.lap(build_profile, 'scan')
+
+    # Render every stale page, in parallel when --jobs allows it; pages whose
+    # HTML did not change are left untouched on disk
+    with output.OutputWriter(write_threads) as writer:
+        results = render_pages(stale, link_index, jobs, frontmatter_cache, profile, writer, render_cache)
+    profiling.lap(build_profile, 'render')
+    page_profiles = []
+    cache_hits = sum(result[4] for result in results)
+    cache_state = render_cache.prune() if render_cache is not None else None
+
+    for page, (title, frontmatter, words, _, _, page_profile) in zip(stale, results):
+        if page_profile is not None:
+            # Only now that the writer is done are the write stages complete
+            page_profile = page_profile.to_dict()
+            page_profile['name'] = page['source_rel']
+            page_profiles.append(page_profile)
+
+        md_content = page['source'].read_text(encoding='utf-8')
+        yaml_text, _ = split_frontmatter(md_content)
+        previous[page['source_rel']] = {
+            'source': page['hash'],
+            'output': page['output_rel'],
+            'links': {
+                target: link_state(target)
+                for target in wiki_link_targets(md_content)
+            },
+            'title': title,
+            'frontmatter': frontmatter,
+            'frontmatter_hash': frontmatter_hash(yaml_text) if yaml_text is not None else None,
+            'words': words,
+            'sections': list(dict.fromkeys(page.get('sections', {}).values())),
+            'terms': terms[page['source_rel']],
+            'related': page['related']
+        }
+
+    pages = {}
+    rebuilt = len(stale)
+    broken_links = []
+
+    for page in all_pages:
+        entry = previous[page['source_rel']]
+        pages[page['source_rel']] = entry
+
+        for target, (_, output_rel) in entry['links'].items():
+            if output_rel is None:
+                broken_links.append((page['source_rel'], target))
+
+    save_manifest(manifest_path, fingerprints, pages)
+    profiling.lap(build_profile, 'manifest')
+
+    return {
+        'study_output': study_output,
+        'all_pages': all_pages,
+        'pages': pages,
+        'rebuilt': rebuilt,
+        'written': len(writer.written),
+        'unchanged': len(writer.unchanged),
+        'broken_links': broken_links,
+        'cache_hits': cache_hits,
+        'cache_state': cache_state,
+        'build_profile': build_profile,
+        'page_profiles': page_profiles
+    }
+
+def build_site_navigation(build):
+    """Write the metadata index and the navigation pages of a rendered site.
+
+    Adds 'metadata' and 'navigation_pages' to build and returns the index.
+    """
+    study_output = build['study_output']
+    all_pages = build['all_pages']
+    pages = build['pages']
+
+    # Navigation and topic pages come from the metadata collected above
+    metadata = navigation.build_metadata_index(
+        {
+            'source_rel': page['source_rel'],
+            'output_rel': page['output_rel'],
+            'domain': page['domain'],
+            'title': pages[page['source_rel']]['title'],
+            'frontmatter': pages[page['source_rel']]['frontmatter'],
+            'words': pages[page['source_rel']]['words'],
+            'sections': pages[page['source_rel']]['sections']
+        }
+        for page in all_pages
+    )
+    metadata_path = study_output / navigation.METADATA_NAME
+
+    # Unless every page was rebuilt, only rewrite the navigation pages whose
+    # part of the index changed
+    previous_metadata = None
+    if build['rebuilt'] < len(all_pages):
+        try:
+            previous_metadata = navigation.load_metadata_index(metadata_path)
+        except (OSError, ValueError):
+            pass
+
+    navigation.write_metadata_index(metadata_path, metadata)
+    build['navigation_pages'] = navigation.write_navigation_pages(study_output, metadata, previous_metadata)
+    build['metadata'] = metadata
+    profiling.lap(build['build_profile'], 'navigation')
+    return metadata
+
+def finish_build(build):
+    """Write the shared assets and report on the build."""
+    study_output = build['study_output']
+    all_pages = build['all_pages']
+    pages = build['pages']
+    metadata = build['metadata']
+    build_profile = build['build_profile']
+    rebuilt = build['rebuilt']
+
+    # Shared assets replace what every page used to inline
+    asset_bytes = assets.write_assets(study_output)
+    profiling.lap(build_profile, 'assets')
+    html_bytes = sum(page['output'].stat().st_size for page in all_pages)
+    inline_bytes = html_bytes + sum(inline_asset_overhead(page['base_path']) for page in all_pages)
 
     print("\n✅ Conversion complete!")
+    print(f"Rebuilt {rebuilt} of {len(pages)} pages ({len(pages) - rebuilt} unchanged), "
+          f"{build['written']} files written ({build['unchanged']} identical to the existing file)")
+    if build['cache_state'] is not None:
+        kept, kept_bytes, evicted = build['cache_state']
+        print(f"Render cache: {build['cache_hits']} of {rebuilt} pages cached, "
+              f"{kept} entries ({kept_bytes:,} bytes), {evicted} evicted")
+    print(f"Navigation: {len(build['navigation_pages'])} pages written, {len(metadata['topics'])} topics, "
+          f"{len(metadata['tasks'])} tasks")
+    print(f"Page bytes: {inline_bytes:,} with inlined assets → "
+          f"{html_bytes + asset_bytes:,} with shared assets "
+          f"({html_bytes:,} HTML + {asset_bytes:,} assets)")
+
+    if build['broken_links']:
+        print(f"\n⚠️  {len(build['broken_links'])} broken wiki link(s):")
+        for source_rel, target in build['broken_links']:
+            print(f"   {source_rel} → [[{target}]]")
     print(f"Output directory: {study_output}")
 
-    return domain_files
+    if build_profile is not None:
+        trace_path = study_output / PROFILE_TRACE_NAME
+        build_profile = build_profile.to_dict()
+        profiling.write_trace(trace_path, build_profile, build['page_profiles'])
+        profiling.print_report(build_profile, build['page_profiles'], trace_path)
+
+def main(force=False, jobs=1, profile=False, project_root=None, write_threads=output.DEFAULT_THREADS,
+         cache_dir=rendercache.CACHE_DIR, cache_size=rendercache.DEFAULT_MAX_BYTES):
+    """Main conversion process.
+
+    With profile, prints per-stage and per-page timings and writes them as
+    a trace to study/.build-profile.json. project_root defaults to the
+    directory of this script. write_threads is the number of threads that
+    compare and write pages while later ones render (0 = write in turn).
+    cache_dir, relative to project_root, holds the render cache, trimmed
+    to cache_size bytes after each build; None disables it.
+    """
+    build = render_site(force, jobs, profile, project_root, write_threads,
+                        cache_dir=cache_dir, cache_size=cache_size)
+    metadata = build_site_navigation(build)
+    finish_build(build)
+    return metadata
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='ignore the build manifest and rebuild every page'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='number of worker processes for rendering pages (0 = one per CPU)'
+    )
+    parser.add_argument(
+        '--write-threads',
+        type=int,
+        default=output.DEFAULT_THREADS,
+        help=f'threads writing pages while others render (default: {output.DEFAULT_THREADS}, 0 = no thread pool)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='report time per stage and page and write a trace (use with --force to profile every page)'
+    )
+    parser.add_argument(
+        '--render-cache',
+        default=rendercache.CACHE_DIR,
+        metavar='DIR',
+        help=f'directory of rendered Markdown kept between builds (default: {rendercache.CACHE_DIR})'
+    )
+    parser.add_argument(
+        '--render-cache-size',
+        type=int,
+        default=rendercache.DEFAULT_MAX_BYTES // 2**20,
+        metavar='MB',
+        help=f'size the render cache is trimmed to (default: {rendercache.DEFAULT_MAX_BYTES // 2**20})'
+    )
+    parser.add_argument(
+        '--no-render-cache',
+        action='store_true',
+        help='convert every stale page without the render cache'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='rebuild on changes and serve the site with live reload'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help='port of the --watch server (default: 8000)'
+    )
+    args = parser.parse_args()
+
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.no_render_cache:
+        args.render_cache = None
+
+    return args
 
 if __name__ == '__main__':
-    main()
+    args = parse_args()
+    main(force=args.force, jobs=args.jobs, profile=args.profile, write_threads=args.write_threads,
+         cache_dir=args.render_cache, cache_size=args.render_cache_size * 2**20)
+
+    if args.watch:
+        project_root = Path(__file__).parent
+        devserver.run(
+            lambda: main(jobs=args.jobs, profile=args.profile, write_threads=args.write_threads,
+                         cache_dir=args.render_cache, cache_size=args.render_cache_size * 2**20),
+            project_root,
+            watch_paths(project_root),
+            port=args.port
+        )
@@ -1,7 +1,16 @@
 // AWS SA Pro Practice Exam Application
+
+// Questions in a full exam when no domain quotas are available; matches
+// sitebuild.questions.EXAM_LENGTH
+const FULL_EXAM_LENGTH = 75;
+
 class ExamApp {
     constructor() {
-        this.allQuestionSets = [];
+        this.manifest = null; // Question shard manifest (counts and files only)
+        this.shardCache = new Map(); // Shard index -> Promise of its questions
+        this.blueprint = null; // Domain pools and quotas for sampling exams by position
+        this.blockCache = new Map(); // Block index -> Promise of its questions
+        this.relatedSections = null; // Promise of the study sections questions link to, by question id
         this.questions = [];
         this.currentQuestionIndex = 0;
         this.userAnswers = [];
@@ -28,13 +37,88 @@ class ExamApp {
         await this.loadAllQuestions();
         this.setupEventListeners();
         this.checkSavedExam();
+        await this.openLinkedQuestion();
+    }
+
+    async openLinkedQuestion() {
+        // Search results link to index.html#q=<question id>
+        const match = location.hash.match(/^#q=(.+)$/);
+        if (!match || !this.manifest) {
+            return;
+        }
+        const id = decodeURIComponent(match[1]);
+
+        let shards;
+        try {
+            shards = await this.loadShards(this.manifest.shards.map((_, index) => index));
+        } catch (error) {
+            console.warn('Linked question unavailable:', error);
+            return;
+        }
+        const question = shards.flat().find(candidate => candidate.id === id);
+        if (!question) {
+            console.warn(`No question with id ${id}`);
+            return;
+        }
+
+        // One question with its answer check, kept apart from a saved exam
+        this.examMode = 'question';
+        this.questions = [question];
+        this.studyMode = true;
+        const studyModeToggle = document.getElementById('studyModeToggle');
+        if (studyModeToggle) {
+            studyModeToggle.checked = true;
+        }
+        clearInterval(this.timerInterval);
+        this.startExam();
     }
 
     async loadAllQuestions() {
+        try {
+            // Only the manifest is loaded up front; shards are fetched per exam
+            const response = await fetch('data/manifest.json');
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            this.manifest = await response.json();
+        } catch (error) {
+            console.warn('Question manifest unavailable, loading all-questions.json:', error);
+            await this.loadQuestionBundle();
+            return;
+        }
+
+        try {
+            const response = await fetch('data/blueprint.json');
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            this.blueprint = await response.json();
+        } catch (error) {
+            // Exams are then assembled from whole shards
+            console.warn('Exam blueprint unavailable:', error);
+        }
+
+        document.getElementById('totalQuestions').textContent = this.manifest.totalQuestions;
+    }
+
+    async loadQuestionBundle() {
+        // Fallback for trees where the shards have not been built
         try {
             const response = await fetch('all-questions.json');
             const data = await response.json();
-            this.allQuestionSets = data.questionSets;
+
+            this.manifest = {
+                totalQuestions: data.metadata.totalQuestions,
+                shards: data.questionSets.map(set => ({
+                    domain: set.domain,
+                    task: set.task,
+                    questionCount: set.question_count
+                }))
+            };
+            data.questionSets.forEach((set, index) => {
+                this.shardCache.set(index, Promise.resolve(this.decodeQuestions(set.questions)));
+            });
+
             document.getElementById('totalQuestions').textContent = data.metadata.totalQuestions;
         } catch (error) {
             console.error('Error loading questions:', error);
@@ -42,6 +126,87 @@ class ExamApp {
         }
     }
 
+    loadShard(index) {
+        if (!this.shardCache.has(index)) {
+            const shard = this.manifest.shards[index];
+            const request = fetch(`data/${shard.file}`)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(data => this.decodeQuestions(data.questions))
+                .catch(error => {
+                    // Allow a retry on the next exam
+                    this.shardCache.delete(index);
+                    throw error;
+                });
+            this.shardCache.set(index, request);
+        }
+        return this.shardCache.get(index);
+    }
+
+    decodeQuestions(questions) {
+        // Bundles built with --columnar store one array per question field
+        if (Array.isArray(questions)) {
+            return questions;
+        }
+        const { fields, columns } = questions;
+        return columns[0].map((_, row) => {
+            const question = {};
+            fields.forEach((field, i) => {
+                question[field] = columns[i][row];
+            });
+            return question;
+        });
+    }
+
+    async loadShards(indices) {
+        return Promise.all(indices.map(index => this.loadShard(index)));
+    }
+
+    loadBlock(index) {
+        if (!this.blockCache.has(index)) {
+            const request = fetch(`data/${this.blueprint.blocks}${index}.json`)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(data => this.decodeQuestions(data.questions))
+                .catch(error => {
+                    this.blockCache.delete(index);
+                    throw error;
+                });
+            this.blockCache.set(index, request);
+        }
+        return this.blockCache.get(index);
+    }
+
+    async loadPositions(positions) {
+        // Fetch only the blocks the positions fall in
+        const { blockSize } = this.blueprint;
+        const blockIndices = [...new Set(positions.map(position => Math.floor(position / blockSize)))];
+        const blocks = await Promise.all(blockIndices.map(index => this.loadBlock(index)));
+        const questionsByBlock = new Map(blockIndices.map((blockIndex, i) => [blockIndex, blocks[i]]));
+
+        return positions.map(position =>
+            questionsByBlock.get(Math.floor(position / blockSize))[position % blockSize]);
+    }
+
+    samplePositions(start, count, k) {
+        // Floyd's algorithm: k distinct positions from [start, start + count)
+        // in O(k), without listing the range
+        const picked = new Set();
+        for (let j = count - Math.min(k, count); j < count; j++) {
+            const t = Math.floor(Math.random() * (j + 1));
+            picked.add(picked.has(start + t) ? start + j : start + t);
+        }
+        return [...picked];
+    }
+
     setupEventListeners() {
         // Study mode toggle
         document.getElementById('studyModeToggle')?.addEventListener('change', (e) => {
@@ -63,6 +228,9 @@ class ExamApp {
             card.addEventListener('click', () => this.selectExamMode(card.dataset.mode));
         });
 
+        // Search results on this page change only the hash
+        window.addEventListener('hashchange', () => this.openLinkedQuestion());
+
         // Navigation buttons
         document.getElementById('backToWelcomeBtn')?.addEventListener('click', () => this.showScreen('welcome'));
         document.getElementById('continueExamBtn')?.addEventListener('click', () => this.continueSavedExam());
@@ -96,12 +264,18 @@ class ExamApp {
         }
     }
 
-    selectExamMode(mode) {
+    async selectExamMode(mode) {
         this.examMode = mode;
 
         if (mode === 'full') {
             // Start full exam immediately
-            this.prepareFullExam();
+            try {
+                await this.prepareFullExam();
+            } catch (error) {
+                console.error('Error loading questions:', error);
+                alert('Failed to load questions. Please try again.');
+                return;
+            }
             this.startExam();
         } else if (mode === 'random') {
             // Show random exam configuration
@@ -112,10 +286,37 @@ class ExamApp {
         }
     }
 
-    prepareFullExam() {
-        this.questions = [];
-        this.allQuestionSets.forEach(set => {
-            this.questions.push(...set.questions);
+    async prepareFullExam() {
+        if (this.blueprint) {
+            // Sample each domain's quota of the exam from its position range
+            const positions = this.blueprint.pools.flatMap(pool =>
+                this.samplePositions(pool.start, pool.count, pool.quota));
+            this.questions = await this.loadPositions(positions);
+            this.shuffleArray(this.questions);
+            return;
+        }
+
+        const shards = await this.loadShards(this.manifest.shards.map((_, index) => index));
+        const quotas = new Map((this.manifest.domains || [])
+            .filter(domain => Number.isInteger(domain.quota))
+            .map(domain => [domain.name, domain.quota]));
+
+        if (quotas.size === 0) {
+            // all-questions.json carries no quotas: a full-length exam from the whole bank
+            const questions = shards.flat();
+            this.shuffleArray(questions);
+            this.questions = questions.slice(0, FULL_EXAM_LENGTH);
+            return;
+        }
+
+        // Take each domain's quota of the exam, as the blueprint would
+        const byDomain = new Map();
+        this.manifest.shards.forEach((shard, index) => {
+            byDomain.set(shard.domain, (byDomain.get(shard.domain) || []).concat(shards[index]));
+        });
+        this.questions = [...byDomain].flatMap(([domain, questions]) => {
+            this.shuffleArray(questions);
+            return questions.slice(0, quotas.get(domain) || 0);
         });
         this.shuffleArray(this.questions);
     }
@@ -145,20 +346,16 @@ class ExamApp {
         this.showScreen('config');
         document.getElementById('configTitle').textContent = 'Select Domains';
 
-        // Group question sets by domain
+        // Count questions per domain from the manifest, without loading shards
         const domainMap = new Map();
-        this.allQuestionSets.forEach(set => {
-            if (!domainMap.has(set.domain)) {
-                domainMap.set(set.domain, []);
-            }
-            domainMap.get(set.domain).push(set);
+        this.manifest.shards.forEach(shard => {
+            domainMap.set(shard.domain, (domainMap.get(shard.domain) || 0) + shard.questionCount);
         });
 
         const configContent = document.getElementById('configContent');
         let html = '<div class="domain-list">';
 
-        domainMap.forEach((sets, domain) => {
-            const totalQuestions = sets.reduce((sum, set) => sum + set.questions.length, 0);
+        domainMap.forEach((totalQuestions, domain) => {
             html += `
                 <div class="domain-item">
                     <input type="checkbox" id="domain-${this.sanitizeId(domain)}" value="${domain}" checked>
@@ -176,12 +373,18 @@ class ExamApp {
         return str.replace(/[^a-zA-Z0-9]/g, '-');
     }
 
-    startConfiguredExam() {
-        if (this.examMode === 'random') {
-            const count = parseInt(document.getElementById('randomQuestionCount').value);
-            this.prepareRandomExam(count);
-        } else if (this.examMode === 'domain') {
-            this.prepareDomainExam();
+    async startConfiguredExam() {
+        try {
+            if (this.examMode === 'random') {
+                const count = parseInt(document.getElementById('randomQuestionCount').value);
+                await this.prepareRandomExam(count);
+            } else if (this.examMode === 'domain') {
+                await this.prepareDomainExam();
+            }
+        } catch (error) {
+            console.error('Error loading questions:', error);
+            alert('Failed to load questions. Please try again.');
+            return;
         }
 
         if (this.questions.length === 0) {
@@ -192,32 +395,63 @@ class ExamApp {
         this.startExam();
     }
 
-    prepareRandomExam(count) {
-        // Collect all questions
-        const allQuestions = [];
-        this.allQuestionSets.forEach(set => {
-            allQuestions.push(...set.questions);
+    async prepareRandomExam(count) {
+        if (this.blueprint) {
+            const positions = this.samplePositions(0, this.blueprint.totalQuestions, count);
+            this.questions = await this.loadPositions(positions);
+            this.shuffleArray(this.questions);
+            return;
+        }
+
+        // Pick question positions from the manifest counts, then fetch only
+        // the shards those positions fall in
+        const positions = [];
+        this.manifest.shards.forEach((shard, shardIndex) => {
+            for (let i = 0; i < shard.questionCount; i++) {
+                positions.push([shardIndex, i]);
+            }
         });
 
-        // Shuffle and select random questions
-        this.shuffleArray(allQuestions);
-        this.questions = allQuestions.slice(0, Math.min(count, allQuestions.length));
+        this.shuffleArray(positions);
+        const picked = positions.slice(0, Math.min(count, positions.length));
+
+        const shardIndices = [...new Set(picked.map(([shardIndex]) => shardIndex))];
+        const shards = await this.loadShards(shardIndices);
+        const questionsByShard = new Map(shardIndices.map((shardIndex, i) => [shardIndex, shards[i]]));
+
+        this.questions = picked.map(([shardIndex, i]) => questionsByShard.get(shardIndex)[i]);
     }
 
-    prepareDomainExam() {
-        this.questions = [];
-        const selectedDomains = [];
+    async prepareDomainExam() {
+        const selectedDomains = new Set();
 
         document.querySelectorAll('.domain-item input[type="checkbox"]:checked').forEach(checkbox => {
-            selectedDomains.push(checkbox.value);
+            selectedDomains.add(checkbox.value);
         });
 
-        this.allQuestionSets.forEach(set => {
-            if (selectedDomains.includes(set.domain)) {
-                this.questions.push(...set.questions);
+        if (this.blueprint) {
+            const positions = [];
+            this.blueprint.pools
+                .filter(pool => selectedDomains.has(pool.domain))
+                .forEach(pool => {
+                    for (let i = 0; i < pool.count; i++) {
+                        positions.push(pool.start + i);
+                    }
+                });
+            this.questions = await this.loadPositions(positions);
+            this.shuffleArray(this.questions);
+            return;
+        }
+
+        const shardIndices = [];
+        this.manifest.shards.forEach((shard, index) => {
+            if (selectedDomains.has(shard.domain)) {
+                shardIndices.push(index);
             }
         });
 
+        const shards = await this.loadShards(shardIndices);
+        this.questions = shards.flat();
         this.shuffleArray(this.questions);
     }
 
@@ -259,6 +493,10 @@ class ExamApp {
     }
 
     saveExamState() {
+        if (this.examMode === 'question') {
+            // A linked question is not an exam to resume
+            return;
+        }
         const examState = {
             questions: this.questions,
             currentQuestionIndex: this.currentQuestionIndex,
@@ -684,12 +922,31 @@ class ExamApp {
             `${String(minutes).padStart(2, '0')}:${String(seconds).padStart(2, '0')}`;
     }
 
-    showReview() {
+    async showReview() {
         this.showScreen('review');
-        this.renderReview();
+        this.renderReview(await this.loadRelatedSections());
     }
 
-    renderReview() {
+    loadRelatedSections() {
+        // Fetched on the first review only; questions map by id to indexes into its table
+        if (!this.relatedSections) {
+            this.relatedSections = fetch('data/related.json')
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .catch(error => {
+                    console.warn('Related study sections unavailable:', error);
+                    this.relatedSections = null;
+                    return { sections: [], questions: {} };
+                });
+        }
+        return this.relatedSections;
+    }
+
+    renderReview(related = { sections: [], questions: {} }) {
         const reviewContent = document.getElementById('reviewContent');
         reviewContent.innerHTML = '';
 
@@ -796,6 +1053,33 @@ class ExamApp {
             explanationDiv.appendChild(explanationTitle);
             explanationDiv.appendChild(explanationText);
 
+            // Study sections related to the question
+            const sections = (related.questions[question.id] || [])
+                .map(sectionIndex => related.sections[sectionIndex])
+                .filter(Boolean);
+            if (sections.length > 0) {
+                const relatedDiv = document.createElement('div');
+                relatedDiv.className = 'related-sections';
+
+                const relatedTitle = document.createElement('div');
+                relatedTitle.className = 'related-sections-title';
+                relatedTitle.textContent = '📖 Study This';
+
+                const relatedList = document.createElement('ul');
+                sections.forEach(([url, title, heading]) => {
+                    const item = document.createElement('li');
+                    const link = document.createElement('a');
+                    link.href = `../${url}`;
+                    link.textContent = heading ? `${title} › ${heading}` : title;
+                    item.appendChild(link);
+                    relatedList.appendChild(item);
+                });
+
+                relatedDiv.appendChild(relatedTitle);
+                relatedDiv.appendChild(relatedList);
+                explanationDiv.appendChild(relatedDiv);
+            }
+
             // Assemble review item
             reviewItem.appendChild(header);
             reviewItem.appendChild(questionText);
@@ -0,0 +1,3 @@
+"""
+Shared building blocks for convert-markdown.py and build-navigation.py.
+"""
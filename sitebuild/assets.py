@@ -0,0 +1,326 @@
+"""
+Static assets shared by every generated page.
+
+The dark-mode script and the study sidebar used to be inlined into each
+page. They are now written once to study/assets/ under content-hashed file
+names, so browsers cache them across pages and a changed asset gets a new
+URL instead of a stale cache entry. The code highlighting stylesheet of
+sitebuild.highlight joins them when Pygments is installed.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from sitebuild import highlight
+from sitebuild.output import write_file
+
+ASSETS_DIR = 'assets'
+
+DARK_MODE_JS = '''// Dark Mode Functionality
+const darkModeToggle = document.getElementById('darkModeToggle');
+const icon = darkModeToggle.querySelector('.icon');
+
+// Check for saved theme preference or default to light mode
+const savedTheme = localStorage.getItem('theme');
+if (savedTheme === 'dark') {
+    document.body.classList.add('dark-mode');
+    icon.textContent = '☀️';
+}
+
+// Toggle dark mode
+darkModeToggle.addEventListener('click', () => {
+    document.body.classList.toggle('dark-mode');
+
+    // Update icon and save preference
+    if (document.body.classList.contains('dark-mode')) {
+        icon.textContent = '☀️';
+        localStorage.setItem('theme', 'dark');
+    } else {
+        icon.textContent = '🌙';
+        localStorage.setItem('theme', 'light');
+    }
+});
+'''
+
+STUDY_SIDEBAR = '''            <div class="sidebar-section sidebar-search">
+                <h3>Search</h3>
+                <input type="search" class="search-input" placeholder="Search pages and questions" aria-label="Search study pages and questions">
+                <ol class="search-results"></ol>
+            </div>
+            <div class="sidebar-section">
+                <h3>Navigation</h3>
+                <ul>
+                    <li><a href="{base_path}/study/index.html">Study Home</a></li>
+                    <li><a href="{base_path}/study/domain-1.html">Domain 1 (26%)</a></li>
+                    <li><a href="{base_path}/study/domain-2.html">Domain 2 (29%)</a></li>
+                    <li><a href="{base_path}/study/domain-3.html">Domain 3 (25%)</a></li>
+                    <li><a href="{base_path}/study/domain-4.html">Domain 4 (20%)</a></li>
+                    <li><a href="{base_path}/study/comparisons/index.html">🔀 Service Comparisons</a></li>
+                    <li><a href="{base_path}/study/tags/index.html">🏷️ Exam Topics</a></li>
+                </ul>
+            </div>
+            <div class="sidebar-section">
+                <h3>Quick Links</h3>
+                <ul>
+                    <li><a href="{base_path}/study/cheatsheet.html" style="background: linear-gradient(135deg, #FFB84D 0%, #FF8C42 100%); padding: 8px 12px; border-radius: 6px; color: #0f0f1e; font-weight: 700; display: block; text-align: center; margin-bottom: 8px;">📋 Cheatsheet</a></li>
+                    <li><a href="{base_path}/exam/index.html">Practice Exam</a></li>
+                    <li><a href="https://aws.amazon.com/certification/certified-solutions-architect-professional/" target="_blank">Official Exam</a></li>
+                </ul>
+            </div>'''
+
+# Queries the index written by sitebuild.search. Terms are tokenized and
+# stemmed exactly as in sitebuild/search.py; only the term shards for the
+# query's prefixes and the document blocks of the top results are fetched.
+SEARCH_JS = '''(function () {
+    var MAX_RESULTS = 20;
+    var script = document.currentScript;
+    var root = new URL('../..', script.src);
+    var indexUrl = new URL('study/search/', root);
+    var files = new Map();
+    var manifest = null;
+    var stopwords = null;
+
+    function fetchJson(path) {
+        if (!files.has(path)) {
+            files.set(path, fetch(new URL(path, indexUrl)).then(function (response) {
+                if (!response.ok) {
+                    throw new Error('Failed to load ' + path + ': ' + response.status);
+                }
+                return response.json();
+            }).catch(function (error) {
+                files.delete(path);
+                throw error;
+            }));
+        }
+        return files.get(path);
+    }
+
+    function loadManifest() {
+        return fetchJson('manifest.json').then(function (data) {
+            manifest = data;
+            stopwords = new Set(data.stopwords);
+            return data;
+        });
+    }
+
+    function stem(token) {
+        if (token.length > 4 && token.endsWith('ies')) {
+            return token.slice(0, -3) + 'y';
+        }
+        if (token.length > 3 && token.endsWith('s') && !/(ss|us|is)$/.test(token)) {
+            return token.slice(0, -1);
+        }
+        return token;
+    }
+
+    function tokenize(text) {
+        var tokens = text.toLowerCase().match(/[a-z0-9]+/g) || [];
+        return tokens.filter(function (token) {
+            return token.length > 1 && !stopwords.has(token);
+        }).map(stem);
+    }
+
+    // Best score per document for a term, or for every term it prefixes
+    function termScores(term, prefix) {
+        var file = manifest.terms[term.slice(0, manifest.prefixLength)];
+        if (!file) {
+            return Promise.resolve(new Map());
+        }
+
+        return fetchJson('terms/' + file).then(function (shard) {
+            var scores = new Map();
+            var keys = prefix ? Object.keys(shard).filter(function (key) {
+                return key.startsWith(term);
+            }) : (term in shard ? [term] : []);
+
+            keys.forEach(function (key) {
+                var postings = shard[key];
+                var doc = 0;
+                for (var i = 0; i < postings.length; i += 2) {
+                    doc += postings[i];
+                    scores.set(doc, Math.max(scores.get(doc) || 0, postings[i + 1]));
+                }
+            });
+            return scores;
+        });
+    }
+
+    function loadDocs(ids) {
+        var blocks = Array.from(new Set(ids.map(function (id) {
+            return Math.floor(id / manifest.blockSize);
+        })));
+
+        return Promise.all(blocks.map(function (block) {
+            return fetchJson('docs/' + manifest.docs[block]);
+        })).then(function (loaded) {
+            var byBlock = new Map(blocks.map(function (block, i) { return [block, loaded[i]]; }));
+            return ids.map(function (id) {
+                return byBlock.get(Math.floor(id / manifest.blockSize))[id % manifest.blockSize];
+            });
+        });
+    }
+
+    function search(query) {
+        var terms = Array.from(new Set(tokenize(query)));
+        if (!terms.length) {
+            return Promise.resolve([]);
+        }
+
+        // The word being typed matches as a prefix
+        var prefixLast = !/\\s$/.test(query);
+
+        return Promise.all(terms.map(function (term, i) {
+            return termScores(term, prefixLast && i === terms.length - 1);
+        })).then(function (lists) {
+            var totals = new Map();
+            var matched = new Map();
+            lists.forEach(function (scores) {
+                scores.forEach(function (score, doc) {
+                    totals.set(doc, (totals.get(doc) || 0) + score);
+                    matched.set(doc, (matched.get(doc) || 0) + 1);
+                });
+            });
+
+            // Documents containing every term rank above partial matches
+            var ranked = Array.from(totals.keys()).sort(function (a, b) {
+                return (matched.get(b) - matched.get(a)) || (totals.get(b) - totals.get(a));
+            }).slice(0, MAX_RESULTS);
+
+            return loadDocs(ranked);
+        });
+    }
+
+    function renderResults(list, docs, query) {
+        list.textContent = '';
+        if (!docs.length) {
+            var empty = document.createElement('li');
+            empty.className = 'search-empty';
+            empty.textContent = query.trim() ? 'No results' : '';
+            list.appendChild(empty);
+            return;
+        }
+
+        docs.forEach(function (doc) {
+            var item = document.createElement('li');
+            var link = document.createElement('a');
+            link.href = new URL(doc[1], root).href;
+            link.textContent = (doc[0] === 'question' ? 'Q: ' : '') + doc[2];
+            item.appendChild(link);
+
+            if (doc[3]) {
+                var meta = document.createElement('span');
+                meta.className = 'search-meta';
+                meta.textContent = doc[3];
+                item.appendChild(meta);
+            }
+            list.appendChild(item);
+        });
+    }
+
+    document.querySelectorAll('.sidebar-search').forEach(function (section) {
+        var input = section.querySelector('.search-input');
+        var list = section.querySelector('.search-results');
+        var pending = 0;
+        var timer = null;
+
+        function run() {
+            var query = input.value;
+            var sequence = ++pending;
+            (manifest ? Promise.resolve() : loadManifest()).then(function () {
+                return search(query);
+            }).then(function (docs) {
+                if (sequence === pending) {
+                    renderResults(list, docs, query);
+                }
+            }).catch(function (error) {
+                console.error('Search failed:', error);
+            });
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(run, 120);
+        });
+
+        if (input.value) {
+            run();
+        }
+    });
+})();
+'''
+
+def hashed_name(stem, suffix, content):
+    """Return a file name that changes whenever the content does."""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+    return f'{stem}.{digest}{suffix}'
+
+# Asset paths relative to study/. The sidebar script embeds the search
+# script's path, so its own hashed name is computed after it.
+DARK_MODE_PATH = f'{ASSETS_DIR}/{hashed_name("dark-mode", ".js", DARK_MODE_JS)}'
+SEARCH_PATH = f'{ASSETS_DIR}/{hashed_name("search", ".js", SEARCH_JS)}'
+
+# The sidebar script is loaded synchronously from inside <aside>, so the
+# markup is inserted in place before the rest of the page is parsed. The
+# site root is derived from the script's own URL (study/assets/*.js).
+SIDEBAR_JS = '''(function () {
+    var script = document.currentScript;
+    var basePath = new URL('../..', script.src).href.replace(/\\/$/, '');
+    var markup = %s;
+    var parent = script.parentNode;
+    script.insertAdjacentHTML('beforebegin', markup.split('{base_path}').join(basePath));
+    script.remove();
+
+    // The search script and its index are only fetched once search is used
+    parent.querySelectorAll('.search-input').forEach(function (input) {
+        input.addEventListener('focus', function () {
+            var search = document.createElement('script');
+            search.src = basePath + '/study/%s';
+            document.head.appendChild(search);
+        }, { once: true });
+    });
+})();
+''' % (json.dumps(STUDY_SIDEBAR, ensure_ascii=False), SEARCH_PATH)
+
+SIDEBAR_PATH = f'{ASSETS_DIR}/{hashed_name("sidebar", ".js", SIDEBAR_JS)}'
+
+SHARED_ASSETS = {
+    DARK_MODE_PATH: DARK_MODE_JS,
+    SEARCH_PATH: SEARCH_JS,
+    SIDEBAR_PATH: SIDEBAR_JS
+}
+
+# Only pages with code blocks link the highlighting stylesheet
+HIGHLIGHT_PATH = None
+if highlight.STYLESHEET is not None:
+    HIGHLIGHT_PATH = f'{ASSETS_DIR}/{hashed_name("highlight", ".css", highlight.STYLESHEET)}'
+    SHARED_ASSETS[HIGHLIGHT_PATH] = highlight.STYLESHEET
+
+def write_assets(study_output):
+    """Write the shared assets and remove superseded versions.
+
+    Returns the total size of the assets in bytes.
+    """
+    assets_dir = Path(study_output) / ASSETS_DIR
+    assets_dir.mkdir(parents=True, exist_ok=True)
+
+    current = set()
+    stems = set()
+    total = 0
+
+    for rel_path, content in SHARED_ASSETS.items():
+        path = Path(study_output) / rel_path
+        data = content.encode('utf-8')
+        current.add(path.name)
+        stems.add(path.name.split('.', 1)[0])
+        total += len(data)
+
+        # Hashed names never change content, so an existing file is current
+        if not path.exists():
+            write_file(path, data)
+
+    for path in assets_dir.iterdir():
+        if path.name.split('.', 1)[0] in stems and path.name not in current:
+            path.unlink()
+
+    return total
@@ -0,0 +1,206 @@
+"""
+Single-process site build.
+
+Runs every build stage in one interpreter, in the order of a dependency
+graph, and hands each stage what earlier stages computed in memory
+instead of scanning the tree or reading their output back:
+
+- sources      the Markdown pages to convert (one scan of the tree)
+- pages        render stale pages (convert-markdown.py)
+- navigation   metadata index, navigation and topic pages, shared assets
+- questions    validate and aggregate questions/ (sitebuild.questionbank);
+               errors in the bank stop the build
+- exam         exam bundle, shards and blueprint (sitebuild.questions)
+- related      related study sections of every question (sitebuild.related)
+- search       search index of the pages and questions (sitebuild.search)
+- publish      copy what index.html reaches into dist/ (sitebuild.publish);
+               with --minify the copies are minified and precompressed
+
+Asking for a target runs it and everything it depends on, once each, so
+"search" leaves the exam data alone and "exam" leaves the pages alone.
+The related study sections of the questions are kept out of the exam
+data, in their own file, for that reason. Without targets the whole site
+is built and published.
+
+Use from Python:
+
+    from sitebuild.build import SiteBuild
+    SiteBuild(jobs=4).run(['exam'])
+
+or from the repository root: python3 -m sitebuild.build [TARGET ...] [--minify]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+from sitebuild import output, publish, questionbank, questions, related, rendercache, search
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Target -> the targets it needs first
+GRAPH = {
+    'sources': (),
+    'pages': ('sources',),
+    'navigation': ('pages',),
+    'questions': (),
+    'exam': ('questions',),
+    'related': ('navigation', 'questions'),
+    'search': ('navigation', 'questions'),
+    'publish': ('navigation', 'exam', 'related', 'search')
+}
+DEFAULT_TARGETS = ('publish',)
+
+def load_converter():
+    """Import convert-markdown.py, whose file name is not a valid module name.
+
+    The module is registered in sys.modules so pool workers can unpickle
+    its functions.
+    """
+    if 'convert_markdown' in sys.modules:
+        return sys.modules['convert_markdown']
+
+    spec = importlib.util.spec_from_file_location('convert_markdown', PROJECT_ROOT / 'convert-markdown.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['convert_markdown'] = module
+    spec.loader.exec_module(module)
+    return module
+
+class SiteBuild:
+    """One build of the site, holding the state its stages share.
+
+    Each target is a build_<target> method. run() calls the targets asked
+    for after their dependencies, each at most once per SiteBuild.
+    """
+
+    def __init__(self, force=False, jobs=1, profile=False, minify=False,
+                 write_threads=output.DEFAULT_THREADS, output_dir=publish.OUTPUT_DIR,
+                 cache_dir=rendercache.CACHE_DIR, cache_size=rendercache.DEFAULT_MAX_BYTES):
+        self.force = force
+        self.jobs = jobs
+        self.profile = profile
+        self.minify = minify
+        self.write_threads = write_threads
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.converter = load_converter()
+        self.study_output = PROJECT_ROOT / 'study'
+        self.exam_dir = PROJECT_ROOT / 'exam'
+        self.done = []
+        self.timings = {}
+
+    def plan(self, targets):
+        """Return targets and their dependencies in the order they run."""
+        order = []
+
+        def visit(target):
+            if target not in order:
+                for dependency in GRAPH[target]:
+                    visit(dependency)
+                order.append(target)
+
+        for target in targets:
+            if target not in GRAPH:
+                raise ValueError(f"unknown target {target!r}, choose from {', '.join(GRAPH)}")
+            visit(target)
+        return order
+
+    def run(self, targets=DEFAULT_TARGETS):
+        """Build targets, skipping those this build already ran."""
+        for target in self.plan(targets):
+            if target in self.done:
+                continue
+            print(f"\n▶ {target}")
+            start = time.perf_counter()
+            getattr(self, f'build_{target}')()
+            self.timings[target] = time.perf_counter() - start
+            self.done.append(target)
+        return self
+
+    def build_sources(self):
+        self.pages = self.converter.collect_pages(PROJECT_ROOT, self.study_output)
+        print(f"{len(self.pages)} Markdown pages")
+
+    def build_pages(self):
+        self.site = self.converter.render_site(
+            self.force, self.jobs, self.profile, PROJECT_ROOT, self.write_threads, all_pages=self.pages,
+            cache_dir=self.cache_dir, cache_size=self.cache_size
+        )
+
+    def build_navigation(self):
+        self.metadata = self.converter.build_site_navigation(self.site)
+        self.converter.finish_build(self.site)
+
+    def build_questions(self):
+        # Topics of the metadata index built in this run, else of the last one
+        metadata = getattr(self, 'metadata', None)
+        topics = tuple(metadata['topics']) if metadata else questionbank.load_topics(self.study_output)
+        _, issues, _ = questionbank.check_bank(PROJECT_ROOT / 'questions', topics)
+        # The exam data, search index and related sections all assume valid questions
+        if any(entry['severity'] == 'error' for entry in issues):
+            sys.exit("❌ Question bank has errors, see above")
+
+        self.question_sets, self.question_stats = questions.aggregate_questions(
+            PROJECT_ROOT / 'questions',
+            self.exam_dir / questions.DATA_DIR / questions.CACHE_NAME
+        )
+
+    def build_exam(self):
+        questions.write_exam_data(self.question_sets, self.question_stats, self.exam_dir, compact=True)
+
+    def build_related(self):
+        related.relate_site(self.study_output, self.metadata, self.question_sets, self.exam_dir)
+
+    def build_search(self):
+        search.index_site(self.study_output, self.question_sets, self.metadata)
+
+    def build_publish(self):
+        publish.main(self.output_dir, minify_files=self.minify, precompress=self.minify)
+
+    def print_timings(self):
+        total = sum(self.timings.values())
+        print(f"\n✅ Built {', '.join(self.done)} in {total:.2f}s")
+        for target, seconds in self.timings.items():
+            print(f"   {target:<12}{seconds:>8.2f}s")
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Build the site in one process.')
+    parser.add_argument('targets', nargs='*', metavar='TARGET',
+                        help=f"targets to build (default: publish): {', '.join(GRAPH)}")
+    parser.add_argument('--minify', action='store_true', help='minify and precompress the published copies')
+    parser.add_argument('--force', action='store_true', help='ignore the build manifest and rebuild every page')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes for rendering pages (0 = one per CPU)')
+    parser.add_argument('--write-threads', type=int, default=output.DEFAULT_THREADS,
+                        help=f'threads writing pages while others render (default: {output.DEFAULT_THREADS})')
+    parser.add_argument('--profile', action='store_true', help='report time per page stage and write a trace')
+    parser.add_argument('--render-cache', default=rendercache.CACHE_DIR, metavar='DIR',
+                        help=f'directory of rendered Markdown kept between builds (default: {rendercache.CACHE_DIR})')
+    parser.add_argument('--render-cache-size', type=int, default=rendercache.DEFAULT_MAX_BYTES // 2**20, metavar='MB',
+                        help=f'size the render cache is trimmed to (default: {rendercache.DEFAULT_MAX_BYTES // 2**20})')
+    parser.add_argument('--no-render-cache', action='store_true', help='convert every stale page without the cache')
+    parser.add_argument('--output', default=publish.OUTPUT_DIR,
+                        help=f'publish directory (default: {publish.OUTPUT_DIR})')
+    args = parser.parse_args()
+
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.no_render_cache:
+        args.render_cache = None
+    unknown = [target for target in args.targets if target not in GRAPH]
+    if unknown:
+        parser.error(f"unknown target(s) {', '.join(unknown)}; choose from {', '.join(GRAPH)}")
+
+    return args
+
+if __name__ == '__main__':
+    args = parse_args()
+    build = SiteBuild(args.force, args.jobs, args.profile, args.minify, args.write_threads, args.output,
+                      args.render_cache, args.render_cache_size * 2**20)
+    build.run(args.targets or DEFAULT_TARGETS)
+    build.print_timings()
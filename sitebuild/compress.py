@@ -0,0 +1,77 @@
+"""
+Precompressed .gz and .br sidecars for static files.
+
+Brotli output needs the optional brotli module (pip install brotli); without
+it only gzip sidecars are written. Gzip sidecars are written with a fixed
+timestamp so unchanged files produce identical bytes between builds.
+"""
+
+import gzip
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from sitebuild.output import write_file
+
+SIDECAR_SUFFIXES = ('.gz', '.br')
+
+def gzip_bytes(data):
+    """Compress data with gzip at maximum level, without a timestamp."""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def brotli_bytes(data):
+    """Compress data with brotli, or return None if brotli is not installed."""
+    if brotli is None:
+        return None
+    return brotli.compress(data, quality=11)
+
+def write_sidecars(path, data=None):
+    """Write path.gz and path.br next to path.
+
+    Returns a dict of sizes in bytes with keys 'raw', 'gz' and, when brotli
+    is available, 'br'.
+    """
+    path = Path(path)
+    if data is None:
+        data = path.read_bytes()
+
+    sizes = {'raw': len(data)}
+
+    compressed = gzip_bytes(data)
+    write_file(path.with_name(path.name + '.gz'), compressed)
+    sizes['gz'] = len(compressed)
+
+    compressed = brotli_bytes(data)
+    if compressed is not None:
+        write_file(path.with_name(path.name + '.br'), compressed)
+        sizes['br'] = len(compressed)
+
+    return sizes
+
+def sidecar_sizes(path):
+    """Return the sizes of the sidecars already next to path, keyed like write_sidecars()."""
+    path = Path(path)
+    sizes = {}
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = path.with_name(path.name + suffix)
+        if sidecar.exists():
+            sizes[suffix[1:]] = sidecar.stat().st_size
+    return sizes
+
+def remove_sidecars(path):
+    """Delete the sidecars of a file that is no longer generated."""
+    path = Path(path)
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = path.with_name(path.name + suffix)
+        if sidecar.exists():
+            sidecar.unlink()
+
+def sidecar_source(path):
+    """Return the file a sidecar belongs to, or None for other files."""
+    path = Path(path)
+    if path.suffix in SIDECAR_SUFFIXES:
+        return path.with_suffix('')
+    return None
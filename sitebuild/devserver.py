@@ -0,0 +1,222 @@
+"""
+Watch mode and live-reload server for authoring the study site.
+
+convert-markdown.py --watch builds once, then serves the repository root
+and rebuilds whenever a markdown source changes. Rebuilds are incremental:
+only the edited page, the pages linking to it and its navigation pages are
+written again. After every rebuild, and after a stylesheet edit, open
+browser tabs reload through a Server-Sent Events stream. The script that
+listens to it is injected into HTML responses by the server and never
+written to disk.
+
+File changes come from watchdog (pip install watchdog) when it is
+installed, and from polling modification times otherwise.
+"""
+
+import http.server
+import os
+import queue
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+RELOAD_PATH = '/__reload'
+RELOAD_SCRIPT = (
+    f"<script>new EventSource('{RELOAD_PATH}').onmessage = "
+    "function () { location.reload(); };</script>\n"
+).encode('utf-8')
+
+# Markdown changes trigger a rebuild; stylesheet changes only a reload
+WATCHED_SUFFIXES = ('.md', '.css')
+
+POLL_INTERVAL = 0.3
+# Editors often save in several steps; changes this close are one edit
+DEBOUNCE = 0.1
+HEARTBEAT = 15
+
+class ReloadBroadcaster:
+    """Version counter that the event streams of open pages wait on."""
+
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version, timeout):
+        """Wait until the version differs from version, or timeout; return it."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+class LiveReloadHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler that adds the reload script to HTML pages."""
+
+    def __init__(self, *args, broadcaster, **kwargs):
+        self.broadcaster = broadcaster
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url_path = self.path.split('?', 1)[0].split('#', 1)[0]
+
+        if url_path == RELOAD_PATH:
+            self.send_events()
+            return
+
+        path = self.translate_path(self.path)
+        if url_path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+
+        if path.endswith('.html') and os.path.isfile(path):
+            self.send_html(path)
+        else:
+            super().do_GET()
+
+    def send_html(self, path):
+        with open(path, 'rb') as f:
+            body = f.read()
+
+        end = body.rfind(b'</body>')
+        body = body[:end] + RELOAD_SCRIPT + body[end:] if end != -1 else body + RELOAD_SCRIPT
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+
+        version = self.broadcaster.version
+        try:
+            while True:
+                current = self.broadcaster.wait(version, HEARTBEAT)
+                # A comment line keeps the connection alive and detects closed tabs
+                self.wfile.write(b'data: reload\n\n' if current != version else b': ping\n\n')
+                self.wfile.flush()
+                version = current
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_request(self, code='-', size='-'):
+        # Errors are still logged through log_error
+        pass
+
+def serve(root, port, broadcaster):
+    """Serve root on localhost:port from a background thread."""
+    handler = partial(LiveReloadHandler, directory=str(root), broadcaster=broadcaster)
+    server = http.server.ThreadingHTTPServer(('localhost', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def scan(paths):
+    """Return the modification time and size of every watched file."""
+    files = {}
+    for directory, recursive in paths:
+        for path in Path(directory).glob('**/*' if recursive else '*'):
+            if path.suffix not in WATCHED_SUFFIXES:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def poll(paths, changes, stop):
+    """Put every added, modified or removed watched file on changes."""
+    previous = scan(paths)
+    while not stop.wait(POLL_INTERVAL):
+        current = scan(paths)
+        for path in previous.keys() | current.keys():
+            if previous.get(path) != current.get(path):
+                changes.put(path)
+        previous = current
+
+class ChangeHandler:
+    """watchdog event handler that queues the watched files it sees."""
+
+    def __init__(self, changes):
+        self.changes = changes
+
+    def dispatch(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            if path and os.fsdecode(path).endswith(WATCHED_SUFFIXES):
+                self.changes.put(os.fsdecode(path))
+
+def watch(paths, changes):
+    """Start watching (directory, recursive) pairs; return a function that stops."""
+    if Observer is None:
+        stop = threading.Event()
+        threading.Thread(target=poll, args=(paths, changes, stop), daemon=True).start()
+        return stop.set
+
+    observer = Observer()
+    handler = ChangeHandler(changes)
+    for directory, recursive in paths:
+        observer.schedule(handler, str(directory), recursive=recursive)
+    observer.start()
+
+    def stop():
+        observer.stop()
+        observer.join()
+
+    return stop
+
+def run(rebuild, root, paths, port=8000):
+    """Serve root, call rebuild after each markdown edit and reload browsers.
+
+    Runs until interrupted with Ctrl+C.
+    """
+    root = Path(root)
+    broadcaster = ReloadBroadcaster()
+    server = serve(root, port, broadcaster)
+    changes = queue.Queue()
+    stop = watch(paths, changes)
+
+    print(f"\n👀 Watching for changes ({'watchdog' if Observer else 'polling'})")
+    print(f"🌐 Serving http://localhost:{port}/study/index.html (Ctrl+C to stop)")
+
+    try:
+        while True:
+            changed = {changes.get()}
+            while True:
+                try:
+                    changed.add(changes.get(timeout=DEBOUNCE))
+                except queue.Empty:
+                    break
+
+            start = time.perf_counter()
+            if any(path.endswith('.md') for path in changed):
+                try:
+                    rebuild()
+                except Exception as error:
+                    # Keep watching; the next save may fix it
+                    print(f"\n❌ Rebuild failed: {error}")
+                    continue
+
+            broadcaster.notify()
+            names = ', '.join(sorted(os.path.relpath(path, root) for path in changed))
+            print(f"\n🔄 {names}: rebuilt and reloaded in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        stop()
+        server.shutdown()
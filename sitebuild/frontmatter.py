@@ -0,0 +1,99 @@
+"""
+YAML frontmatter reader for the markdown sources.
+
+The leading '---' fence and its closing line are found by scanning line
+by line from the start of the document, so a '---' horizontal rule in the
+body is never mistaken for a fence and the body is sliced off once instead
+of splitting the whole document. YAML is parsed with libyaml's CSafeLoader
+when PyYAML was built with it, and with the pure-Python SafeLoader
+otherwise.
+
+Parsed frontmatter is cached by the hash of its YAML text. An incremental
+build seeds the cache from its manifest (seed_cache), so a page whose body
+changed but whose frontmatter did not skips the YAML parse. Cached values
+are shared between callers and must not be modified.
+"""
+
+import hashlib
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+FENCE = '---'
+# YAML also allows a document to end with '...'
+CLOSING_FENCES = ('---', '...')
+
+_cache = {}
+
+def split_frontmatter(content):
+    """Locate the frontmatter block at the start of content.
+
+    Returns (yaml_text, body_start): the text between the fences and the
+    offset at which the body begins, or (None, 0) without a frontmatter
+    block.
+    """
+    if not content.startswith(FENCE):
+        return None, 0
+
+    line_end = content.find('\n')
+    if line_end == -1 or content[len(FENCE):line_end].strip():
+        return None, 0
+
+    yaml_start = position = line_end + 1
+    while position < len(content):
+        line_end = content.find('\n', position)
+        if line_end == -1:
+            line_end = len(content)
+
+        if content.startswith(CLOSING_FENCES, position) and not content[position + 3:line_end].strip():
+            return content[yaml_start:position], min(line_end + 1, len(content))
+
+        position = line_end + 1
+
+    # No closing fence: the document has no frontmatter
+    return None, 0
+
+def frontmatter_hash(yaml_text):
+    """Return the cache key of a frontmatter block."""
+    return hashlib.sha256(yaml_text.encode('utf-8')).hexdigest()
+
+def seed_cache(entries):
+    """Add parsed frontmatter from an earlier build, keyed by frontmatter_hash()."""
+    _cache.update(entries)
+
+def load_frontmatter(yaml_text):
+    """Parse a frontmatter block, or return its cached result.
+
+    Raises yaml.YAMLError for invalid YAML. An empty block parses as an
+    empty dict.
+    """
+    key = frontmatter_hash(yaml_text)
+    if key not in _cache:
+        data = yaml.load(yaml_text, Loader=SafeLoader)
+        _cache[key] = {} if data is None else data
+    return _cache[key]
+
+def parse_frontmatter(content):
+    """Extract YAML frontmatter from markdown content.
+
+    Returns (frontmatter, body). Without a valid frontmatter mapping the
+    frontmatter is empty and the body is the whole document.
+    """
+    yaml_text, body_start = split_frontmatter(content)
+    if yaml_text is None:
+        return {}, content
+
+    try:
+        frontmatter = load_frontmatter(yaml_text)
+    except yaml.YAMLError:
+        return {}, content
+
+    # A block that is not a mapping is content between two horizontal rules
+    if not isinstance(frontmatter, dict):
+        return {}, content
+
+    return frontmatter, content[body_start:]
@@ -0,0 +1,47 @@
+"""
+Build-time syntax highlighting, when Pygments is installed.
+
+Fenced code is tokenized while the Markdown is converted (markdown's
+codehilite extension) and coloured by one shared stylesheet, written with
+the other assets (sitebuild.assets). Pages then neither fetch nor run
+highlight.js, and pages without code blocks load no highlighting assets
+at all. Without Pygments, pages with code fall back to highlight.js from
+the CDN (sitebuild.template).
+
+Fences without a language are not coloured; highlight.js used to guess
+theirs at run time.
+"""
+
+try:
+    import pygments
+    from pygments.formatters import HtmlFormatter
+except ImportError:
+    pygments = None
+
+STYLE = 'github-dark'
+CSS_CLASS = 'highlight'
+
+# Markdown extension and its settings, see convert-markdown.py
+EXTENSION = 'codehilite'
+EXTENSION_CONFIG = {
+    'css_class': CSS_CLASS,
+    'guess_lang': False,
+    'pygments_style': STYLE
+}
+
+# The block keeps the rounded box of styles/study.css; only the <pre>
+# inside the wrapper takes the theme's background
+OVERRIDES = f'''
+.{CSS_CLASS} {{ background: none; }}
+.{CSS_CLASS} pre {{ background: #0d1117; }}
+.{CSS_CLASS} pre code {{ color: #e6edf3; }}
+'''
+
+def stylesheet():
+    """Return the CSS of the highlighted code, or None without Pygments."""
+    if pygments is None:
+        return None
+    return HtmlFormatter(style=STYLE).get_style_defs(f'.{CSS_CLASS}') + '\n' + OVERRIDES.lstrip()
+
+STYLESHEET = stylesheet()
+VERSION = pygments.__version__ if pygments is not None else None
@@ -0,0 +1,198 @@
+"""
+Minification of the published pages and stylesheets.
+
+Generated study pages keep the indentation of their templates and the
+stylesheets ship as written. With --minify, sitebuild.publish passes every
+page and stylesheet it copies into dist/ through minify_file():
+
+- pages have whitespace runs in text collapsed to a single character and
+  their inline <style> blocks minified, while tags, <pre>, <textarea> and
+  <script> contents are left untouched
+- stylesheets lose their comments and insignificant whitespace
+
+The files under study/, styles/ and exam/ are never modified, so the next
+build always starts from the sources, and the minified copies keep the
+names the pages link to.
+
+Each minified file is parsed again and compared with the original; a page
+whose DOM differs (beyond collapsed whitespace) or a stylesheet whose
+tokens differ is published unminified and reported.
+"""
+
+import re
+from html.parser import HTMLParser
+
+# Elements whose text is kept byte for byte
+RAW_ELEMENTS = ('pre', 'textarea', 'script', 'style')
+
+RAW_BLOCK_PATTERN = re.compile(
+    r'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN = re.compile(r'(<!--.*?-->|<[^>]*>)', re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+CSS_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_TOKEN_PATTERN = re.compile(r'''"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|[{}();:,>]|[^\s{}();:,>"']+''')
+# Whitespace next to these is never significant
+CSS_PUNCTUATION = set('{};,>')
+CSS_BLOCK_END_PATTERN = re.compile(r'\s*\}')
+
+def collapse_whitespace(match):
+    """Replace a whitespace run with one newline or space, keeping line breaks."""
+    return '\n' if '\n' in match.group() else ' '
+
+def minify_text(segment):
+    """Collapse whitespace in the text between tags, leaving tags as they are."""
+    parts = TAG_PATTERN.split(segment)
+    for i in range(0, len(parts), 2):
+        parts[i] = WHITESPACE_PATTERN.sub(collapse_whitespace, parts[i])
+    return ''.join(parts)
+
+def minify_html(source):
+    """Return source with insignificant whitespace removed."""
+    output = []
+    position = 0
+
+    for match in RAW_BLOCK_PATTERN.finditer(source):
+        output.append(minify_text(source[position:match.start()]))
+        open_tag, tag, body, close_tag = match.groups()
+        if tag.lower() == 'style':
+            body = minify_css(body)
+        output.extend((open_tag, body, close_tag))
+        position = match.end()
+
+    output.append(minify_text(source[position:]))
+    return ''.join(output)
+
+def css_tokens(source):
+    """Tokenise CSS, dropping comments, whitespace and redundant semicolons."""
+    tokens = CSS_TOKEN_PATTERN.findall(CSS_COMMENT_PATTERN.sub(' ', source))
+    return [
+        token for i, token in enumerate(tokens)
+        if not (token == ';' and i + 1 < len(tokens) and tokens[i + 1] == '}')
+    ]
+
+def minify_css(source):
+    """Return source without comments and with whitespace kept only where needed."""
+    source = CSS_COMMENT_PATTERN.sub(' ', source)
+    tokens = CSS_TOKEN_PATTERN.finditer(source)
+    output = []
+    previous = None
+    previous_end = 0
+
+    for match in tokens:
+        token = match.group()
+        if token == ';' and CSS_BLOCK_END_PATTERN.match(source, match.end()):
+            previous_end = match.end()
+            continue
+
+        # A space is only kept between two tokens that are not punctuation
+        # and that were separated in the source, e.g. "1px solid"
+        separated = previous is not None and match.start() > previous_end
+        if separated and previous not in CSS_PUNCTUATION and token not in CSS_PUNCTUATION and previous != ':':
+            output.append(' ')
+
+        output.append(token)
+        previous = token
+        previous_end = match.end()
+
+    return ''.join(output)
+
+class DomEvents(HTMLParser):
+    """Flatten a document into the events that matter for rendering.
+
+    Comments are dropped and whitespace runs in text collapse to one space,
+    except inside RAW_ELEMENTS; inline styles are compared by CSS token.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events = []
+        self.raw = []
+        self.text = []
+
+    def flush_text(self):
+        if not self.text:
+            return
+        text = ''.join(self.text)
+        self.text = []
+        if 'style' in self.raw:
+            self.events.append(('css', tuple(css_tokens(text))))
+        elif self.raw:
+            self.events.append(('raw', text))
+        else:
+            self.events.append(('text', WHITESPACE_PATTERN.sub(' ', text)))
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        self.events.append(('start', tag, tuple(attrs)))
+        if tag in RAW_ELEMENTS:
+            self.raw.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.flush_text()
+        self.events.append(('start', tag, tuple(attrs)))
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        self.events.append(('end', tag))
+        if self.raw and self.raw[-1] == tag:
+            self.raw.pop()
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def handle_decl(self, decl):
+        self.flush_text()
+        self.events.append(('decl', decl))
+
+def dom_events(source):
+    """Parse source and return its DomEvents event list."""
+    parser = DomEvents()
+    parser.feed(source)
+    parser.close()
+    parser.flush_text()
+    return parser.events
+
+def html_equivalent(original, minified):
+    """Check that two documents differ only in insignificant whitespace."""
+    return dom_events(original) == dom_events(minified)
+
+def css_equivalent(original, minified):
+    """Check that two stylesheets have the same tokens."""
+    return css_tokens(original) == css_tokens(minified)
+
+def minify_file(rel_path, data):
+    """Return the minified bytes of an .html or .css file.
+
+    Other files, and files whose minified form fails the equivalence
+    check, come back as they were. Returns (data, rejected).
+    """
+    if rel_path.endswith('.html'):
+        minifier, equivalent = minify_html, html_equivalent
+    elif rel_path.endswith('.css'):
+        minifier, equivalent = minify_css, css_equivalent
+    else:
+        return data, False
+
+    source = data.decode('utf-8')
+    output = minifier(source)
+    if not equivalent(source, output):
+        return data, True
+    return output.encode('utf-8'), False
+
+def print_report(report, label):
+    """Print the total savings of the files in report."""
+    original = sum(entry['original'] for entry in report.values())
+    minified = sum(entry['raw'] for entry in report.values())
+    saved = original - minified
+    percent = saved / original * 100 if original else 0
+
+    print(f"  {label}: {len(report)} files, {original:,} → {minified:,} bytes "
+          f"({saved:,} bytes, {percent:.1f}% saved)")
+
+    for key in ('gz', 'br'):
+        if report and all(key in entry for entry in report.values()):
+            total = sum(entry[key] for entry in report.values())
+            print(f"    .{key}: {total:,} bytes ({total / original * 100:.1f}% of original)")
@@ -0,0 +1,671 @@
+"""
+Metadata index and the navigation pages built from it.
+
+convert-markdown.py collects every page's frontmatter, title and word
+count while converting, and build_metadata_index() turns that into one
+index: pages by output path, plus exam topic -> pages, task -> pages and
+domain -> pages. Topics are keyed by their slug; topic_labels keeps the
+spelling of each topic's first use for display. The index is written to
+study/metadata.json for other consumers such as the search stage, and
+the domain overviews, the comparisons landing page and the topic pages
+under study/tags/ are built from it without reading any generated HTML
+back.
+
+Given the index of the previous build, only navigation pages whose part of
+the index changed are written again, so editing one page rewrites just its
+domain overview and topic pages.
+
+build-navigation.py rebuilds the navigation pages from metadata.json alone.
+"""
+
+import hashlib
+import html
+import inspect
+import json
+import re
+import sys
+from pathlib import Path
+
+from sitebuild import assets, template
+from sitebuild.output import write_file
+from sitebuild.template import render_page, write_page
+
+METADATA_NAME = 'metadata.json'
+METADATA_VERSION = 4
+TAGS_DIR = 'tags'
+
+# Title the converter gives pages without a frontmatter title
+DEFAULT_TITLE = 'Study Material'
+
+TOPIC_SLUG_PATTERN = re.compile(r'[^a-z0-9]+')
+
+COMPARISONS_SIDEBAR = '''            <div class="sidebar-section">
+                <h3>Navigation</h3>
+                <ul>
+                    <li><a href="../index.html">Study Home</a></li>
+                    <li><a href="../domain-1.html">Domain 1 (26%)</a></li>
+                    <li><a href="../domain-2.html">Domain 2 (29%)</a></li>
+                    <li><a href="../domain-3.html">Domain 3 (25%)</a></li>
+                    <li><a href="../domain-4.html">Domain 4 (20%)</a></li>
+                </ul>
+            </div>
+            <div class="sidebar-section">
+                <h3>Quick Links</h3>
+                <ul>
+                    <li><a href="../cheatsheet.html" style="background: linear-gradient(135deg, #FFB84D 0%, #FF8C42 100%); padding: 8px 12px; border-radius: 6px; color: #0f0f1e; font-weight: 700; display: block; text-align: center; margin-bottom: 8px;">📋 Cheatsheet</a></li>
+                    <li><a href="../../exam/index.html">Practice Exam</a></li>
+                    <li><a href="https://aws.amazon.com/certification/certified-solutions-architect-professional/" target="_blank">Official Exam</a></li>
+                </ul>
+            </div>'''
+
+COMPARISONS_STYLE = '''    <style>
+        .intro-text {
+            font-size: 1.1rem;
+            line-height: 1.6;
+            margin-bottom: 2rem;
+            color: var(--text-secondary);
+        }
+
+        .comparison-cards {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
+            gap: 2rem;
+            margin: 2rem 0;
+        }
+
+        .comparison-card {
+            background: var(--card-bg);
+            border-radius: 12px;
+            overflow: hidden;
+            transition: transform 0.3s ease, box-shadow 0.3s ease;
+            border: 1px solid var(--border-color);
+        }
+
+        .comparison-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 8px 24px rgba(0, 0, 0, 0.15);
+        }
+
+        .card-header {
+            background: linear-gradient(135deg, var(--primary-color) 0%, var(--secondary-color) 100%);
+            padding: 1.5rem;
+            display: flex;
+            align-items: center;
+            gap: 1rem;
+        }
+
+        .card-icon {
+            font-size: 2.5rem;
+        }
+
+        .card-header h2 {
+            margin: 0;
+            color: white;
+            font-size: 1.5rem;
+        }
+
+        .card-content {
+            padding: 1.5rem;
+        }
+
+        .card-content p {
+            margin-bottom: 1rem;
+            line-height: 1.6;
+        }
+
+        .feature-list {
+            list-style: none;
+            padding: 0;
+            margin: 1.5rem 0;
+        }
+
+        .feature-list li {
+            padding: 0.5rem 0;
+            padding-left: 1.5rem;
+            position: relative;
+        }
+
+        .feature-list li:before {
+            content: "✓";
+            position: absolute;
+            left: 0;
+            color: var(--success-color);
+            font-weight: bold;
+        }
+
+        .btn-card {
+            display: inline-block;
+            background: linear-gradient(135deg, #FFB84D 0%, #FF8C42 100%);
+            color: #0f0f1e;
+            padding: 0.75rem 1.5rem;
+            border-radius: 8px;
+            text-decoration: none;
+            font-weight: 600;
+            transition: all 0.3s ease;
+            margin-top: 1rem;
+        }
+
+        .btn-card:hover {
+            transform: translateX(5px);
+            box-shadow: 0 4px 12px rgba(255, 184, 77, 0.3);
+        }
+
+        .tips-section {
+            background: var(--card-bg);
+            padding: 2rem;
+            border-radius: 12px;
+            margin-top: 2rem;
+            border-left: 4px solid var(--primary-color);
+        }
+
+        .tips-section h3 {
+            margin-top: 0;
+            margin-bottom: 1rem;
+        }
+
+        .tips-section ul {
+            margin-left: 1.5rem;
+        }
+
+        .tips-section li {
+            margin-bottom: 0.75rem;
+            line-height: 1.6;
+        }
+
+        @media (max-width: 768px) {
+            .comparison-cards {
+                grid-template-columns: 1fr;
+            }
+        }
+    </style>'''
+
+# Overview page details for each exam domain
+DOMAIN_CONFIGS = {
+    1: {
+        'name': 'Design Solutions for Organizational Complexity',
+        'weight': '26%',
+        'questions': '~20 out of 75',
+        'description': 'Multi-account environments, hybrid networking, enterprise security, and cost optimization at scale.',
+        'icon': '🏢'
+    },
+    2: {
+        'name': 'Design for New Solutions',
+        'weight': '29%',
+        'questions': '~22 out of 75',
+        'description': 'Deployment strategies, business continuity, security controls, and reliability for new applications.',
+        'icon': '🚀'
+    },
+    3: {
+        'name': 'Continuous Improvement for Existing Solutions',
+        'weight': '25%',
+        'questions': '~19 out of 75',
+        'description': 'Operational excellence, security improvements, performance optimization, and cost reduction.',
+        'icon': '📈'
+    },
+    4: {
+        'name': 'Accelerate Workload Migration and Modernization',
+        'weight': '20%',
+        'questions': '~15 out of 75',
+        'description': 'Migration strategies, architecture redesign, modernization opportunities, and cloud-native adoption.',
+        'icon': '☁️'
+    }
+}
+
+
+# Card text for the known comparison guides, keyed by output file name
+COMPARISON_CARDS = {
+    'big-data-services-comparison.html': {
+        'icon': '📊',
+        'title': 'Big Data Services',
+        'description': 'Compare EMR, Athena, Glue, Kinesis, Redshift, and more. Learn when to use each service for data processing, analytics, and streaming workloads.',
+        'features': [
+            'Amazon EMR vs Glue vs Athena',
+            'Kinesis Data Streams vs Firehose',
+            'Redshift vs Athena vs EMR',
+            'MSK vs Kinesis',
+            'Real-world use case examples'
+        ]
+    },
+    'migration-services-comparison.html': {
+        'icon': '🚀',
+        'title': 'Migration Services',
+        'description': 'Comprehensive comparison of AWS migration services including MGN, DMS, DataSync, Snow Family, and Storage Gateway.',
+        'features': [
+            'Application Migration Service (MGN)',
+            'Database Migration Service (DMS)',
+            'DataSync vs Transfer Family',
+            'Snow Family devices',
+            'Migration decision trees'
+        ]
+    },
+    'storage-services-comparison.html': {
+        'icon': '💾',
+        'title': 'Storage Services',
+        'description': 'Deep dive into AWS storage options including S3, EBS, EFS, FSx, and Storage Gateway. Understand performance, durability, and cost trade-offs.',
+        'features': [
+            'S3 storage classes comparison',
+            'EBS vs EFS vs FSx',
+            'Storage Gateway types',
+            'Performance characteristics',
+            'Cost optimization strategies'
+        ]
+    },
+    'database-comparison.html': {
+        'icon': '🗄️',
+        'title': 'Database Services',
+        'description': 'Compare RDS engines, DynamoDB, Aurora, DocumentDB, Neptune, and specialized databases. Choose the right database for your workload.',
+        'features': [
+            'RDS vs Aurora vs DynamoDB',
+            'SQL vs NoSQL decision criteria',
+            'Read replica strategies',
+            'Global database options',
+            'Performance and scaling patterns'
+        ]
+    },
+    'load-balancer-comparison.html': {
+        'icon': '⚖️',
+        'title': 'Load Balancers',
+        'description': 'Understand the differences between ALB, NLB, GLB, and CLB. Learn routing algorithms, health checks, and advanced features.',
+        'features': [
+            'ALB vs NLB vs GLB comparison',
+            'Layer 4 vs Layer 7 routing',
+            'Target group configurations',
+            'SSL/TLS termination options',
+            'Use case recommendations'
+        ]
+    }
+}
+
+def topic_slug(topic):
+    """Normalise an exam topic to the name used in the index and its page URL."""
+    return TOPIC_SLUG_PATTERN.sub('-', str(topic).lower()).strip('-')
+
+def page_label(output_rel, title):
+    """Return a page's link text, falling back to its file name."""
+    stem = Path(output_rel).stem
+    if not title or title == DEFAULT_TITLE:
+        return stem.replace('-', ' ').replace('_', ' ').title()
+    return title
+
+def navigation_fingerprint():
+    """Hash the code the navigation pages are rendered with."""
+    source = ''.join(inspect.getsource(module) for module in (sys.modules[__name__], template, assets))
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+def build_metadata_index(pages):
+    """Build the metadata index from the pages of a conversion pass.
+
+    Each page is a dict with source_rel, output_rel, domain, title,
+    frontmatter, words and, for split documents, the output paths of their
+    section pages as sections. Topic, task and domain lists keep page order.
+    """
+    index = {
+        'version': METADATA_VERSION,
+        'navigation': navigation_fingerprint(),
+        'pages': {},
+        'topics': {},
+        'topic_labels': {},
+        'tasks': {},
+        'domains': {}
+    }
+
+    for page in pages:
+        frontmatter = page['frontmatter'] or {}
+        output_rel = page['output_rel']
+        task = frontmatter.get('task')
+        topics = []
+        for topic in frontmatter.get('exam_topics') or []:
+            slug = topic_slug(topic)
+            if slug and slug not in topics:
+                topics.append(slug)
+                index['topic_labels'].setdefault(slug, ' '.join(str(topic).split()))
+
+        entry = {
+            'source': page['source_rel'],
+            'title': page['title'],
+            'domain': page['domain'],
+            'task': str(task) if task is not None else None,
+            'weight': frontmatter.get('weight'),
+            'status': frontmatter.get('status'),
+            'topics': topics,
+            'words': page['words'],
+            'sections': page.get('sections') or []
+        }
+        index['pages'][output_rel] = entry
+
+        for topic in topics:
+            index['topics'].setdefault(topic, []).append(output_rel)
+        if entry['task']:
+            index['tasks'].setdefault(entry['task'], []).append(output_rel)
+        if entry['domain']:
+            index['domains'].setdefault(str(entry['domain']), []).append(output_rel)
+
+    index['topics'] = dict(sorted(index['topics'].items()))
+    index['topic_labels'] = dict(sorted(index['topic_labels'].items()))
+    index['tasks'] = dict(sorted(index['tasks'].items()))
+    return index
+
+def write_metadata_index(path, index):
+    """Write the metadata index, leaving the file untouched if unchanged."""
+    # Frontmatter may contain YAML dates, store them as strings
+    write_file(path, json.dumps(index, indent=2, ensure_ascii=False, default=str) + '\n')
+
+def load_metadata_index(path):
+    """Load a metadata index written by write_metadata_index()."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def page_details(page):
+    """Return the domain, task and length of a page as a short line."""
+    details = []
+    if page['domain']:
+        details.append(f"Domain {page['domain']}")
+    if page['task']:
+        details.append(f"Task {page['task']}")
+    details.append(f"{page['words']:,} words")
+    return ' · '.join(details)
+
+def create_domain_overview_page(domain_num, index):
+    """Create an overview page for each domain."""
+    config = DOMAIN_CONFIGS[domain_num]
+
+    tasks = []
+    supplementary = []
+
+    for output_rel in index['domains'].get(str(domain_num), []):
+        page = index['pages'][output_rel]
+        title = 'Domain Overview' if Path(output_rel).stem == 'README' else page_label(output_rel, page['title'])
+        item = {'path': output_rel, 'title': html.escape(title)}
+
+        if page['task']:
+            tasks.append(item)
+        else:
+            supplementary.append(item)
+
+    # Build materials HTML
+    tasks_html = '\n'.join([
+        f'<div class="material-item"><a href="{item["path"]}">{item["title"]}</a></div>'
+        for item in tasks
+    ])
+
+    supplementary_html = '\n'.join([
+        f'<div class="material-item"><a href="{item["path"]}">{item["title"]}</a></div>'
+        for item in supplementary
+    ]) if supplementary else '<div class="material-item">No supplementary materials</div>'
+
+    content = f'''<div style="text-align: center; margin-bottom: 2rem;">
+                    <div style="font-size: 5rem; margin-bottom: 1rem;">{config['icon']}</div>
+                    <h1>Domain {domain_num}: {config['name']}</h1>
+                    <div class="page-metadata">
+                        <span class="meta-item"><strong>Weight:</strong> {config['weight']}</span>
+                        <span class="meta-item"><strong>Expected Questions:</strong> {config['questions']}</span>
+                    </div>
+                </div>
+
+                <div style="background: var(--bg-tertiary); padding: 1.5rem; border-radius: 12px; margin: 2rem 0;">
+                    <p style="font-size: 1.1rem; margin: 0;">{config['description']}</p>
+                </div>
+
+                <h2>Core Tasks</h2>
+                <div class="card-grid" style="margin-bottom: 3rem;">
+                    {tasks_html}
+                </div>
+
+                <h2>Supplementary Materials</h2>
+                <div class="card-grid">
+                    {supplementary_html}
+                </div>
+
+                <div style="margin-top: 3rem; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 12px; text-align: center;">
+                    <h3 style="color: white; margin-bottom: 1rem;">Ready to test your knowledge?</h3>
+                    <p style="margin-bottom: 1.5rem;">Try the practice exam to see how well you understand this domain.</p>
+                    <a href="../exam/index.html" style="display: inline-block; background: white; color: #667eea; padding: 12px 32px; border-radius: 8px; font-weight: 600; text-decoration: none;">Take Practice Exam</a>
+                </div>'''
+
+    breadcrumb = f'''<div class="breadcrumb">
+            <a href="index.html">Study Materials</a> › Domain {domain_num}
+        </div>
+'''
+
+    sidebar = f'''            <div class="sidebar-section">
+                <h3>All Domains</h3>
+                <ul>
+                    <li><a href="domain-1.html" {'class="active"' if domain_num == 1 else ''}>Domain 1 (26%)</a></li>
+                    <li><a href="domain-2.html" {'class="active"' if domain_num == 2 else ''}>Domain 2 (29%)</a></li>
+                    <li><a href="domain-3.html" {'class="active"' if domain_num == 3 else ''}>Domain 3 (25%)</a></li>
+                    <li><a href="domain-4.html" {'class="active"' if domain_num == 4 else ''}>Domain 4 (20%)</a></li>
+                </ul>
+            </div>
+            <div class="sidebar-section">
+                <h3>Quick Links</h3>
+                <ul>
+                    <li><a href="cheatsheet.html" style="background: linear-gradient(135deg, #FFB84D 0%, #FF8C42 100%); padding: 8px 12px; border-radius: 6px; color: #0f0f1e; font-weight: 700; display: block; text-align: center; margin-bottom: 8px;">📋 Cheatsheet</a></li>
+                    <li><a href="study-plan.html">Study Plan</a></li>
+                    <li><a href="../exam/index.html">Practice Exam</a></li>
+                </ul>
+            </div>'''
+
+    return render_page(
+        f'Domain {domain_num}: {config["name"]}',
+        content,
+        base_path='..',
+        breadcrumb=breadcrumb,
+        sidebar=sidebar
+    )
+
+def create_comparisons_index_page(index):
+    """Create the comparisons landing page from the converted comparison guides."""
+    comparison_files = sorted(
+        Path(output_rel).name for output_rel in index['pages']
+        if output_rel.startswith('comparisons/')
+    )
+
+    # Generate cards HTML dynamically
+    cards_html = ''
+    for filename in comparison_files:
+        metadata = COMPARISON_CARDS.get(filename, {
+            'icon': '📋',
+            'title': filename.replace('-comparison.html', '').replace('-', ' ').title(),
+            'description': f'Comprehensive comparison guide for {filename.replace("-comparison.html", "").replace("-", " ")}.',
+            'features': ['Detailed service comparison', 'Use case examples', 'Decision criteria']
+        })
+
+        features_html = '\n'.join([f'<li>{feature}</li>' for feature in metadata['features']])
+
+        cards_html += f'''
+                    <div class="comparison-card">
+                        <div class="card-header">
+                            <span class="card-icon">{metadata['icon']}</span>
+                            <h2>{metadata['title']}</h2>
+                        </div>
+                        <div class="card-content">
+                            <p>{metadata['description']}</p>
+                            <ul class="feature-list">
+                                {features_html}
+                            </ul>
+                            <a href="{filename}" class="btn-card">View Guide →</a>
+                        </div>
+                    </div>
+'''
+
+    content = f'''<h1>🔀 AWS Service Comparisons</h1>
+
+                <p class="intro-text">
+                    Understanding when to use each AWS service is critical for the Solutions Architect Professional exam.
+                    These comparison guides help you make the right architectural decisions by highlighting key differences,
+                    use cases, and decision criteria.
+                </p>
+
+                <div class="comparison-cards">
+{cards_html}
+                </div>
+
+                <div class="tips-section">
+                    <h3>💡 How to Use These Guides</h3>
+                    <ul>
+                        <li><strong>Decision Trees:</strong> Follow the flowcharts to quickly identify the right service for your scenario</li>
+                        <li><strong>Comparison Tables:</strong> Side-by-side feature comparisons help you understand key differences</li>
+                        <li><strong>Real Scenarios:</strong> Practice with exam-style scenarios and explanations</li>
+                        <li><strong>Quick Reference:</strong> Use the summary tables during your final review before the exam</li>
+                    </ul>
+                </div>'''
+
+    breadcrumb = '''<div class="breadcrumb">
+            <a href="../index.html">Study Materials</a> › Service Comparisons
+        </div>
+'''
+
+    return render_page(
+        'AWS Service Comparisons',
+        content,
+        base_path='../..',
+        breadcrumb=breadcrumb,
+        sidebar=COMPARISONS_SIDEBAR,
+        tail='\n\n' + COMPARISONS_STYLE
+    )
+
+
+def topic_label(topic, index):
+    """Return the display name of a topic slug.
+
+    Topics written as slugs in the frontmatter are shown like file names
+    in page_label().
+    """
+    label = index.get('topic_labels', {}).get(topic, topic)
+    if label == topic:
+        return topic.replace('-', ' ').title()
+    return label
+
+def create_topic_page(topic, index):
+    """Create the page listing every study page tagged with an exam topic."""
+    label = topic_label(topic, index)
+    pages = [(output_rel, index['pages'][output_rel]) for output_rel in index['topics'][topic]]
+
+    items_html = '\n'.join([
+        f'<div class="material-item"><a href="../{output_rel}">{html.escape(page_label(output_rel, page["title"]))}</a>'
+        f'<span class="meta-item">{page_details(page)}</span></div>'
+        for output_rel, page in pages
+    ])
+    total_words = sum(page['words'] for _, page in pages)
+
+    content = f'''<h1>🏷️ {html.escape(label)}</h1>
+                <div class="page-metadata">
+                    <span class="meta-item"><strong>Pages:</strong> {len(pages)}</span>
+                    <span class="meta-item"><strong>Words:</strong> {total_words:,}</span>
+                </div>
+
+                <div class="card-grid">
+                    {items_html}
+                </div>'''
+
+    breadcrumb = f'''<div class="breadcrumb">
+            <a href="../index.html">Study Materials</a> › <a href="index.html">Topics</a> › {html.escape(label)}
+        </div>
+'''
+
+    return render_page(
+        f'Topic: {label}',
+        content,
+        base_path='../..',
+        breadcrumb=breadcrumb
+    )
+
+def create_topics_index_page(index):
+    """Create the landing page listing every exam topic."""
+    topics = sorted(index['topics'].items(), key=lambda item: (-len(item[1]), item[0]))
+
+    items_html = '\n'.join([
+        f'<div class="material-item"><a href="{topic_slug(topic)}.html">{html.escape(topic_label(topic, index))}</a>'
+        f'<span class="meta-item">{len(pages)} page{"s" if len(pages) != 1 else ""}</span></div>'
+        for topic, pages in topics
+    ])
+
+    content = f'''<h1>🏷️ Exam Topics</h1>
+                <p>Every topic listed in the <code>exam_topics</code> of the study pages, most covered first.</p>
+
+                <div class="card-grid">
+                    {items_html}
+                </div>'''
+
+    breadcrumb = '''<div class="breadcrumb">
+            <a href="../index.html">Study Materials</a> › Topics
+        </div>
+'''
+
+    return render_page(
+        'Exam Topics',
+        content,
+        base_path='../..',
+        breadcrumb=breadcrumb
+    )
+
+def navigation_pages(index):
+    """Map each navigation page, relative to study/, to the function and
+    arguments that render it."""
+    pages = {
+        f'domain-{domain_num}.html': (create_domain_overview_page, (domain_num, index))
+        for domain_num in DOMAIN_CONFIGS
+    }
+    pages['comparisons/index.html'] = (create_comparisons_index_page, (index,))
+    pages[f'{TAGS_DIR}/index.html'] = (create_topics_index_page, (index,))
+
+    for topic in index['topics']:
+        pages[f'{TAGS_DIR}/{topic_slug(topic)}.html'] = (create_topic_page, (topic, index))
+
+    return pages
+
+def navigation_inputs(rel_path, index):
+    """Return the part of the index a navigation page is rendered from.
+
+    The result is canonical JSON, so an index built in memory compares
+    equal to the same index loaded from metadata.json.
+    """
+    if rel_path == f'{TAGS_DIR}/index.html':
+        inputs = {topic: [topic_label(topic, index), len(pages)] for topic, pages in index['topics'].items()}
+        return json.dumps(inputs, sort_keys=True)
+
+    if rel_path == 'comparisons/index.html':
+        outputs = [output_rel for output_rel in index['pages'] if output_rel.startswith('comparisons/')]
+    elif rel_path.startswith(f'{TAGS_DIR}/'):
+        topic = Path(rel_path).stem
+        outputs = index['topics'].get(topic, [])
+        inputs = [topic_label(topic, index), [(output_rel, index['pages'][output_rel]) for output_rel in outputs]]
+        return json.dumps(inputs, sort_keys=True, default=str)
+    else:
+        outputs = index['domains'].get(rel_path[len('domain-'):-len('.html')], [])
+
+    inputs = [(output_rel, index['pages'][output_rel]) for output_rel in outputs]
+    return json.dumps(inputs, sort_keys=True, default=str)
+
+def write_navigation_pages(study_output, index, previous=None):
+    """Write the domain overviews, comparisons index and topic pages.
+
+    previous is the index the existing pages were built from; pages whose
+    inputs are unchanged since then are skipped, as are pages whose new
+    bytes match the file. Topic pages of topics no longer used by any page
+    are removed. Returns the paths written.
+    """
+    study_output = Path(study_output)
+    (study_output / 'comparisons').mkdir(exist_ok=True)
+    (study_output / TAGS_DIR).mkdir(exist_ok=True)
+
+    if previous and (previous.get('version') != index['version']
+                     or previous.get('navigation') != index['navigation']):
+        previous = None
+
+    pages = navigation_pages(index)
+    written = []
+
+    for rel_path, (create, args) in pages.items():
+        path = study_output / rel_path
+        if previous and path.exists() and navigation_inputs(rel_path, index) == navigation_inputs(rel_path, previous):
+            continue
+
+        if write_page(path, create(*args)):
+            written.append(path)
+
+    for path in (study_output / TAGS_DIR).glob('*.html'):
+        if f'{TAGS_DIR}/{path.name}' not in pages:
+            path.unlink()
+
+    return written
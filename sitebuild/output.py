@@ -0,0 +1,114 @@
+"""
+Output writer for generated files.
+
+write_file() leaves a file untouched when it already holds the new
+content, so unchanged pages keep their modification time between builds
+and deploys, and otherwise writes it atomically: the content goes to a
+temporary file in the same directory, which then replaces the target in
+one rename. An interrupted build leaves either the old or the new file,
+never a half-written one.
+
+OutputWriter queues writes on a thread pool, so a build can go on
+rendering while earlier files are compared and written.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+DEFAULT_THREADS = 4
+
+# mkstemp creates files readable by the owner only; give outputs the
+# permissions a plain open() would
+_umask = os.umask(0)
+os.umask(_umask)
+FILE_MODE = 0o666 & ~_umask
+
+def is_unchanged(path, data):
+    """Check whether path already holds exactly data."""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def atomic_write(path, data):
+    """Replace path with data through a temporary file and a rename."""
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def write_file(path, data):
+    """Write bytes or text (as UTF-8) unless unchanged. Returns True if written."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if is_unchanged(path, data):
+        return False
+    atomic_write(path, data)
+    return True
+
+def timed_write(path, data, profile=None):
+    """write_file(), timed as the 'write' stage of profile when one is given."""
+    with profile.stage('write') if profile is not None else nullcontext():
+        return write_file(path, data)
+
+class OutputWriter:
+    """Batch write_file() calls on a thread pool.
+
+    Use as a context manager; leaving it waits for every queued write and
+    re-raises the first error. With threads=0 each write happens on the
+    spot. written and unchanged list the paths of each outcome.
+    """
+
+    def __init__(self, threads=DEFAULT_THREADS):
+        self.executor = ThreadPoolExecutor(max_workers=threads) if threads > 0 else None
+        self.futures = []
+        self.written = []
+        self.unchanged = []
+
+    def write(self, path, data, profile=None):
+        """Queue a write of data to path.
+
+        profile, a sitebuild.profiling.Profile, records the time the write
+        takes as its 'write' stage, from the thread doing it.
+        """
+        if self.executor is None:
+            self.record(path, timed_write(path, data, profile))
+        else:
+            self.futures.append((path, self.executor.submit(timed_write, path, data, profile)))
+
+    def record(self, path, changed):
+        (self.written if changed else self.unchanged).append(path)
+
+    def wait(self):
+        """Wait for the queued writes, raising the first error."""
+        futures, self.futures = self.futures, []
+        for path, future in futures:
+            self.record(path, future.result())
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,140 @@
+"""
+Wall-time profiling for the build (convert-markdown.py --profile).
+
+Each rendered page records how long it spent in every stage (PAGE_STAGES)
+and its bytes in and out; the build records its own stages around them.
+write_trace() saves everything as a Chrome trace (chrome://tracing or
+https://ui.perfetto.dev), with one track per worker process and the
+per-page totals alongside, and print_report() summarises stage totals and
+the slowest pages.
+
+Without --profile no Profile is created and timed() costs one comparison.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from sitebuild.output import write_file
+
+PAGE_STAGES = ('read', 'frontmatter', 'wiki_links', 'markdown', 'template', 'write')
+
+class Profile:
+    """Stage timings of one page, or of the build as a whole."""
+
+    def __init__(self, name):
+        self.name = name
+        self.pid = os.getpid()
+        self.events = []
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.last = time.perf_counter()
+
+    @contextmanager
+    def stage(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((stage, start, time.perf_counter() - start))
+
+    def lap(self, stage):
+        """Record the time since the previous lap, or since creation, as stage."""
+        now = time.perf_counter()
+        self.events.append((stage, self.last, now - self.last))
+        self.last = now
+
+    def totals(self):
+        """Return the seconds spent in each stage."""
+        totals = {}
+        for stage, _, duration in self.events:
+            totals[stage] = totals.get(stage, 0) + duration
+        return totals
+
+    def to_dict(self):
+        """Return a plain dict, picklable from pool workers."""
+        totals = self.totals()
+        return {
+            'name': self.name,
+            'pid': self.pid,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'total': sum(totals.values()),
+            'stages': totals,
+            'events': self.events
+        }
+
+def timed(profile, stage):
+    """Time a block as stage of profile, or do nothing when profile is None."""
+    return profile.stage(stage) if profile is not None else nullcontext()
+
+def lap(profile, stage):
+    """Record a lap of profile, or do nothing when profile is None."""
+    if profile is not None:
+        profile.lap(stage)
+
+def trace_events(profile):
+    """Convert a profile dict to Chrome trace 'complete' events."""
+    return [
+        {
+            'name': stage,
+            'cat': 'page' if stage in PAGE_STAGES else 'build',
+            'ph': 'X',
+            'ts': round(start * 1e6),
+            'dur': round(duration * 1e6),
+            'pid': 0,
+            'tid': profile['pid'],
+            'args': {'page': profile['name']}
+        }
+        for stage, start, duration in profile['events']
+    ]
+
+def write_trace(path, build, pages):
+    """Write the build and page profiles as a Chrome trace with page totals."""
+    events = trace_events(build)
+    for page in pages:
+        events.extend(trace_events(page))
+
+    trace = {
+        'traceEvents': events,
+        'displayTimeUnit': 'ms',
+        'build': {key: build[key] for key in ('total', 'stages')},
+        'pages': [
+            {key: page[key] for key in ('name', 'pid', 'bytes_in', 'bytes_out', 'total', 'stages')}
+            for page in sorted(pages, key=lambda page: page['total'], reverse=True)
+        ]
+    }
+
+    write_file(path, json.dumps(trace, indent=1))
+
+def print_report(build, pages, trace_path=None, slowest=10):
+    """Print stage totals across pages, the build stages and the slowest pages."""
+    print(f"\n⏱️  Build profile: {len(pages)} page(s) rendered in {build['total'] * 1000:.0f} ms")
+
+    if pages:
+        page_total = sum(page['total'] for page in pages) or 1
+        print(f"\n  {'Page stage':<14}{'Total ms':>10}{'Share':>8}")
+        for stage in PAGE_STAGES:
+            seconds = sum(page['stages'].get(stage, 0) for page in pages)
+            print(f"  {stage:<14}{seconds * 1000:>10.1f}{seconds / page_total * 100:>7.1f}%")
+
+        bytes_in = sum(page['bytes_in'] for page in pages)
+        bytes_out = sum(page['bytes_out'] for page in pages)
+        print(f"  Bytes: {bytes_in:,} markdown in → {bytes_out:,} HTML out")
+
+    print(f"\n  {'Build stage':<14}{'Total ms':>10}")
+    for stage, seconds in build['stages'].items():
+        print(f"  {stage:<14}{seconds * 1000:>10.1f}")
+
+    if pages:
+        print("\n  Slowest pages:")
+        for page in sorted(pages, key=lambda page: page['total'], reverse=True)[:slowest]:
+            top_stage = max(page['stages'], key=page['stages'].get)
+            print(f"  {page['total'] * 1000:>8.1f} ms  {page['name']}  "
+                  f"({page['bytes_in']:,} → {page['bytes_out']:,} bytes, "
+                  f"{top_stage} {page['stages'][top_stage] / page['total'] * 100:.0f}%)")
+
+    if trace_path:
+        print(f"\n  Trace written to {Path(trace_path)}")
@@ -0,0 +1,336 @@
+"""
+Publish stage: copy the deployable part of the site into dist/.
+
+The repository root holds the Markdown sources, questions/, review notes
+and build scripts next to the generated site. This stage, run last, starts
+from index.html and follows every local href and src of the HTML pages and
+every url() and @import of the stylesheets it reaches. Files that scripts
+load at run time are added as well:
+
+- the study sidebar's links and the shared scripts (sitebuild.assets)
+- exam/all-questions.json, exam/data/manifest.json and the shards it lists
+- exam/data/blueprint.json and the question blocks it points to
+- exam/data/related.json, the study sections of the exam review screen
+- study/search/manifest.json and the term shards and document blocks it lists
+
+Only those files are copied, under the same relative paths, so dist/ can be
+uploaded as the Pages artifact as it is. Unchanged files are left alone
+(see sitebuild.output), and files of earlier runs that are no longer
+reachable are removed. dist/.publish-manifest.json lists every published
+file with its size. Local links to missing files are reported.
+
+Since everything else in it is removed, the output directory must be new,
+empty or one published into before (holding that manifest), and may not
+be or hold the repository or overlap the directories of the site.
+
+The copies, not the files they come from, are optimised for serving:
+
+- --minify minifies the pages and stylesheets (sitebuild.minify)
+- --precompress writes .gz/.br sidecars next to every text file
+
+Run from the repository root: python3 -m sitebuild.publish [--output dist] [--minify] [--precompress]
+"""
+
+import argparse
+import json
+import posixpath
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from sitebuild import assets, compress, minify, questions, related, search
+from sitebuild.output import write_file
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+OUTPUT_DIR = 'dist'
+MANIFEST_NAME = '.publish-manifest.json'
+MANIFEST_VERSION = 1
+ENTRY_PAGE = 'index.html'
+
+# Copied even though nothing links to them
+EXTRA_FILES = ('.nojekyll',)
+
+# Never published into: the site and question sources under the root
+SOURCE_DIRS = ('study', 'exam', 'styles', 'questions')
+
+# Given .gz/.br sidecars with --precompress
+COMPRESSED_SUFFIXES = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.xml')
+
+# Attributes holding a URL, by tag
+LINK_ATTRIBUTES = {
+    'a': ('href',),
+    'link': ('href',),
+    'script': ('src',),
+    'img': ('src',),
+    'source': ('src',),
+    'iframe': ('src',)
+}
+
+CSS_URL_PATTERN = re.compile(r'''url\(\s*['"]?([^'")]+)['"]?\s*\)|@import\s+['"]([^'"]+)['"]''')
+
+class LinkParser(HTMLParser):
+    """Collect the URLs of links, stylesheets, scripts and images."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if value and name in LINK_ATTRIBUTES.get(tag, ()):
+                self.urls.append(value)
+
+def html_links(text):
+    """Return the URLs an HTML document links to."""
+    parser = LinkParser()
+    parser.feed(text)
+    parser.close()
+    return parser.urls
+
+def css_links(text):
+    """Return the URLs a stylesheet refers to."""
+    return [url or imported for url, imported in CSS_URL_PATTERN.findall(text)]
+
+def resolve(rel_path, url):
+    """Resolve url, found in the file at rel_path, to a path under the root.
+
+    Returns None for external URLs, page-internal anchors and paths that
+    leave the root. Links to a directory resolve to its index.html.
+    """
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+
+    path = unquote(parts.path)
+    if path.startswith('/'):
+        target = path.lstrip('/')
+    else:
+        target = posixpath.join(posixpath.dirname(rel_path), path)
+
+    target = posixpath.normpath(target)
+    if target == '..' or target.startswith('../'):
+        return None
+    if target == '.':
+        return ENTRY_PAGE
+    if path.endswith('/'):
+        target += '/index.html'
+    return target
+
+def runtime_files(root):
+    """Return the files scripts fetch, which no HTML page links to."""
+    root = Path(root)
+    files = {f'study/{path}' for path in assets.SHARED_ASSETS}
+
+    # Sidebar links are inserted by a script, relative to the site root
+    files.update(
+        target for target in (resolve(ENTRY_PAGE, url)
+                              for url in html_links(assets.STUDY_SIDEBAR.replace('{base_path}', '')))
+        if target
+    )
+
+    exam_dir = 'exam'
+    data_dir = f'{exam_dir}/{questions.DATA_DIR}'
+    files.add(f'{exam_dir}/{questions.BUNDLE_NAME}')
+    exam_manifest = load_json(root / data_dir / questions.MANIFEST_NAME)
+    if exam_manifest is not None:
+        files.add(f'{data_dir}/{questions.MANIFEST_NAME}')
+        files.update(f"{data_dir}/{shard['file']}" for shard in exam_manifest.get('shards', []))
+    blueprint = load_json(root / data_dir / questions.BLUEPRINT_NAME)
+    if blueprint is not None:
+        files.add(f'{data_dir}/{questions.BLUEPRINT_NAME}')
+        files.update(f"{data_dir}/{blueprint['blocks']}{index}.json" for index in range(blueprint['blockCount']))
+
+    files.add(f'{data_dir}/{related.RELATED_NAME}')
+
+    search_dir = f'study/{search.SEARCH_DIR}'
+    search_manifest = load_json(root / search_dir / search.MANIFEST_NAME)
+    if search_manifest is not None:
+        files.add(f'{search_dir}/{search.MANIFEST_NAME}')
+        files.update(f'{search_dir}/{search.TERMS_DIR}/{name}' for name in search_manifest.get('terms', {}).values())
+        files.update(f'{search_dir}/{search.DOCS_DIR}/{name}' for name in search_manifest.get('docs', []))
+
+    return files
+
+def load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def reachable_files(root, entry=ENTRY_PAGE):
+    """Follow links from entry; return (reachable paths, missing links).
+
+    Paths are relative to root, with forward slashes. Missing links are
+    (linking file, target) pairs.
+    """
+    root = Path(root)
+    pending = [entry, *sorted(runtime_files(root)), *EXTRA_FILES]
+    seen = set()
+    found = set()
+    missing = []
+
+    # Runtime files and extras are optional; only links found in pages are
+    # reported as missing
+    linked_from = {}
+
+    while pending:
+        rel_path = pending.pop()
+        if rel_path in seen:
+            continue
+        seen.add(rel_path)
+
+        path = root / rel_path
+        if not path.is_file():
+            if rel_path in linked_from:
+                missing.append((linked_from[rel_path], rel_path))
+            continue
+        found.add(rel_path)
+
+        if rel_path.endswith('.html'):
+            links = html_links(path.read_text(encoding='utf-8'))
+        elif rel_path.endswith('.css'):
+            links = css_links(path.read_text(encoding='utf-8'))
+        else:
+            continue
+
+        for url in links:
+            target = resolve(rel_path, url)
+            if target is not None and target not in seen:
+                linked_from.setdefault(target, rel_path)
+                pending.append(target)
+
+    return sorted(found), sorted(missing)
+
+def check_output_dir(root, output_dir):
+    """Raise ValueError when publishing into output_dir could delete files it did not publish."""
+    root = Path(root).resolve()
+    output_dir = Path(output_dir).resolve()
+
+    if output_dir == root or output_dir in root.parents:
+        raise ValueError(f'{output_dir} holds the repository')
+    for name in SOURCE_DIRS:
+        source = root / name
+        if output_dir == source or source in output_dir.parents:
+            raise ValueError(f'{output_dir} overlaps {name}/, which the site is built from')
+    if output_dir.is_dir() and any(output_dir.iterdir()) and not (output_dir / MANIFEST_NAME).exists():
+        raise ValueError(f'{output_dir} is not empty and holds no {MANIFEST_NAME} of an earlier publish')
+
+def publish(root, output_dir, files, minify_files=False, precompress=False, report=None):
+    """Copy files from root into output_dir and remove everything else.
+
+    With minify_files, pages and stylesheets are minified on the way; with
+    precompress, text files get .gz/.br sidecars. report, if given,
+    collects the sizes of every minified file by path. Returns the publish
+    manifest. Raises ValueError for an output_dir check_output_dir()
+    refuses, before anything is written.
+    """
+    check_output_dir(root, output_dir)
+    root = Path(root)
+    output_dir = Path(output_dir)
+    entries = {}
+    sidecars = set()
+    rejected = []
+    written = 0
+
+    for rel_path in files:
+        data = (root / rel_path).read_bytes()
+        original_size = len(data)
+        if minify_files:
+            data, failed = minify.minify_file(rel_path, data)
+            if failed:
+                rejected.append(rel_path)
+
+        target = output_dir / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        changed = write_file(target, data)
+        written += changed
+        entries[rel_path] = len(data)
+
+        sizes = {'raw': len(data)}
+        if precompress and rel_path.endswith(COMPRESSED_SUFFIXES):
+            sidecars.update(f'{rel_path}{suffix}' for suffix in compress.SIDECAR_SUFFIXES)
+            # Sidecars of an unchanged file are still current
+            if changed or not target.with_name(target.name + '.gz').exists():
+                sizes = compress.write_sidecars(target, data)
+            else:
+                sizes.update(compress.sidecar_sizes(target))
+        if report is not None and minify_files and rel_path.endswith(('.html', '.css')):
+            report[rel_path] = {'original': original_size, **sizes}
+
+    # Remove what earlier runs published and this one did not
+    for path in sorted(output_dir.rglob('*'), reverse=True):
+        rel_path = path.relative_to(output_dir).as_posix()
+        if path.is_file() and rel_path not in entries and rel_path not in sidecars and rel_path != MANIFEST_NAME:
+            path.unlink()
+        elif path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'fileCount': len(entries),
+        'bytes': sum(entries.values()),
+        'files': entries
+    }
+    write_file(output_dir / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    manifest['written'] = written
+    manifest['rejected'] = rejected
+    return manifest
+
+def source_bytes(root, output_dir):
+    """Total size of the files under root, outside .git and output_dir."""
+    root = Path(root)
+    skipped = (root / '.git', Path(output_dir).resolve())
+    return sum(
+        path.stat().st_size
+        for path in root.rglob('*')
+        if path.is_file() and not any(parent in skipped for parent in path.resolve().parents)
+    )
+
+def main(output=OUTPUT_DIR, minify_files=False, precompress=False):
+    """Publish the files reachable from index.html into output."""
+    output_dir = PROJECT_ROOT / output
+    files, missing = reachable_files(PROJECT_ROOT)
+    report = {}
+    try:
+        manifest = publish(PROJECT_ROOT, output_dir, files, minify_files, precompress, report)
+    except ValueError as error:
+        sys.exit(f"❌ Not publishing to {output}: {error}")
+    everything = source_bytes(PROJECT_ROOT, output_dir)
+
+    print(f"✓ Published {manifest['fileCount']} files, {manifest['bytes']:,} bytes, to {output}/ "
+          f"({manifest['written']} written)")
+    print(f"  Repository without .git: {everything:,} bytes "
+          f"({manifest['bytes'] / everything * 100:.1f}% published)")
+
+    if minify_files:
+        pages = {path: sizes for path, sizes in report.items() if path.endswith('.html')}
+        stylesheets = {path: sizes for path, sizes in report.items() if path.endswith('.css')}
+        minify.print_report(pages, 'pages')
+        if stylesheets:
+            minify.print_report(stylesheets, 'stylesheets')
+
+    if manifest['rejected']:
+        print(f"\n⚠️  {len(manifest['rejected'])} file(s) published unminified, minified output differed:")
+        for rel_path in manifest['rejected']:
+            print(f"   {rel_path}")
+
+    if missing:
+        print(f"\n⚠️  {len(missing)} link(s) to missing files:")
+        for source, target in missing:
+            print(f"   {source} → {target}")
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Copy the files reachable from index.html into a publish directory.')
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'publish directory (default: {OUTPUT_DIR})')
+    parser.add_argument('--minify', action='store_true', help='minify the published pages and stylesheets')
+    parser.add_argument('--precompress', action='store_true', help='write .gz/.br sidecars of the published text files')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(output=args.output, minify_files=args.minify, precompress=args.precompress)
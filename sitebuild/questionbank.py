@@ -0,0 +1,399 @@
+"""
+Question bank validation and indexes.
+
+Reads every file under questions/ once, in its raw form, and checks each
+question against the schema the exam app relies on:
+
+- 'question' is non-empty text and 'options' a list of at least two
+  distinct, non-empty strings
+- 'correctAnswer' is an option index for single-answer questions, or a
+  list of at least two distinct option indexes for multi-select ones
+- 'type', when given, matches the shape of 'correctAnswer'
+- explicit ids are unique across the bank and stems are not repeated
+- declared question counts match the questions in the file
+
+Questions whose stems are near-duplicates of another are reported as
+warnings. Stems are cut into word shingles and sketched with one
+permutation MinHash: every shingle is hashed once into one of
+SIGNATURE_BINS bins, keeping the minimum per bin. Bands of the sketch are
+bucketed, so only questions sharing a band are compared, and those pairs
+are confirmed with the exact Jaccard similarity of their shingles. The
+cost grows with the size of the bank, not with the number of pairs.
+Shingles shared by a large share of the bank, such as the closing
+question of a stem, are left out first.
+
+The validated bank is indexed by domain, task, type and exam topic. Topics
+are the frontmatter exam_topics of the study pages (study/metadata.json);
+a question belongs to a topic when its text contains the topic's words.
+
+Run from the repository root: python3 -m sitebuild.questionbank [--strict]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from itertools import combinations
+from pathlib import Path
+
+from sitebuild import navigation, questions, search
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+QUESTION_TYPES = ('single', 'multiple')
+
+# Near-duplicate detection: word shingle length, sketch size, band layout
+# and the Jaccard similarity above which two stems are reported
+SHINGLE_SIZE = 3
+SIGNATURE_BINS = 32
+BAND_ROWS = 4
+SIMILARITY_THRESHOLD = 0.7
+
+# Shingles in more than this share of stems (and more than the minimum
+# count) are ignored as boilerplate
+COMMON_SHINGLE_SHARE = 0.01
+COMMON_SHINGLE_MIN = 10
+
+HASH_MASK = (1 << 61) - 1
+
+def issue(severity, location, message):
+    return {'severity': severity, 'location': location, 'message': message}
+
+def normalize_stem(text):
+    """Lower-case a stem and collapse its whitespace, for exact comparisons."""
+    return ' '.join(str(text or '').lower().split())
+
+def check_question(raw):
+    """Return the schema problems of one raw question as (severity, message)."""
+    problems = []
+    text = raw.get('question')
+    options = raw.get('options')
+    answer = raw.get('correctAnswer')
+    question_type = raw.get('type')
+
+    if not isinstance(text, str) or not text.strip():
+        problems.append(('error', "missing or empty 'question'"))
+
+    if not isinstance(options, list) or len(options) < 2:
+        problems.append(('error', "'options' must be a list of at least two options"))
+        options = options if isinstance(options, list) else []
+    elif not all(isinstance(option, str) and option.strip() for option in options):
+        problems.append(('error', "every option must be non-empty text"))
+    elif len({normalize_stem(option) for option in options}) < len(options):
+        problems.append(('error', "'options' contains the same option twice"))
+
+    if isinstance(answer, bool) or not isinstance(answer, (int, list)):
+        problems.append(('error', f"'correctAnswer' must be an index or a list of indexes, not {answer!r}"))
+    else:
+        indexes = answer if isinstance(answer, list) else [answer]
+        if not all(isinstance(index, int) and not isinstance(index, bool) for index in indexes):
+            problems.append(('error', f"'correctAnswer' {answer!r} contains a non-integer index"))
+        elif any(index < 0 or index >= len(options) for index in indexes):
+            problems.append(('error', f"'correctAnswer' {answer!r} is outside the {len(options)} options"))
+        elif isinstance(answer, list) and len(set(answer)) != len(answer):
+            problems.append(('error', f"'correctAnswer' {answer!r} repeats an index"))
+        elif isinstance(answer, list) and len(answer) < 2:
+            problems.append(('error', f"multi-select 'correctAnswer' {answer!r} needs at least two answers"))
+
+    if question_type is not None:
+        if question_type not in QUESTION_TYPES:
+            problems.append(('error', f"unknown 'type' {question_type!r}"))
+        elif (question_type == 'multiple') != isinstance(answer, list):
+            shape = 'a list' if isinstance(answer, list) else 'a single index'
+            problems.append(('error', f"'type' is {question_type!r} but 'correctAnswer' is {shape}"))
+
+    explanation = raw.get('explanation', '')
+    if not isinstance(explanation, str):
+        problems.append(('error', f"'explanation' must be text, not {explanation!r}"))
+    elif not explanation.strip():
+        problems.append(('warning', "missing 'explanation'"))
+
+    return problems
+
+def load_bank(questions_dir):
+    """Read and check every question file in one pass.
+
+    Returns (records, issues). Each record is a question with its file,
+    normalised domain and task and content hash; issues are dicts with a
+    severity ('error' or 'warning'), a location and a message.
+    """
+    records = []
+    issues = []
+
+    for path in sorted(Path(questions_dir).glob('*.json')):
+        try:
+            content = json.loads(path.read_bytes())
+        except ValueError as error:
+            issues.append(issue('error', path.name, f'invalid JSON: {error}'))
+            continue
+
+        if not isinstance(content, dict):
+            issues.append(issue('error', path.name, 'top level is not an object'))
+            continue
+
+        domain = questions.normalize_domain(content.get('domain'))
+        if not domain.startswith(('Domain ', 'Mixed Domains')):
+            issues.append(issue('warning', path.name, f"unrecognised domain {content.get('domain')!r}"))
+
+        file_count = 0
+        for task, raw_questions in questions.raw_question_sets(content):
+            task = questions.normalize_task(task)
+
+            for number, raw in enumerate(raw_questions, 1):
+                location = f'{path.name} [{task or "no task"}] #{number}'
+                if not isinstance(raw, dict):
+                    issues.append(issue('error', location, 'question is not an object'))
+                    continue
+
+                if raw.get('id'):
+                    location += f" ({raw['id']})"
+                for severity, message in check_question(raw):
+                    issues.append(issue(severity, location, message))
+
+                question, digest = questions.normalize_question(raw)
+                records.append(dict(
+                    question,
+                    explicitId=bool(raw.get('id')),
+                    file=path.name,
+                    location=location,
+                    domain=domain,
+                    task=task,
+                    taskId=questions.task_id(task),
+                    hash=digest
+                ))
+                file_count += 1
+
+        declared = content.get('question_count', content.get('total_questions'))
+        if file_count == 0:
+            # The aggregation stage skips the file, so nothing broken ships
+            issues.append(issue('warning', path.name, 'no question list in any known layout, file skipped'))
+        elif isinstance(declared, int) and declared != file_count:
+            issues.append(issue('warning', path.name, f'declares {declared} questions but holds {file_count}'))
+
+    return records, issues
+
+def check_uniqueness(records):
+    """Report explicit ids used twice and stems repeated across the bank.
+
+    Questions identical in stem, options and answer are dropped by the
+    aggregation stage, so a repeat of those is only a warning.
+    """
+    issues = []
+    first_id = {}
+    first_stem = {}
+
+    for record in records:
+        if record['explicitId']:
+            other = first_id.setdefault(record['id'], record)
+            if other is not record:
+                issues.append(issue('error', record['location'], f"id also used by {other['location']}"))
+
+        stem = normalize_stem(record['question'])
+        if not stem:
+            continue
+        other = first_stem.setdefault(stem, record)
+        if other is record:
+            continue
+        if other['hash'] == record['hash']:
+            issues.append(issue('warning', record['location'], f"exact copy of {other['location']}"))
+        else:
+            issues.append(issue('error', record['location'], f"same stem as {other['location']}"))
+
+    return issues
+
+def shingle_hash(shingle):
+    """Hash a shingle the same way in every process.
+
+    The builtin hash() of a str is salted per process (PYTHONHASHSEED),
+    which would change the LSH candidates between identical runs.
+    """
+    digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & HASH_MASK
+
+def shingles(text):
+    """Return the hashed word shingles of a text."""
+    words = search.TOKEN_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {shingle_hash(' '.join(words))} if words else set()
+    return {
+        shingle_hash(' '.join(words[i:i + SHINGLE_SIZE]))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+def signature(hashes):
+    """One permutation MinHash: the smallest hash value in each bin."""
+    bins = [None] * SIGNATURE_BINS
+    for value in hashes:
+        slot = value % SIGNATURE_BINS
+        value //= SIGNATURE_BINS
+        if bins[slot] is None or value < bins[slot]:
+            bins[slot] = value
+    return bins
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def near_duplicates(texts, threshold=SIMILARITY_THRESHOLD):
+    """Return (i, j, similarity) for every pair of texts at least threshold similar.
+
+    Pairs of identical texts are included; candidates come from LSH bands
+    of the MinHash signatures, see the module docstring.
+    """
+    shingle_sets = [shingles(text) for text in texts]
+
+    # Boilerplate such as 'what should the company do' is shared by many
+    # stems; left in, it would put them all in the same buckets
+    counts = Counter(value for hashes in shingle_sets for value in hashes)
+    limit = max(COMMON_SHINGLE_MIN, len(texts) * COMMON_SHINGLE_SHARE)
+    common = {value for value, count in counts.items() if count > limit}
+    if common:
+        shingle_sets = [hashes - common for hashes in shingle_sets]
+
+    buckets = defaultdict(list)
+    # Bins left empty by short texts say nothing about similarity
+    empty_band = (None,) * BAND_ROWS
+
+    for i, hashes in enumerate(shingle_sets):
+        bins = signature(hashes)
+        for band in range(0, SIGNATURE_BINS, BAND_ROWS):
+            rows = tuple(bins[band:band + BAND_ROWS])
+            if rows != empty_band:
+                buckets[band, rows].append(i)
+
+    candidates = set()
+    for members in buckets.values():
+        candidates.update(combinations(members, 2))
+
+    pairs = []
+    for i, j in sorted(candidates):
+        similarity = jaccard(shingle_sets[i], shingle_sets[j])
+        if similarity >= threshold:
+            pairs.append((i, j, similarity))
+    return pairs
+
+def check_near_duplicates(records, threshold=SIMILARITY_THRESHOLD):
+    """Warn about stems that are near, but not exact, copies of another."""
+    stems = [normalize_stem(record['question']) for record in records]
+    issues = []
+
+    for i, j, similarity in near_duplicates(stems, threshold):
+        if stems[i] != stems[j]:
+            issues.append(issue(
+                'warning',
+                records[j]['location'],
+                f"stem {similarity:.0%} similar to {records[i]['location']}"
+            ))
+
+    return issues
+
+def topic_phrases(topics):
+    """Group topics by their first word, as (' words of the topic ', topic) pairs."""
+    phrases = defaultdict(list)
+    for topic in topics:
+        words = search.TOKEN_PATTERN.findall(str(topic).lower())
+        if words:
+            phrases[words[0]].append((f" {' '.join(words)} ", topic))
+    return phrases
+
+def question_topics(record, phrases):
+    """Return the topics whose words appear, in order, in a question's text."""
+    # Fields with the wrong type are reported by check_question()
+    options = record['options'] if isinstance(record['options'], list) else []
+    text = ' '.join([str(record['question'] or ''), *map(str, options), str(record['explanation'] or '')])
+    words = search.TOKEN_PATTERN.findall(text.lower())
+    text = f" {' '.join(words)} "
+
+    # Only topics starting with a word of the question can match
+    return {
+        topic
+        for first in phrases.keys() & set(words)
+        for phrase, topic in phrases[first]
+        if phrase in text
+    }
+
+def build_indexes(records, topics=()):
+    """Index question ids by domain, task, type and exam topic."""
+    indexes = {'domain': defaultdict(list), 'task': defaultdict(list),
+               'type': defaultdict(list), 'topic': defaultdict(list)}
+    phrases = topic_phrases(topics)
+
+    for record in records:
+        indexes['domain'][record['domain']].append(record['id'])
+        indexes['task'][record['taskId'] or record['task'] or 'none'].append(record['id'])
+        indexes['type'][record['type']].append(record['id'])
+        for topic in question_topics(record, phrases):
+            indexes['topic'][topic].append(record['id'])
+
+    return {name: dict(sorted(index.items())) for name, index in indexes.items()}
+
+def load_topics(study_output):
+    """Return the exam topics of the study pages, or () before the first build."""
+    try:
+        return tuple(navigation.load_metadata_index(Path(study_output) / navigation.METADATA_NAME)['topics'])
+    except (OSError, ValueError, KeyError):
+        return ()
+
+def validate(questions_dir, topics=(), threshold=SIMILARITY_THRESHOLD):
+    """Load, check and index the question bank. Returns (records, issues, indexes)."""
+    records, issues = load_bank(questions_dir)
+    issues += check_uniqueness(records)
+    issues += check_near_duplicates(records, threshold)
+    return records, issues, build_indexes(records, topics)
+
+def print_issues(issues):
+    for severity, icon in (('error', '❌'), ('warning', '⚠️ ')):
+        selected = [entry for entry in issues if entry['severity'] == severity]
+        if selected:
+            print(f"\n{icon} {len(selected)} {severity}(s):")
+            for entry in selected:
+                print(f"   {entry['location']}: {entry['message']}")
+
+def check_bank(questions_dir, topics=(), threshold=SIMILARITY_THRESHOLD):
+    """Validate a question bank and print the issues found.
+
+    Returns (records, issues, indexes), as validate() does.
+    """
+    start = time.perf_counter()
+    records, issues, indexes = validate(questions_dir, topics, threshold)
+    elapsed = time.perf_counter() - start
+
+    errors = sum(entry['severity'] == 'error' for entry in issues)
+    warnings = len(issues) - errors
+
+    print(f"✓ Checked {len(records)} questions in {len({r['file'] for r in records})} files "
+          f"in {elapsed:.2f}s: {errors} error(s), {warnings} warning(s)")
+    print(f"  Indexed {len(indexes['domain'])} domains, {len(indexes['task'])} tasks, "
+          f"{len(indexes['type'])} types, {len(indexes['topic'])} of {len(topics)} topics")
+    print_issues(issues)
+    return records, issues, indexes
+
+def main(strict=False, threshold=SIMILARITY_THRESHOLD, index_path=None):
+    """Validate questions/ and report; exits with status 1 on errors."""
+    topics = load_topics(PROJECT_ROOT / 'study')
+    _, issues, indexes = check_bank(PROJECT_ROOT / 'questions', topics, threshold)
+    errors = sum(entry['severity'] == 'error' for entry in issues)
+    warnings = len(issues) - errors
+
+    if index_path:
+        Path(index_path).write_text(json.dumps(indexes, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"\nIndexes written to {index_path}")
+
+    if errors or (strict and warnings):
+        sys.exit(1)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Validate and index the question bank.')
+    parser.add_argument('--strict', action='store_true', help='also fail on warnings')
+    parser.add_argument('--threshold', type=float, default=SIMILARITY_THRESHOLD,
+                        help=f'stem similarity reported as a near-duplicate (default: {SIMILARITY_THRESHOLD})')
+    parser.add_argument('--index', metavar='PATH', help='write the domain, task, type and topic indexes as JSON')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(strict=args.strict, threshold=args.threshold, index_path=args.index)
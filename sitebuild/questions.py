@@ -0,0 +1,608 @@
+"""
+Question bank build stage for the exam app.
+
+Reads every file under questions/, normalises the three file layouts into
+one schema, drops questions duplicated across batch files and writes:
+
+- exam/all-questions.json, the single-file bundle
+- exam/data/shards/, one small shard per domain and task
+- exam/data/manifest.json, shard counts and hashes for the app's startup
+- exam/data/blueprint.json and exam/data/blocks/, the bank in fixed-size
+  blocks and the domain pools and quotas the app samples an exam from
+
+Files are re-read only when they change; normalised sets are cached in
+exam/data/.aggregate-cache.json between runs.
+
+--compact writes minified JSON, --columnar stores each question list as
+one array per field instead of repeating the keys of every question, and
+--precompress adds .gz/.br sidecars. With any of them the stage prints a
+size and parse-time comparison of the encodings.
+
+Run from the repository root: python3 -m sitebuild.questions [--compact]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sitebuild import compress
+from sitebuild.output import write_file
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Output layout, relative to exam/
+BUNDLE_NAME = 'all-questions.json'
+DATA_DIR = 'data'
+SHARDS_DIR = 'shards'
+MANIFEST_NAME = 'manifest.json'
+BLUEPRINT_NAME = 'blueprint.json'
+BLOCKS_DIR = 'blocks'
+CACHE_NAME = '.aggregate-cache.json'
+MANIFEST_VERSION = 1
+BLUEPRINT_VERSION = 1
+
+# Questions per block file, and the length of a full practice exam
+BLOCK_SIZE = 25
+EXAM_LENGTH = 75
+
+# Bumping this invalidates the aggregate cache
+SCHEMA_VERSION = 1
+
+# Field order of the columnar encoding
+QUESTION_FIELDS = ['id', 'type', 'question', 'options', 'correctAnswer', 'explanation']
+
+DOMAIN_NAMES = {
+    '1': 'Domain 1: Organizational Complexity',
+    '2': 'Domain 2: Design for New Solutions',
+    '3': 'Domain 3: Continuous Improvement for Existing Solutions',
+    '4': 'Domain 4: Accelerate Workload Migration and Modernization'
+}
+
+# Share of the scored questions each domain has in the real exam
+DOMAIN_WEIGHTS = {
+    DOMAIN_NAMES['1']: 0.26,
+    DOMAIN_NAMES['2']: 0.29,
+    DOMAIN_NAMES['3']: 0.25,
+    DOMAIN_NAMES['4']: 0.20
+}
+
+DOMAIN_PATTERN = re.compile(r'^Domain (\d)\b')
+MIXED_PATTERN = re.compile(r'^Mixed Domains\s*[-:]\s*')
+TASK_KEY_PATTERN = re.compile(r'^task_(\d+\.\d+)_(\w+)$')
+TASK_ID_PATTERN = re.compile(r'^Task (\d+\.\d+)(?![\d.-])')
+
+def normalize_domain(domain):
+    """Map the domain spellings used across files onto one name per domain."""
+    domain = str(domain or 'Uncategorized').strip()
+
+    match = DOMAIN_PATTERN.match(domain)
+    if match and match.group(1) in DOMAIN_NAMES:
+        return DOMAIN_NAMES[match.group(1)]
+
+    # 'Mixed Domains - X' and 'Mixed Domains: X' are the same set
+    return MIXED_PATTERN.sub('Mixed Domains: ', domain)
+
+def normalize_task(task):
+    """Turn legacy keys such as task_2.2_business_continuity into labels."""
+    task = str(task or '').strip()
+
+    match = TASK_KEY_PATTERN.match(task)
+    if match:
+        words = match.group(2).replace('_', ' ').title()
+        return f'Task {match.group(1)}: {words}'
+
+    return task
+
+def task_id(task):
+    """Return the exam task number ('2.2') of a single-task label, if any."""
+    match = TASK_ID_PATTERN.match(task)
+    return match.group(1) if match else None
+
+def question_hash(question):
+    """Hash the parts that make two questions identical, ignoring whitespace."""
+    key = json.dumps([
+        ' '.join(str(question.get('question') or '').split()),
+        [' '.join(str(option).split()) for option in question.get('options') or []],
+        question.get('correctAnswer')
+    ], ensure_ascii=False)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def normalize_question(raw):
+    """Return a question in the bundle schema, with its content hash."""
+    digest = question_hash(raw)
+    correct_answer = raw.get('correctAnswer')
+
+    question = {
+        'id': raw.get('id') or f'q-{digest[:12]}',
+        'type': raw.get('type') or ('multiple' if isinstance(correct_answer, list) else 'single'),
+        'question': raw.get('question', ''),
+        'options': raw.get('options', []),
+        'correctAnswer': correct_answer,
+        'explanation': raw.get('explanation', '')
+    }
+
+    return question, digest
+
+def raw_question_sets(content):
+    """Yield (task, questions) pairs for each of the three file layouts."""
+    if isinstance(content.get('questions'), list):
+        # Simple format: a flat questions array
+        yield content.get('task'), content['questions']
+        return
+
+    # Nested 'tasks' object, or legacy task keys at the top level
+    tasks = content['tasks'] if isinstance(content.get('tasks'), dict) else content
+
+    for task_key, task in tasks.items():
+        if isinstance(task, dict) and isinstance(task.get('questions'), list):
+            yield task_key, task['questions']
+
+def load_question_file(path):
+    """Read one question file into normalised question sets.
+
+    Raises ValueError, naming the file, for invalid JSON and for a file or
+    question that is not an object (see sitebuild.questionbank).
+    """
+    data = Path(path).read_bytes()
+
+    try:
+        content = json.loads(data)
+    except ValueError as error:
+        raise ValueError(f'{path}: {error}') from error
+    if not isinstance(content, dict):
+        raise ValueError(f'{path}: top level is not an object')
+
+    domain = normalize_domain(content.get('domain'))
+    question_sets = []
+
+    for task, raw_questions in raw_question_sets(content):
+        task = normalize_task(task)
+        questions = []
+        hashes = []
+
+        for number, raw in enumerate(raw_questions, 1):
+            if not isinstance(raw, dict):
+                raise ValueError(f'{path}: [{task or "no task"}] #{number}: question is not an object')
+            question, digest = normalize_question(raw)
+            questions.append(question)
+            hashes.append(digest)
+
+        question_sets.append({
+            'filename': Path(path).name,
+            'domain': domain,
+            'task': task,
+            'taskId': task_id(task),
+            'questions': questions,
+            'hashes': hashes
+        })
+
+    return hashlib.sha256(data).hexdigest(), question_sets
+
+def load_cache(cache_path):
+    """Load the per-file cache of a previous aggregation."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get('schema') != SCHEMA_VERSION:
+        return {}
+
+    return cache.get('files', {})
+
+def aggregate_questions(questions_dir, cache_path=None):
+    """Load, normalise and deduplicate every question file.
+
+    Returns (question_sets, stats). A file is re-read only when its size or
+    modification time changed, and re-parsed only when its content did.
+    """
+    cached = load_cache(cache_path) if cache_path else {}
+    files = {}
+    stats = {'files': 0, 'read': 0, 'duplicates': 0}
+
+    for path in sorted(Path(questions_dir).glob('*.json')):
+        stat = path.stat()
+        entry = cached.get(path.name)
+        stats['files'] += 1
+
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            files[path.name] = entry
+            continue
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        stats['read'] += 1
+
+        if not entry or entry['sha256'] != digest:
+            digest, question_sets = load_question_file(path)
+            entry = {'sha256': digest, 'sets': question_sets}
+
+        files[path.name] = dict(entry, mtime=stat.st_mtime_ns, size=stat.st_size)
+
+    if cache_path:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        # Written atomically, so an interrupted build never leaves half a cache
+        write_file(cache_path, json.dumps({'schema': SCHEMA_VERSION, 'files': files}, ensure_ascii=False))
+
+    # Keep the first copy of a question repeated across batch files
+    seen = set()
+    question_sets = []
+
+    for name in sorted(files):
+        for question_set in files[name]['sets']:
+            questions = []
+            for question, digest in zip(question_set['questions'], question_set['hashes']):
+                if digest in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(digest)
+                questions.append(question)
+
+            if questions:
+                question_sets.append({
+                    'filename': question_set['filename'],
+                    'domain': question_set['domain'],
+                    'task': question_set['task'],
+                    'taskId': question_set['taskId'],
+                    'question_count': len(questions),
+                    'questions': questions
+                })
+
+    return question_sets, stats
+
+def encode_questions(questions, columnar=False):
+    """Return a question list as-is, or as {'fields', 'columns'} arrays."""
+    if not columnar:
+        return questions
+
+    return {
+        'fields': QUESTION_FIELDS,
+        'columns': [[question.get(field) for question in questions] for field in QUESTION_FIELDS]
+    }
+
+def dump_json(data, compact=False):
+    """Serialise to UTF-8 JSON: minified, or indented for reading."""
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    return text.encode('utf-8')
+
+def write_json(path, data, compact=False, precompress=False):
+    """Write JSON, leaving the file untouched when the content is the same."""
+    data = dump_json(data, compact)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_file(path, data)
+
+    if precompress:
+        compress.write_sidecars(path, data)
+    else:
+        compress.remove_sidecars(path)
+
+    return len(data)
+
+def build_bundle(question_sets, columnar=False):
+    """Return the all-questions.json structure, without its date."""
+    domains = sorted({question_set['domain'] for question_set in question_sets})
+
+    return {
+        'metadata': {
+            'totalFiles': len({question_set['filename'] for question_set in question_sets}),
+            'totalQuestions': sum(question_set['question_count'] for question_set in question_sets),
+            'domains': domains,
+            'encoding': 'columnar' if columnar else 'objects',
+            'lastUpdated': None
+        },
+        'questionSets': [
+            dict(question_set, questions=encode_questions(question_set['questions'], columnar))
+            for question_set in question_sets
+        ]
+    }
+
+def write_question_bundle(question_sets, exam_dir, compact=False, columnar=False, precompress=False):
+    """Write all-questions.json, returning the bundle."""
+    bundle_path = Path(exam_dir) / BUNDLE_NAME
+    bundle = build_bundle(question_sets, columnar)
+
+    # Only stamp a new date when the questions themselves changed
+    try:
+        with open(bundle_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        if dict(previous['metadata'], lastUpdated=None) == bundle['metadata'] \
+                and previous['questionSets'] == bundle['questionSets']:
+            bundle['metadata']['lastUpdated'] = previous['metadata']['lastUpdated']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    if bundle['metadata']['lastUpdated'] is None:
+        bundle['metadata']['lastUpdated'] = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+
+    write_json(bundle_path, bundle, compact, precompress)
+    return bundle
+
+def slugify(text):
+    """Turn a domain or task label into a file-name-safe slug."""
+    slug = re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-')
+    return slug[:60].rstrip('-') or 'untitled'
+
+def group_shards(question_sets):
+    """Merge question sets into one shard per (domain, task) pair."""
+    shards = {}
+
+    for question_set in question_sets:
+        key = (question_set['domain'], question_set['task'])
+        if key not in shards:
+            shards[key] = {
+                'domain': question_set['domain'],
+                'task': question_set['task'],
+                'taskId': question_set['taskId'],
+                'questions': []
+            }
+        shards[key]['questions'].extend(question_set['questions'])
+
+    return list(shards.values())
+
+def write_question_shards(question_sets, exam_dir, compact=False, columnar=False, precompress=False):
+    """Write the question shards and their manifest, returning the manifest."""
+    data_dir = Path(exam_dir) / DATA_DIR
+    shards_dir = data_dir / SHARDS_DIR
+    shards_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'totalQuestions': 0,
+        'domains': [],
+        'shards': []
+    }
+    domain_counts = {}
+    written = set()
+
+    for shard in group_shards(question_sets):
+        count = len(shard['questions'])
+        shard['questions'] = encode_questions(shard['questions'], columnar)
+        data = dump_json(shard, compact)
+        digest = hashlib.sha256(data).hexdigest()
+
+        # The hash in the file name lets browsers cache shards indefinitely
+        slug = slugify(f"{shard['domain']}--{shard['task']}")
+        filename = f'{slug}.{digest[:12]}.json'
+        path = shards_dir / filename
+        written.add(filename)
+
+        if not path.exists():
+            write_file(path, data)
+
+        if precompress:
+            compress.write_sidecars(path, data)
+        else:
+            compress.remove_sidecars(path)
+
+        manifest['shards'].append({
+            'file': f'{SHARDS_DIR}/{filename}',
+            'domain': shard['domain'],
+            'task': shard['task'],
+            'taskId': shard['taskId'],
+            'questionCount': count,
+            'hash': digest,
+            'bytes': len(data)
+        })
+        manifest['totalQuestions'] += count
+        domain_counts[shard['domain']] = domain_counts.get(shard['domain'], 0) + count
+
+    # Each domain's share of a full exam, for apps without the blueprint
+    pools = {pool['domain']: pool for pool in exam_pools(domain_counts)}
+    manifest['domains'] = [
+        {'name': name, 'questionCount': count, 'weight': pools[name]['weight'], 'quota': pools[name]['quota']}
+        for name, count in sorted(domain_counts.items())
+    ]
+
+    # Drop shards from previous builds that no longer exist
+    for path in shards_dir.iterdir():
+        source = compress.sidecar_source(path) or path
+        if source.name not in written:
+            path.unlink()
+
+    write_json(data_dir / MANIFEST_NAME, manifest, compact, precompress)
+    return manifest
+
+def largest_remainder(weights, total):
+    """Split total into integer shares proportional to weights."""
+    scale = sum(weights)
+    exact = [weight / scale * total for weight in weights]
+    shares = [int(share) for share in exact]
+    by_remainder = sorted(range(len(weights)), key=lambda i: exact[i] - shares[i], reverse=True)
+    for i in by_remainder[:total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+def exam_quotas(pools, length=EXAM_LENGTH):
+    """Return how many questions of each pool a full exam takes.
+
+    Weighted pools split the exam by their weights. A pool too small for
+    its share gives the rest to the other weighted pools, and only when
+    they are all used up do the unweighted pools (mixed-domain sets) fill
+    the exam, in proportion to their size.
+    """
+    quotas = [0] * len(pools)
+    remaining = min(length, sum(pool['count'] for pool in pools))
+    open_pools = [i for i, pool in enumerate(pools) if pool['count']]
+
+    while remaining and open_pools:
+        weighted = [i for i in open_pools if pools[i]['weight']] or open_pools
+        shares = largest_remainder([pools[i]['weight'] or pools[i]['count'] for i in weighted], remaining)
+        for i, share in zip(weighted, shares):
+            take = min(share, pools[i]['count'] - quotas[i])
+            quotas[i] += take
+            remaining -= take
+        open_pools = [i for i in open_pools if quotas[i] < pools[i]['count']]
+
+    return quotas
+
+def exam_pools(counts, length=EXAM_LENGTH):
+    """Return the pools of a full exam from domain -> question count.
+
+    One pool per domain, the exam domains first, with its 'domain',
+    'weight', 'count' and 'quota' (see exam_quotas()).
+    """
+    domains = [name for name in DOMAIN_WEIGHTS if name in counts]
+    domains += sorted(name for name in counts if name not in DOMAIN_WEIGHTS)
+
+    pools = [
+        {'domain': name, 'weight': DOMAIN_WEIGHTS.get(name), 'count': counts[name]}
+        for name in domains
+    ]
+    for pool, quota in zip(pools, exam_quotas(pools, length)):
+        pool['quota'] = quota
+    return pools
+
+def write_exam_blueprint(question_sets, exam_dir, compact=False, columnar=False, precompress=False):
+    """Write the question blocks and the exam blueprint, returning the blueprint.
+
+    Questions are ordered by domain, exam domains first, so each domain's
+    question ids are a contiguous range of positions; position n is entry
+    n % BLOCK_SIZE of block n // BLOCK_SIZE. The blueprint lists each
+    domain's range, weight and quota of a full exam, so the app can sample
+    an exam's positions and fetch only the blocks they fall in, however
+    large the bank is.
+
+    Blocks go in a directory named after a hash of their content, so the
+    blueprint stays the same size as the bank grows and a changed bank
+    never mixes with blocks cached from an older one.
+    """
+    data_dir = Path(exam_dir) / DATA_DIR
+    blocks_root = data_dir / BLOCKS_DIR
+
+    by_domain = {}
+    for question_set in question_sets:
+        by_domain.setdefault(question_set['domain'], []).extend(question_set['questions'])
+    pools = exam_pools({name: len(domain_questions) for name, domain_questions in by_domain.items()})
+    ordered = []
+    for pool in pools:
+        pool['start'] = len(ordered)
+        ordered.extend(by_domain[pool['domain']])
+
+    blocks = [
+        dump_json({'questions': encode_questions(ordered[start:start + BLOCK_SIZE], columnar)}, compact)
+        for start in range(0, len(ordered), BLOCK_SIZE)
+    ]
+    digest = hashlib.sha256(b'\n'.join(blocks)).hexdigest()[:12]
+    blocks_dir = blocks_root / digest
+    blocks_dir.mkdir(parents=True, exist_ok=True)
+
+    for index, data in enumerate(blocks):
+        path = blocks_dir / f'{index}.json'
+        write_file(path, data)
+        if precompress:
+            compress.write_sidecars(path, data)
+        else:
+            compress.remove_sidecars(path)
+
+    # Drop the blocks of earlier builds
+    for path in blocks_root.iterdir():
+        if path.is_dir() and path != blocks_dir:
+            shutil.rmtree(path)
+        elif path.is_file():
+            path.unlink()
+
+    blueprint = {
+        'version': BLUEPRINT_VERSION,
+        'totalQuestions': len(ordered),
+        'examLength': sum(pool['quota'] for pool in pools),
+        'blockSize': BLOCK_SIZE,
+        'blockCount': len(blocks),
+        'blocks': f'{BLOCKS_DIR}/{digest}/',
+        'pools': pools
+    }
+    write_json(data_dir / BLUEPRINT_NAME, blueprint, compact, precompress)
+    return blueprint
+
+def encoding_report(question_sets, repeat=5):
+    """Compare bundle sizes and parse times of the available encodings.
+
+    Parse time is measured with Python's json module, as a stand-in for
+    JSON.parse in the browser.
+    """
+    rows = []
+
+    for label, compact, columnar in [
+        ('pretty', False, False),
+        ('minified', True, False),
+        ('minified + columnar', True, True)
+    ]:
+        data = dump_json(build_bundle(question_sets, columnar), compact)
+        text = data.decode('utf-8')
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            json.loads(text)
+            timings.append(time.perf_counter() - start)
+
+        brotli_data = compress.brotli_bytes(data)
+        rows.append({
+            'label': label,
+            'raw': len(data),
+            'gz': len(compress.gzip_bytes(data)),
+            'br': len(brotli_data) if brotli_data is not None else None,
+            'parse_ms': statistics.median(timings) * 1000
+        })
+
+    return rows
+
+def print_encoding_report(rows):
+    """Print the table produced by encoding_report()."""
+    print("\n  Bundle encoding       raw bytes    gzip bytes  brotli bytes  parse ms")
+    for row in rows:
+        br = f"{row['br']:>12,}" if row['br'] is not None else f"{'n/a':>12}"
+        print(f"  {row['label']:<20} {row['raw']:>10,} {row['gz']:>13,} {br} {row['parse_ms']:>9.1f}")
+    if rows[-1]['br'] is None:
+        print("  (install the brotli module for .br sidecars)")
+
+def write_exam_data(question_sets, stats, exam_dir, compact=False, columnar=False, precompress=False):
+    """Write the bundle, shards and blueprint of aggregated questions and report."""
+    options = {'compact': compact, 'columnar': columnar, 'precompress': precompress}
+    bundle = write_question_bundle(question_sets, exam_dir, **options)
+    manifest = write_question_shards(question_sets, exam_dir, **options)
+    blueprint = write_exam_blueprint(question_sets, exam_dir, **options)
+
+    print(f"✓ Created {BUNDLE_NAME}, {len(manifest['shards'])} question shards "
+          f"and {blueprint['blockCount']} blocks of {BLOCK_SIZE}")
+    print(f"  Total questions: {bundle['metadata']['totalQuestions']}")
+    print(f"  Total question sets: {len(question_sets)}")
+    print(f"  Total files: {stats['files']} ({stats['read']} re-read)")
+    print(f"  Duplicates removed: {stats['duplicates']}")
+    print(f"  Domains: {', '.join(bundle['metadata']['domains'])}")
+    print(f"  Full exam: {blueprint['examLength']} questions, " + ', '.join(
+        f"{pool['quota']} from {pool['domain'].split(':')[0]}" for pool in blueprint['pools'] if pool['quota']
+    ))
+
+    if compact or columnar or precompress:
+        print_encoding_report(encoding_report(question_sets))
+
+def main(compact=False, columnar=False, precompress=False):
+    """Aggregate the question bank and write the exam bundles."""
+    exam_dir = PROJECT_ROOT / 'exam'
+    question_sets, stats = aggregate_questions(
+        PROJECT_ROOT / 'questions',
+        exam_dir / DATA_DIR / CACHE_NAME
+    )
+    write_exam_data(question_sets, stats, exam_dir, compact, columnar, precompress)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Aggregate questions/ into the exam bundles.')
+    parser.add_argument('--compact', action='store_true', help='write minified JSON')
+    parser.add_argument('--columnar', action='store_true', help='store question fields as columns')
+    parser.add_argument('--precompress', action='store_true', help='write .gz/.br sidecar files')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(compact=args.compact, columnar=args.columnar, precompress=args.precompress)
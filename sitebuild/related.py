@@ -0,0 +1,230 @@
+"""
+Related content: the study pages and sections close to each page and question.
+
+Pages, study sections and questions become TF-IDF vectors over the terms
+of the search index (sitebuild.search.tokenize): sublinear term counts
+times a smoothed IDF, cut down to their MAX_TERMS heaviest terms and
+L2-normalised. Cosine similarities are accumulated through an inverted
+index of the candidates instead of comparing every pair: a vector only
+meets the candidates that share one of its terms, and each term keeps
+only its POSTING_LIMIT heaviest candidates. The build does not depend on
+NumPy.
+
+Both cuts make the results approximate: terms outside a vector's
+MAX_TERMS heaviest and candidates outside a term's POSTING_LIMIT
+heaviest do not count towards a similarity, so a close match can be
+missed or ranked lower than exact cosine similarity would rank it.
+
+Results never depend on the order terms come in, so term counts read
+back from the build manifest relate pages exactly as freshly counted
+ones do: vectors are sorted by term, equal weights are cut by term and
+equal scores ranked by id.
+
+- convert-markdown.py ends every page with a "Related pages" block,
+  from vectors of the Markdown sources kept in its build manifest.
+- The related stage splits the converted pages at their headings (as the
+  search index does) and writes exam/data/related.json: a table of the
+  sections and, by question id, the indexes of the sections closest to
+  each question. The exam review screen links each question to those
+  sections. The exam data itself does not depend on the pages.
+
+Run the related stage from the repository root: python3 -m sitebuild.related
+"""
+
+import argparse
+import heapq
+import math
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from sitebuild import navigation, questions, search
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+RELATED_NAME = 'related.json'
+RELATED_VERSION = 2
+
+MAX_TERMS = 24
+POSTING_LIMIT = 64
+# Terms of a page kept in the build manifest, by count
+PAGE_TERMS = 96
+
+RELATED_PAGES = 4
+RELATED_SECTIONS = 3
+# Shorter sections are headings with a line or two, poor link targets
+MIN_SECTION_TERMS = 25
+MIN_SCORE = 0.1
+
+def page_terms(title, topics, body):
+    """Return the weighted term counts of a page's Markdown, for the manifest."""
+    terms = search.weighted_terms([
+        (title, search.HEADING_WEIGHT),
+        (' '.join(str(topic) for topic in topics or []), search.TOPIC_WEIGHT),
+        (body, search.TEXT_WEIGHT)
+    ])
+    return dict(sorted(heapq.nsmallest(PAGE_TERMS, terms.items(), key=lambda item: (-item[1], item[0]))))
+
+def idf_table(documents):
+    """Return term -> smoothed inverse document frequency."""
+    frequency = Counter()
+    for terms in documents:
+        frequency.update(terms.keys())
+    count = len(documents)
+    return {term: math.log((1 + count) / (1 + df)) + 1 for term, df in frequency.items()}
+
+def vectorize(terms, idf, max_terms=MAX_TERMS):
+    """Return the heaviest TF-IDF weights of terms as a unit [(term, weight)] list.
+
+    Terms missing from idf are left out; of equal weights, the first
+    terms in sort order are kept. The list is sorted by term.
+    """
+    weights = [
+        (term, (1 + math.log(count)) * idf[term])
+        for term, count in terms.items()
+        if count > 0 and term in idf
+    ]
+    top = sorted(heapq.nsmallest(max_terms, weights, key=lambda item: (-item[1], item[0])))
+    norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1
+    return [(term, weight / norm) for term, weight in top]
+
+def inverted_index(vectors, limit=POSTING_LIMIT):
+    """Return term -> [(id, weight)] for the limit heaviest vectors of each term."""
+    postings = defaultdict(list)
+    for doc_id, vector in enumerate(vectors):
+        for term, weight in vector:
+            postings[term].append((weight, doc_id))
+
+    return {
+        term: [(doc_id, weight) for weight, doc_id in heapq.nlargest(limit, entries)]
+        for term, entries in postings.items()
+    }
+
+def nearest(vector, postings, count, exclude=None, min_score=MIN_SCORE):
+    """Return the ids of the count candidates most similar to vector.
+
+    Of equal scores, the lowest ids come first.
+    """
+    scores = {}
+    get = scores.get
+    for term, weight in vector:
+        for doc_id, other in postings.get(term, ()):
+            scores[doc_id] = get(doc_id, 0.0) + weight * other
+
+    scores.pop(exclude, None)
+    return [
+        doc_id for doc_id, score in heapq.nsmallest(count, scores.items(), key=lambda item: (-item[1], item[0]))
+        if score >= min_score
+    ]
+
+def related_pages(pages, count=RELATED_PAGES):
+    """Map each key of pages, key -> term counts, to the keys of its closest pages."""
+    keys = list(pages)
+    idf = idf_table(list(pages.values()))
+    vectors = [vectorize(pages[key], idf) for key in keys]
+    postings = inverted_index(vectors)
+
+    return {
+        key: [keys[other] for other in nearest(vector, postings, count, exclude=doc_id)]
+        for doc_id, (key, vector) in enumerate(zip(keys, vectors))
+    }
+
+def study_sections(study_output, index):
+    """Yield (url, page title, heading, terms) for every section of the pages.
+
+    Sections are those of the search index; split documents contribute
+    their section pages.
+    """
+    for output_rel, page in index['pages'].items():
+        title = page['title']
+        for position, page_rel in enumerate([output_rel, *page.get('sections', [])]):
+            path = Path(study_output) / page_rel
+            if not path.exists():
+                continue
+
+            sections = search.page_sections(path)
+            if position == 0:
+                title = next((heading for _, heading, _ in sections if heading), page['title'])
+
+            for anchor, heading, text in sections:
+                url = f'study/{page_rel}#{anchor}' if anchor else f'study/{page_rel}'
+                terms = search.weighted_terms([(heading, search.HEADING_WEIGHT), (text, search.TEXT_WEIGHT)])
+                yield url, title, heading, terms
+
+def question_terms(question):
+    """Return the weighted term counts of a question."""
+    return search.weighted_terms([
+        (question['question'] or '', search.STEM_WEIGHT),
+        (' '.join(str(option) for option in question['options'] or []), search.TEXT_WEIGHT),
+        (question.get('explanation') or '', search.TEXT_WEIGHT)
+    ])
+
+def relate_questions(study_output, index, question_sets, count=RELATED_SECTIONS):
+    """Find the closest sections of each question.
+
+    Returns the section table, [url, page title, heading] per section,
+    holding only the sections some question is related to, and question
+    id -> the indexes of its sections in the table. Questions without
+    related sections are left out.
+    """
+    sections = [
+        section for section in study_sections(study_output, index)
+        if sum(section[3].values()) >= MIN_SECTION_TERMS
+    ]
+    idf = idf_table([terms for _, _, _, terms in sections])
+    postings = inverted_index([vectorize(terms, idf) for _, _, _, terms in sections])
+
+    table = []
+    positions = {}
+    links = {}
+    for question_set in question_sets:
+        for question in question_set['questions']:
+            related = []
+            for section_id in nearest(vectorize(question_terms(question), idf), postings, count):
+                if section_id not in positions:
+                    positions[section_id] = len(table)
+                    url, title, heading, _ = sections[section_id]
+                    table.append([url, title, heading if heading != title else ''])
+                related.append(positions[section_id])
+            if related:
+                links[question['id']] = related
+
+    return table, links
+
+def write_related(table, links, exam_dir, precompress=False):
+    """Write the section table and the sections of each question."""
+    path = Path(exam_dir) / questions.DATA_DIR / RELATED_NAME
+    return questions.write_json(path, {'version': RELATED_VERSION, 'sections': table, 'questions': links},
+                                compact=True, precompress=precompress)
+
+def relate_site(study_output, index, question_sets, exam_dir, precompress=False):
+    """Relate question_sets to the sections of the pages in index and report."""
+    start = time.perf_counter()
+    table, links = relate_questions(study_output, index, question_sets)
+    size = write_related(table, links, exam_dir, precompress)
+
+    question_count = sum(len(question_set['questions']) for question_set in question_sets)
+    print(f"✓ Related {len(links)} of {question_count} questions to {len(table)} study sections "
+          f"in {time.perf_counter() - start:.2f}s ({size:,} bytes)")
+    return table, links
+
+def main(precompress=False):
+    """Relate the question bank to the converted pages."""
+    exam_dir = PROJECT_ROOT / 'exam'
+    study_output = PROJECT_ROOT / 'study'
+    question_sets, _ = questions.aggregate_questions(
+        PROJECT_ROOT / 'questions',
+        exam_dir / questions.DATA_DIR / questions.CACHE_NAME
+    )
+    index = navigation.load_metadata_index(study_output / navigation.METADATA_NAME)
+    relate_site(study_output, index, question_sets, exam_dir, precompress)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Relate questions to study sections.')
+    parser.add_argument('--precompress', action='store_true', help='write .gz/.br sidecar files')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(precompress=args.precompress)
@@ -0,0 +1,106 @@
+"""
+Content-addressed cache of rendered Markdown.
+
+Each entry is the HTML the Markdown engine produced for one page body,
+stored under the hash of that body and a salt naming everything else the
+output depends on (converter version, extensions, markdown release). An
+entry never has to be invalidated: a change to any input changes the key.
+
+The cache is a plain directory, .cache/render/ by default, so CI can keep
+it between runs (e.g. with actions/cache) and a fresh checkout renders
+only what changed since the cached build. Reads refresh an entry's
+modification time; prune() evicts the least recently used entries once
+the directory exceeds its size cap.
+
+Pool workers each open the cache from the pickled RenderCache and write
+entries atomically, so concurrent renders never see a partial entry.
+Pruning is left to the parent process.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from sitebuild.output import atomic_write
+
+CACHE_DIR = '.cache/render'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENTRY_SUFFIX = '.html'
+
+class RenderCache:
+    """Rendered HTML by content hash, in a size-bounded directory."""
+
+    def __init__(self, directory, salt='', max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.salt = salt
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source):
+        """Return the cache key of a Markdown source."""
+        digest = hashlib.sha256(self.salt.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return self.directory / key[:2] / f'{key}{ENTRY_SUFFIX}'
+
+    def get(self, source):
+        """Return the cached HTML of source, or None."""
+        path = self.path(self.key(source))
+        try:
+            html = path.read_text(encoding='utf-8')
+        except OSError:
+            self.misses += 1
+            return None
+
+        # Mark the entry as recently used for prune()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return html
+
+    def put(self, source, html):
+        """Store the HTML rendered from source."""
+        path = self.path(self.key(source))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, html.encode('utf-8'))
+        except OSError:
+            # A full or read-only cache only costs the next build a render
+            pass
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits max_bytes.
+
+        Returns (entries kept, bytes kept, entries evicted).
+        """
+        entries = []
+        for path in self.directory.glob(f'*/*{ENTRY_SUFFIX}'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        entries.sort(reverse=True)
+        kept = 0
+        kept_bytes = 0
+        evicted = 0
+
+        for _, size, path in entries:
+            if kept_bytes + size <= self.max_bytes:
+                kept += 1
+                kept_bytes += size
+                continue
+            try:
+                path.unlink()
+                evicted += 1
+            except OSError:
+                pass
+
+        return kept, kept_bytes, evicted
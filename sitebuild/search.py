@@ -0,0 +1,347 @@
+"""
+Full-text search index over the study pages and the question bank.
+
+Every converted page is split at its headings into sections, and every
+question becomes one document. Their terms go into an inverted index that
+is written to study/search/ in small shards, one per term prefix, so the
+browser only fetches the shards for the words being searched:
+
+- study/search/manifest.json, the shard and document block file names
+- study/search/terms/, term -> postings, one file per PREFIX_LENGTH prefix
+- study/search/docs/, document titles and URLs in blocks of DOC_BLOCK_SIZE
+
+Question hits link to exam/index.html#q=<question id>, which the exam app
+opens as a single question with its answer check.
+
+Postings are flat [doc delta, score, ...] lists. Scores are BM25 weights
+computed at build time, so the browser only has to add them up. Headings,
+frontmatter exam_topics and question stems count more than body text.
+
+Pages are read from the HTML written by convert-markdown.py and listed in
+its metadata index (study/metadata.json); run this stage after it.
+
+Run from the repository root: python3 -m sitebuild.search [--precompress]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+from html.parser import HTMLParser
+from itertools import groupby
+from pathlib import Path
+from urllib.parse import quote
+
+from sitebuild import compress, navigation, questions
+from sitebuild.output import write_file
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Output layout, relative to study/
+SEARCH_DIR = 'search'
+TERMS_DIR = 'terms'
+DOCS_DIR = 'docs'
+MANIFEST_NAME = 'manifest.json'
+
+INDEX_VERSION = 1
+PREFIX_LENGTH = 2
+DOC_BLOCK_SIZE = 256
+
+# Field weights, as multiples of a body text occurrence
+HEADING_WEIGHT = 3
+TOPIC_WEIGHT = 3
+STEM_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4')
+# Scripts, styles and the contents, pager and related-pages blocks of pages
+SKIPPED_TAGS = ('script', 'style', 'nav', 'aside')
+
+# Shipped in the manifest so the browser tokenizes queries the same way
+STOPWORDS = frozenset('''
+a an and are as at be but by can do does for from has have how if in into
+is it its may not of on or so than that the their then there these this
+those to use used using vs was what when where which while who why will
+with you your
+'''.split())
+
+def stem(token):
+    """Strip the most common plural endings; mirrored by the search script."""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text):
+    """Return the index terms of a text, in order.
+
+    Terms are interned, so the term counts of every document share one
+    copy of each term.
+    """
+    return [
+        sys.intern(stem(token)) for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+class PageSections(HTMLParser):
+    """Split the <article> of a generated page into heading sections."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sections = [{'anchor': '', 'heading': [], 'text': []}]
+        self.in_article = False
+        self.heading = None
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'article':
+            self.in_article = True
+        elif tag in SKIPPED_TAGS:
+            self.skipping += 1
+        elif self.in_article and not self.skipping and tag in HEADING_TAGS:
+            self.heading = tag
+            self.sections.append({'anchor': dict(attrs).get('id') or '', 'heading': [], 'text': []})
+
+    def handle_endtag(self, tag):
+        if tag == 'article':
+            self.in_article = False
+        elif tag in SKIPPED_TAGS:
+            self.skipping = max(self.skipping - 1, 0)
+        elif tag == self.heading:
+            self.heading = None
+
+    def handle_data(self, data):
+        if not self.in_article or self.skipping:
+            return
+        section = self.sections[-1]
+        section['heading' if self.heading else 'text'].append(data)
+
+def page_sections(path):
+    """Return (anchor, heading, text) for each non-empty section of a page."""
+    parser = PageSections()
+    parser.feed(Path(path).read_text(encoding='utf-8'))
+    parser.close()
+
+    sections = []
+    for section in parser.sections:
+        heading = ' '.join(''.join(section['heading']).split())
+        text = ' '.join(''.join(section['text']).split())
+        if heading or text:
+            sections.append((section['anchor'], heading, text))
+    return sections
+
+def weighted_terms(fields):
+    """Count the terms of (text, weight) fields into one weighted Counter."""
+    terms = Counter()
+    for text, weight in fields:
+        for term in tokenize(text):
+            terms[term] += weight
+    return terms
+
+def page_documents(study_output, index=None):
+    """Yield (doc, terms) for every section of every converted page.
+
+    index is the metadata index of the pages; by default it is read from
+    study/metadata.json.
+    """
+    if index is None:
+        index_path = Path(study_output) / navigation.METADATA_NAME
+        if not index_path.exists():
+            return
+        index = navigation.load_metadata_index(index_path)
+
+    for output_rel, page in index['pages'].items():
+        topics = ' '.join(page['topics'])
+        title = page['title']
+
+        # Split documents are indexed from their overview and section pages
+        for position, page_rel in enumerate([output_rel, *page.get('sections', [])]):
+            output_path = Path(study_output) / page_rel
+            if not output_path.exists():
+                continue
+
+            sections = page_sections(output_path)
+            if position == 0:
+                title = next((heading for _, heading, _ in sections if heading), page['title'])
+            url = f'study/{page_rel}'
+
+            for section_position, (anchor, heading, text) in enumerate(sections):
+                fields = [(heading, HEADING_WEIGHT), (text, TEXT_WEIGHT)]
+                # Topics describe the whole page; they are indexed on its first section
+                if position == 0 and section_position == 0:
+                    fields.append((topics, TOPIC_WEIGHT))
+
+                doc = ['page', f'{url}#{anchor}' if anchor else url, title, heading if heading != title else '']
+                yield doc, weighted_terms(fields)
+
+def question_documents(question_sets):
+    """Yield (doc, terms) for every question."""
+    for question_set in question_sets:
+        subtitle = ' · '.join(part for part in (question_set['domain'], question_set['task']) if part)
+
+        for question in question_set['questions']:
+            stem_text = question['question'] or ''
+            options = ' '.join(str(option) for option in question['options'] or [])
+            fields = [
+                (stem_text, STEM_WEIGHT),
+                (options, TEXT_WEIGHT),
+                (question['explanation'] or '', TEXT_WEIGHT),
+                (question_set['task'] or '', TEXT_WEIGHT)
+            ]
+
+            title = stem_text if len(stem_text) <= 160 else stem_text[:157].rstrip() + '...'
+            url = f"exam/index.html#q={quote(question['id'], safe='')}"
+            yield ['question', url, title, subtitle], weighted_terms(fields)
+
+def build_index(documents):
+    """Build the docs list and term -> postings.
+
+    Postings are flat arrays of doc id, score pairs in doc id order; an
+    array takes a fraction of the memory of a list of tuples on large
+    corpora. Scores are BM25 weights scaled to integers, to keep the
+    shards small.
+    """
+    docs = []
+    doc_terms = []
+    for doc, terms in documents:
+        docs.append(doc)
+        doc_terms.append(terms)
+
+    if not docs:
+        return docs, {}
+
+    lengths = [sum(terms.values()) for terms in doc_terms]
+    average_length = sum(lengths) / len(lengths) or 1
+
+    document_frequency = Counter()
+    for terms in doc_terms:
+        document_frequency.update(terms.keys())
+
+    postings = defaultdict(lambda: array('I'))
+    for doc_id, terms in enumerate(doc_terms):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / average_length)
+        for term, frequency in terms.items():
+            df = document_frequency[term]
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            score = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            postings[term].extend((doc_id, max(1, round(score * 100))))
+
+    return docs, postings
+
+def encode_postings(entries):
+    """Delta-encode the doc ids of flat, sorted doc id, score pairs."""
+    encoded = entries.tolist()
+    for i in range(len(encoded) - 2, 0, -2):
+        encoded[i] -= encoded[i - 2]
+    return encoded
+
+def shard_terms(postings):
+    """Yield (prefix, term -> encoded postings) for each term prefix, in order.
+
+    Shards are encoded one at a time, so only one is held as lists.
+    """
+    for prefix, terms in groupby(sorted(postings), key=lambda term: term[:PREFIX_LENGTH]):
+        yield prefix, {term: encode_postings(postings[term]) for term in terms}
+
+def write_hashed(directory, stem_name, data, precompress):
+    """Write data under a content-hashed name and return (name, size)."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    name = f'{stem_name}.{hashlib.sha256(payload).hexdigest()[:10]}.json'
+    path = directory / name
+
+    write_file(path, payload)
+    if precompress:
+        compress.write_sidecars(path, payload)
+    else:
+        compress.remove_sidecars(path)
+    return name, len(payload)
+
+def prune(directory, current):
+    """Remove files left over from earlier indexes, and their sidecars."""
+    for path in directory.iterdir():
+        source = compress.sidecar_source(path) or path
+        if source.name not in current:
+            path.unlink()
+
+def write_search_index(docs, postings, study_output, precompress=False):
+    """Write the sharded index and its manifest. Returns the manifest."""
+    search_dir = Path(study_output) / SEARCH_DIR
+    terms_dir = search_dir / TERMS_DIR
+    docs_dir = search_dir / DOCS_DIR
+    terms_dir.mkdir(parents=True, exist_ok=True)
+    docs_dir.mkdir(parents=True, exist_ok=True)
+
+    term_files = {}
+    total_bytes = 0
+    for prefix, terms in shard_terms(postings):
+        term_files[prefix], size = write_hashed(terms_dir, prefix, terms, precompress)
+        total_bytes += size
+
+    doc_files = []
+    for start in range(0, len(docs), DOC_BLOCK_SIZE):
+        name, size = write_hashed(docs_dir, f'block-{start // DOC_BLOCK_SIZE}', docs[start:start + DOC_BLOCK_SIZE], precompress)
+        doc_files.append(name)
+        total_bytes += size
+
+    prune(terms_dir, set(term_files.values()))
+    prune(docs_dir, set(doc_files))
+
+    manifest = {
+        'version': INDEX_VERSION,
+        'prefixLength': PREFIX_LENGTH,
+        'blockSize': DOC_BLOCK_SIZE,
+        'docCount': len(docs),
+        'termCount': len(postings),
+        'stopwords': sorted(STOPWORDS),
+        'terms': term_files,
+        'docs': doc_files,
+        'bytes': total_bytes
+    }
+
+    manifest_path = search_dir / MANIFEST_NAME
+    questions.write_json(manifest_path, manifest, compact=True, precompress=precompress)
+    return manifest
+
+def index_site(study_output, question_sets, index=None, precompress=False):
+    """Index the converted pages and question_sets and write the index.
+
+    index is passed to page_documents(). Prints a summary and returns the
+    search manifest.
+    """
+    pages = list(page_documents(study_output, index))
+    page_count = len({doc[1].split('#')[0] for doc, _ in pages})
+    docs, postings = build_index(pages + list(question_documents(question_sets)))
+    manifest = write_search_index(docs, postings, study_output, precompress)
+
+    print(f"✓ Indexed {page_count} pages ({len(pages)} sections) and {len(docs) - len(pages)} questions")
+    print(f"  {manifest['termCount']:,} terms in {len(manifest['terms'])} shards, "
+          f"{len(manifest['docs'])} document blocks, {manifest['bytes']:,} bytes")
+    return manifest
+
+def main(precompress=False):
+    """Index the converted pages and the question bank."""
+    question_sets, _ = questions.aggregate_questions(
+        PROJECT_ROOT / 'questions',
+        PROJECT_ROOT / 'exam' / questions.DATA_DIR / questions.CACHE_NAME
+    )
+    index_site(PROJECT_ROOT / 'study', question_sets, precompress=precompress)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Build the study search index.')
+    parser.add_argument('--precompress', action='store_true', help='write .gz/.br sidecar files')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(precompress=args.precompress)
@@ -0,0 +1,204 @@
+"""
+Section-split rendering of large documents.
+
+A split document is rendered as an overview page, holding its
+introduction and a generated table of contents, and one page per heading
+of the split level, next to the overview:
+
+    cheatsheet.html
+    cheatsheet-networking-quick-reference.html
+    cheatsheet-security-patterns.html
+    ...
+
+The Markdown source is split before it is converted, so every section is
+converted (and cached, see sitebuild.rendercache) on its own. Sections
+shorter than MIN_SECTION_BYTES stay with the text before them.
+
+Section pages are named after the anchor the toc extension gives their
+heading, so their URLs are as stable as the heading. Links to an anchor
+of the document are pointed at the page holding it: #anchor links within
+the document here, [[Document#Heading]] links elsewhere through the link
+index (see convert-markdown.py). The overview forwards links of earlier
+builds, such as cheatsheet.html#security-patterns, to the section page.
+"""
+
+import html
+import json
+import posixpath
+import re
+
+from markdown.extensions import toc
+
+SPLIT_LEVEL = 2
+MIN_SECTION_BYTES = 1024
+
+# ATX headings; setext headings are not split on
+MARKDOWN_HEADING_PATTERN = re.compile(r'^(#{1,6})[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$')
+FENCE_PATTERN = re.compile(r'^[ \t]{0,3}(`{3,}|~{3,})')
+HEADING_PATTERN = re.compile(r'<h([1-6]) id="([^"]+)">(.*?)</h\1>', re.S)
+ID_PATTERN = re.compile(r'\bid="([^"]+)"')
+ANCHOR_LINK_PATTERN = re.compile(r'href="#([^"]+)"')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def split_markdown(body, level=SPLIT_LEVEL, min_bytes=MIN_SECTION_BYTES):
+    """Split a Markdown body at its headings of level.
+
+    Returns the introduction, the text before the first such heading, and
+    the sections as dicts with the 'anchor' of their heading, their
+    'markdown' and the 'anchors' of every heading in them.
+    """
+    intro = {'anchor': None, 'lines': [], 'anchors': []}
+    parts = [intro]
+    section_names = set()
+    heading_ids = set()
+    fence = None
+
+    for line in body.splitlines(keepends=True):
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+            parts[-1]['lines'].append(line)
+            continue
+
+        heading = None if fence else MARKDOWN_HEADING_PATTERN.match(line)
+        if heading and len(heading.group(1)) == level:
+            # Each section is converted on its own, so the toc extension
+            # numbers repeated headings per section
+            heading_ids = set()
+            anchor = toc.unique(toc.slugify(heading.group(2), '-'), heading_ids)
+            parts.append({
+                'anchor': toc.unique(anchor, section_names),
+                'lines': [],
+                'anchors': [anchor]
+            })
+        elif heading:
+            parts[-1]['anchors'].append(toc.unique(toc.slugify(heading.group(2), '-'), heading_ids))
+        parts[-1]['lines'].append(line)
+
+    sections = []
+    for part in parts:
+        part['markdown'] = ''.join(part.pop('lines'))
+        if part is not intro and len(part['markdown'].encode('utf-8')) >= min_bytes:
+            sections.append(part)
+            continue
+
+        previous = sections[-1] if sections else intro
+        if previous is not part:
+            previous['markdown'] += part['markdown']
+            previous['anchors'] += part['anchors']
+
+    return intro['markdown'], sections
+
+def section_path(output_rel, anchor):
+    """Return the output path of a section page, next to the overview."""
+    stem, suffix = posixpath.splitext(output_rel)
+    return f'{stem}-{anchor}{suffix}'
+
+def section_outputs(body, output_rel, level=SPLIT_LEVEL):
+    """Map the anchor of every heading in a section to its page's output path."""
+    _, sections = split_markdown(body, level)
+    return {
+        anchor: section_path(output_rel, section['anchor'])
+        for section in sections
+        for anchor in section['anchors']
+    }
+
+def heading_text(fragment):
+    """Return the plain text of a heading's HTML."""
+    return html.unescape(TAG_PATTERN.sub('', fragment)).strip()
+
+def point_anchor_links(content, pages, current):
+    """Point #anchor links at the page of the document holding the anchor."""
+    def replace(match):
+        target = pages.get(match.group(1), current)
+        return match.group(0) if target == current else f'href="{target}#{match.group(1)}"'
+
+    return ANCHOR_LINK_PATTERN.sub(replace, content)
+
+def toc_html(sections, files):
+    """Return the table of contents: each section and the headings below it."""
+    items = []
+
+    for section, name in zip(sections, files):
+        subheadings = [
+            f'<li><a href="{name}#{anchor}">{text}</a></li>'
+            for level, anchor, text in section['headings'][1:]
+            if int(level) == section['level'] + 1
+        ]
+        nested = f'\n<ul>\n{chr(10).join(subheadings)}\n</ul>' if subheadings else ''
+        items.append(f'<li><a href="{name}">{section["title"]}</a>{nested}</li>')
+
+    return (
+        '<nav class="section-toc">\n<h2>Contents</h2>\n<ol>\n'
+        + '\n'.join(items)
+        + '\n</ol>\n</nav>\n'
+    )
+
+def pager_html(overview, title, previous, following):
+    """Return links to the previous and next sections and the overview."""
+    links = [f'<a href="{overview}" class="section-up">{html.escape(title)}</a>']
+    if previous:
+        links.insert(0, f'<a href="{previous[0]}" rel="prev">← {previous[1]}</a>')
+    if following:
+        links.append(f'<a href="{following[0]}" rel="next">{following[1]} →</a>')
+    return f'<nav class="section-pager">\n{chr(10).join(links)}\n</nav>\n'
+
+def redirect_script(pages):
+    """Return a script forwarding overview.html#anchor to the anchor's page."""
+    anchors = {}
+    for anchor, name in pages.items():
+        anchors.setdefault(name, []).append(anchor)
+
+    return (
+        '<script>\n(function () {\n'
+        f'    var pages = {json.dumps(anchors, separators=(",", ":"))};\n'
+        '    var anchor = decodeURIComponent(location.hash.slice(1));\n'
+        '    for (var page in pages) {\n'
+        '        if (pages[page].indexOf(anchor) !== -1) return location.replace(page + location.hash);\n'
+        '    }\n'
+        '})();\n</script>\n'
+    )
+
+def section_pages(output_name, title, intro_html, sections, level=SPLIT_LEVEL):
+    """Lay out a split document as an overview page and its section pages.
+
+    sections are those of split_markdown() with their converted 'html'
+    added. Returns (file name, page title, content) for the overview,
+    then for each section; file names are relative to the overview's
+    directory.
+    """
+    files = [section_path(output_name, section['anchor']) for section in sections]
+
+    for section in sections:
+        section['headings'] = HEADING_PATTERN.findall(section['html'])
+        section['level'] = level
+        section['title'] = section['headings'][0][2] if section['headings'] else html.escape(section['anchor'])
+
+    # The page of every id in the document; the first one wins
+    pages = {}
+    for anchor in ID_PATTERN.findall(intro_html):
+        pages.setdefault(anchor, output_name)
+    for section, name in zip(sections, files):
+        for anchor in ID_PATTERN.findall(section['html']):
+            pages.setdefault(anchor, name)
+
+    moved = {anchor: name for anchor, name in pages.items() if name != output_name}
+    overview = (
+        point_anchor_links(intro_html, pages, output_name)
+        + toc_html(sections, files)
+        + redirect_script(moved)
+    )
+    result = [(output_name, title, overview)]
+
+    for i, (section, name) in enumerate(zip(sections, files)):
+        previous = (files[i - 1], sections[i - 1]['title']) if i > 0 else None
+        following = (files[i + 1], sections[i + 1]['title']) if i + 1 < len(sections) else None
+        pager = pager_html(output_name, title, previous, following)
+        content = pager + point_anchor_links(section['html'], pages, name) + pager
+        result.append((name, f"{heading_text(section['title'])} - {title}", content))
+
+    return result
@@ -0,0 +1,168 @@
+"""
+Page shell shared by every generated study page.
+
+The shell is split into constant chunks once, at import time. Rendering a
+page yields those chunks interleaved with the per-page parts, joined once
+when the page is written.
+"""
+
+import html
+import re
+import textwrap
+
+from sitebuild import assets
+from sitebuild.output import write_file
+
+SLOT_PATTERN = re.compile(r'\{(\w+)\}')
+
+HIGHLIGHT_CSS = 'https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/github-dark.min.css'
+HIGHLIGHT_JS = 'https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js'
+
+# Inline forms of the shared assets, used to measure what they save
+DARK_MODE_SCRIPT = '    <script>\n' + textwrap.indent(assets.DARK_MODE_JS, '        ').rstrip() + '\n    </script>'
+DARK_MODE_TAG = f'    <script src="{{base_path}}/study/{assets.DARK_MODE_PATH}"></script>'
+SIDEBAR_TAG = f'            <script src="{{base_path}}/study/{assets.SIDEBAR_PATH}"></script>'
+
+PAGE_SHELL = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - AWS SA Pro Kit</title>
+    <link rel="stylesheet" href="{base_path}/styles/study.css">{head}
+</head>
+<body>
+    <button id="darkModeToggle" class="dark-mode-toggle" aria-label="Toggle dark mode">
+        <span class="icon">🌙</span>
+    </button>
+
+    <nav class="top-nav">
+        <div class="nav-container">
+            <a href="{base_path}/index.html" class="nav-brand">AWS SA Pro Kit</a>
+            <div class="nav-links">
+                <a href="{base_path}/index.html">Home</a>
+                <a href="{base_path}/study/index.html" class="active">Study Materials</a>
+                <a href="{base_path}/exam/index.html">Practice Exam</a>
+                <a href="https://github.com/bkondakor/aws-sa-pro-kit" target="_blank">GitHub</a>
+            </div>
+        </div>
+    </nav>
+
+    <div class="container">
+        {breadcrumb}
+        <main class="content">
+            <article>
+                {metadata}
+                {content}
+            </article>
+        </main>
+
+        <aside class="sidebar">
+{sidebar}
+        </aside>
+    </div>
+
+    <footer class="footer">
+        <p>AWS Solutions Architect Professional Exam Preparation Kit</p>
+        <p>Last updated: {last_updated}</p>
+    </footer>
+{scripts}
+{dark_mode}{tail}
+</body>
+</html>'''
+
+# highlight.js from the CDN, for builds without Pygments (sitebuild.highlight)
+HIGHLIGHT_HEAD = f'\n    <link rel="stylesheet" href="{HIGHLIGHT_CSS}">'
+HIGHLIGHT_SCRIPTS = f'''
+    <script src="{HIGHLIGHT_JS}"></script>
+    <script>hljs.highlightAll();</script>'''
+HIGHLIGHT_STYLESHEET_TAG = '\n    <link rel="stylesheet" href="{base_path}/study/%s">' % assets.HIGHLIGHT_PATH
+
+def compile_template(source):
+    """Split a template into its literal chunks and the slot names between them."""
+    parts = SLOT_PATTERN.split(source)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+def render(template, values):
+    """Yield the chunks of a compiled template with its slots filled in.
+
+    A value may be a string or any iterable of strings, such as another
+    render() generator, which is streamed in place.
+    """
+    literals, slots = template
+    yield literals[0]
+
+    for slot, literal in zip(slots, literals[1:]):
+        value = values[slot]
+        if isinstance(value, str):
+            yield value
+        else:
+            yield from value
+        yield literal
+
+# The shells are compiled with the dark-mode script tag already in place,
+# so it is part of the constant chunks rather than a slot filled per page
+COMPILED_SHELL = compile_template(PAGE_SHELL.replace('{dark_mode}', DARK_MODE_TAG))
+COMPILED_SIDEBAR_TAG = compile_template(SIDEBAR_TAG)
+
+# Fully inlined variants, as pages were built before the shared assets
+COMPILED_INLINE_SHELL = compile_template(PAGE_SHELL.replace('{dark_mode}', DARK_MODE_SCRIPT))
+COMPILED_INLINE_SIDEBAR = compile_template(assets.STUDY_SIDEBAR)
+
+def render_page(title, content, base_path='..', breadcrumb='', metadata='',
+                sidebar=None, last_updated='2025', highlight=False, tail='',
+                inline_assets=False):
+    """Yield the chunks of a complete page.
+
+    sidebar defaults to the shared study sidebar; highlight, for pages with
+    code blocks, adds the highlighting stylesheet of sitebuild.highlight
+    or, without Pygments, the highlight.js stylesheet and scripts; tail is
+    placed after the scripts.
+    inline_assets embeds the shared assets instead of referencing them.
+    """
+    if sidebar is None:
+        compiled = COMPILED_INLINE_SIDEBAR if inline_assets else COMPILED_SIDEBAR_TAG
+        sidebar = render(compiled, {'base_path': base_path})
+
+    shell = COMPILED_INLINE_SHELL if inline_assets else COMPILED_SHELL
+
+    head = scripts = ''
+    if highlight and assets.HIGHLIGHT_PATH is not None:
+        head = HIGHLIGHT_STYLESHEET_TAG.format(base_path=base_path)
+    elif highlight:
+        head, scripts = HIGHLIGHT_HEAD, HIGHLIGHT_SCRIPTS
+
+    return render(shell, {
+        'title': html.escape(title),
+        'base_path': base_path,
+        'head': head,
+        'breadcrumb': breadcrumb,
+        'metadata': metadata,
+        'content': content,
+        'sidebar': sidebar,
+        'last_updated': last_updated,
+        'scripts': scripts,
+        'tail': tail
+    })
+
+# Inline asset overhead per base path, see inline_asset_overhead()
+_inline_overhead = {}
+
+def inline_asset_overhead(base_path='..'):
+    """Bytes a study page at base_path would carry with its assets inlined."""
+    if base_path not in _inline_overhead:
+        sizes = [
+            sum(len(chunk.encode('utf-8')) for chunk in render_page('', '', base_path, inline_assets=inline))
+            for inline in (True, False)
+        ]
+        _inline_overhead[base_path] = sizes[0] - sizes[1]
+
+    return _inline_overhead[base_path]
+
+def write_page(path, chunks):
+    """Write rendered chunks to a file unless it already holds them.
+
+    The file is replaced atomically, see sitebuild.output. Returns True if
+    it was written.
+    """
+    return write_file(path, ''.join(chunks))
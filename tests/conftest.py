@@ -0,0 +1,7 @@
+"""Make the sitebuild package importable however pytest is started."""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
@@ -0,0 +1,167 @@
+"""Tests of convert-markdown.py builds on small sites under a temporary root."""
+
+import re
+
+import pytest
+
+from sitebuild.build import load_converter
+
+WORDS = [f'word{letter}{other}' for letter in 'abc' for other in 'abcdefghij']
+
+@pytest.fixture
+def converter():
+    return load_converter()
+
+def build(converter, root, force=False):
+    converter.main(force=force, project_root=root, cache_dir=None)
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted((root / 'study').rglob('*.html'))
+    }
+
+def rebuilt(capsys):
+    """Return how many pages the last build printed it rebuilt."""
+    return int(re.findall(r'Rebuilt (\d+) of', capsys.readouterr().out)[-1])
+
+def write_pages(root, pages):
+    comparisons = root / 'comparisons'
+    comparisons.mkdir(parents=True, exist_ok=True)
+    for name, text in pages.items():
+        (comparisons / f'{name}.md').write_text(text, encoding='utf-8')
+
+def test_incremental_build_matches_a_clean_build(converter, tmp_path):
+    # Every term of the first page weighs the same, so which of them count
+    # towards its related pages must not depend on the order they come in
+    write_pages(tmp_path, {
+        'first': '# First\n\n' + ' '.join(reversed(WORDS)) + '\n',
+        'second': '# Second\n\n' + ' '.join(WORDS[:15]) + '\n',
+        'third': '# Third\n\n' + ' '.join(WORDS[15:]) + '\n',
+        'other': '# Other\n\nUnrelated text about something else.\n',
+    })
+    build(converter, tmp_path)
+
+    with open(tmp_path / 'comparisons' / 'other.md', 'a', encoding='utf-8') as f:
+        f.write('\n')
+    incremental = build(converter, tmp_path)
+    clean = build(converter, tmp_path, force=True)
+
+    assert incremental.keys() == clean.keys()
+    assert [path for path in clean if incremental[path] != clean[path]] == []
+
+FINGERPRINTS = {'template': 't1', 'settings': 's1'}
+
+def test_manifest_round_trip(converter, tmp_path):
+    path = tmp_path / 'manifest.json'
+    pages = {'a.md': {'source': 'abc', 'output': 'study/a.html'}}
+    converter.save_manifest(path, FINGERPRINTS, pages)
+
+    assert converter.load_manifest(path, FINGERPRINTS) == pages
+
+@pytest.mark.parametrize('changed', [{'template': 't2'}, {'settings': 's2'}])
+def test_changed_template_or_settings_invalidate_the_manifest(converter, tmp_path, changed):
+    path = tmp_path / 'manifest.json'
+    converter.save_manifest(path, FINGERPRINTS, {'a.md': {}})
+
+    assert converter.load_manifest(path, dict(FINGERPRINTS, **changed)) == {}
+
+def test_unreadable_manifest_is_empty(converter, tmp_path):
+    path = tmp_path / 'manifest.json'
+    assert converter.load_manifest(path, FINGERPRINTS) == {}
+
+    path.write_text('{"version": ')
+    assert converter.load_manifest(path, FINGERPRINTS) == {}
+
+def test_needs_rebuild(converter, tmp_path):
+    output_path = tmp_path / 'a.html'
+    output_path.write_text('<p>A</p>')
+    entry = {'source': 'abc', 'output': 'study/a.html', 'links': {'b.md': ['def', 'study/b.html']}}
+    states = {'b.md': ['def', 'study/b.html']}
+
+    def check(entry=entry, source='abc', output_rel='study/a.html'):
+        return converter.needs_rebuild(entry, source, output_rel, output_path, states.get)
+
+    assert not check()
+    assert check(entry=None)
+    assert check(source='abd')
+    assert check(output_rel='study/moved/a.html')
+
+    states['b.md'] = ['xyz', 'study/b.html']
+    assert check()
+
+    states['b.md'] = ['def', 'study/b.html']
+    output_path.unlink()
+    assert check()
+
+def test_unchanged_pages_are_not_rebuilt(converter, tmp_path, capsys):
+    write_pages(tmp_path, {'first': '# First\n\nOne.\n', 'second': '# Second\n\nTwo.\n'})
+    build(converter, tmp_path)
+    assert rebuilt(capsys) == 2
+
+    build(converter, tmp_path)
+    assert rebuilt(capsys) == 0
+
+    (tmp_path / 'comparisons' / 'second.md').write_text('# Second\n\nTwo, edited.\n')
+    build(converter, tmp_path)
+    assert rebuilt(capsys) == 1
+
+def test_changed_template_rebuilds_every_page(converter, tmp_path, capsys, monkeypatch):
+    write_pages(tmp_path, {'first': '# First\n\nOne.\n', 'second': '# Second\n\nTwo.\n'})
+    build(converter, tmp_path)
+    capsys.readouterr()
+
+    fingerprints = converter.build_fingerprints()
+    monkeypatch.setattr(converter, 'build_fingerprints', lambda: dict(fingerprints, template='changed'))
+    build(converter, tmp_path)
+    assert rebuilt(capsys) == 2
+
+LINK_INDEX = {
+    'domain-1-organizational-complexity/task-1.1.md': 'domain-1/task-1.1.html',
+    'AWS-SA-PRO-CHEATSHEET.md': 'cheatsheet.html',
+    'AWS-SA-PRO-CHEATSHEET.md#security-patterns': 'cheatsheet-security-patterns.html',
+}
+
+def test_wiki_links_resolve_through_the_index(converter):
+    html = converter.convert_wiki_links(
+        '[[domain-1-organizational-complexity/task-1.1|Task 1.1]] and [[AWS-SA-PRO-CHEATSHEET]]',
+        LINK_INDEX, '../'
+    )
+
+    assert html == ('<a href="../domain-1/task-1.1.html">Task 1.1</a> and '
+                    '<a href="../cheatsheet.html">Aws Sa Pro Cheatsheet</a>')
+
+def test_wiki_link_anchors_follow_split_sections(converter):
+    html = converter.convert_wiki_links(
+        '[[AWS-SA-PRO-CHEATSHEET#Security Patterns|SCPs]] [[AWS-SA-PRO-CHEATSHEET#Other|x]]', LINK_INDEX
+    )
+
+    assert html == ('<a href="cheatsheet-security-patterns.html#security-patterns">SCPs</a> '
+                    '<a href="cheatsheet.html#other">x</a>')
+
+def test_missing_wiki_link_targets_get_a_guessed_path(converter):
+    html = converter.convert_wiki_links('[[domain-2-new-solutions/task-2.9|Later]]', LINK_INDEX)
+
+    assert html == '<a href="domain-2/task-2.9.html">Later</a>'
+
+def test_link_index_maps_split_sections(converter):
+    pages = [
+        {'source_rel': 'a.md', 'output_rel': 'a.html'},
+        {'source_rel': 'b.md', 'output_rel': 'b.html', 'sections': {'part': 'b-part.html'}},
+    ]
+
+    assert converter.build_link_index(pages) == {'a.md': 'a.html', 'b.md': 'b.html', 'b.md#part': 'b-part.html'}
+
+def test_dangling_links_are_reported_and_edited_targets_rebuild_linkers(converter, tmp_path, capsys):
+    write_pages(tmp_path, {
+        'first': '# First\n\nSee [[comparisons/second]] and [[comparisons/missing]].\n',
+        'second': '# Second\n\nTwo.\n',
+        'third': '# Third\n\nThree.\n',
+    })
+    build(converter, tmp_path)
+    out = capsys.readouterr().out
+
+    assert '1 broken wiki link(s)' in out
+    assert 'comparisons/first.md → [[comparisons/missing.md]]' in out
+
+    (tmp_path / 'comparisons' / 'second.md').write_text('# Second\n\nTwo, edited.\n')
+    build(converter, tmp_path)
+    assert rebuilt(capsys) == 2
@@ -0,0 +1,57 @@
+"""Tests of the frontmatter scanner and its parse cache."""
+
+import pytest
+
+from sitebuild import frontmatter
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    frontmatter._cache.clear()
+    yield
+    frontmatter._cache.clear()
+
+def test_frontmatter_and_body():
+    meta, body = frontmatter.parse_frontmatter('---\ntitle: VPC\ntopics: [a, b]\n---\n# VPC\n')
+
+    assert meta == {'title': 'VPC', 'topics': ['a', 'b']}
+    assert body == '# VPC\n'
+
+def test_rules_in_the_body_are_not_fences():
+    content = '---\ntitle: VPC\n---\nIntro\n\n---\n\nMore\n'
+
+    assert frontmatter.parse_frontmatter(content) == ({'title': 'VPC'}, 'Intro\n\n---\n\nMore\n')
+
+def test_early_rule_is_content_not_frontmatter():
+    content = '---\nJust a paragraph between two rules.\n---\nMore\n'
+
+    assert frontmatter.parse_frontmatter(content) == ({}, content)
+
+@pytest.mark.parametrize('content', [
+    '--- not a fence\ntitle: x\n---\n',
+    '---\ntitle: never closed\n',
+    '# Title\n---\ntitle: x\n---\n',
+])
+def test_no_frontmatter(content):
+    assert frontmatter.split_frontmatter(content) == (None, 0)
+    assert frontmatter.parse_frontmatter(content) == ({}, content)
+
+def test_yaml_end_marker_closes_the_block():
+    assert frontmatter.parse_frontmatter('---\ntitle: x\n...\nBody') == ({'title': 'x'}, 'Body')
+
+def test_invalid_yaml_leaves_the_document_alone():
+    content = '---\ntitle: [unclosed\n---\nBody\n'
+
+    assert frontmatter.parse_frontmatter(content) == ({}, content)
+
+def test_empty_block_and_closing_fence_at_the_end():
+    assert frontmatter.parse_frontmatter('---\n---') == ({}, '')
+
+def test_seeded_cache_skips_the_yaml_parse(monkeypatch):
+    yaml_text = 'title: Cached\n'
+    frontmatter.seed_cache({frontmatter.frontmatter_hash(yaml_text): {'title': 'Cached'}})
+
+    def fail(*args, **kwargs):
+        raise AssertionError('parsed again')
+    monkeypatch.setattr(frontmatter.yaml, 'load', fail)
+
+    assert frontmatter.parse_frontmatter(f'---\n{yaml_text}---\nBody') == ({'title': 'Cached'}, 'Body')
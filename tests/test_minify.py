@@ -0,0 +1,61 @@
+"""Tests that minified pages and stylesheets are equivalent to the originals."""
+
+from pathlib import Path
+
+import pytest
+
+from sitebuild import minify
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+PAGE = '''<!DOCTYPE html>
+<html>
+  <head>
+    <style>
+      body { margin: 0 ;  color:  #333; }
+    </style>
+  </head>
+  <body>
+    <p>Some    text
+       across lines</p>
+    <pre>  keep
+    this </pre>
+    <script>  var a  =  1;  </script>
+  </body>
+</html>
+'''
+
+def test_html_whitespace_collapses_outside_raw_elements():
+    minified = minify.minify_html(PAGE)
+
+    assert '<p>Some text\nacross lines</p>' in minified
+    assert '<pre>  keep\n    this </pre>' in minified
+    assert '<script>  var a  =  1;  </script>' in minified
+    assert '<style>body{margin:0;color:#333}</style>' in minified
+    assert minify.html_equivalent(PAGE, minified)
+
+def test_css_keeps_significant_spaces_and_strings():
+    source = '/* note */\na  >  b { border: 1px  solid red; content: "a  b" ; }\n@media (max-width: 600px) { a { x: y } }'
+    minified = minify.minify_css(source)
+
+    assert minified == 'a>b{border:1px solid red;content:"a  b"}@media (max-width:600px){a{x:y}}'
+    assert minify.css_equivalent(source, minified)
+
+def test_space_before_a_colon_is_kept_for_selectors():
+    assert minify.minify_css('a :hover { x: y }') == 'a :hover{x:y}'
+
+def test_changed_output_is_not_equivalent():
+    assert not minify.html_equivalent('<p>a b</p>', '<p>ab</p>')
+    assert not minify.html_equivalent('<pre>a  b</pre>', '<pre>a b</pre>')
+    assert not minify.css_equivalent('a { margin: 0 auto }', 'a{margin:0auto}')
+
+@pytest.mark.parametrize('rel_path', ['index.html', 'styles/study.css'])
+def test_repository_files_minify_to_equivalent_smaller_files(rel_path):
+    data = (PROJECT_ROOT / rel_path).read_bytes()
+    minified, rejected = minify.minify_file(rel_path, data)
+
+    assert not rejected
+    assert len(minified) < len(data)
+
+def test_other_files_are_left_alone():
+    assert minify.minify_file('exam/app.js', b'var  a;') == (b'var  a;', False)
@@ -0,0 +1,54 @@
+"""Tests of the atomic, skip-unchanged output writer."""
+
+import os
+
+import pytest
+
+from sitebuild import output
+
+def test_unchanged_file_is_not_rewritten(tmp_path):
+    path = tmp_path / 'page.html'
+    assert output.write_file(path, '<p>é</p>')
+    os.utime(path, ns=(1, 1))
+
+    assert not output.write_file(path, '<p>é</p>'.encode('utf-8'))
+    assert path.stat().st_mtime_ns == 1
+
+    assert output.write_file(path, '<p>e</p>')
+    assert path.read_text(encoding='utf-8') == '<p>e</p>'
+
+def test_writes_leave_no_temporary_files(tmp_path):
+    output.write_file(tmp_path / 'a.json', b'{}')
+    output.write_file(tmp_path / 'a.json', b'[]')
+
+    assert [path.name for path in tmp_path.iterdir()] == ['a.json']
+    assert (tmp_path / 'a.json').stat().st_mode & 0o777 == output.FILE_MODE
+
+def test_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / 'a.html'
+    path.write_bytes(b'old')
+
+    def fail(source, target):
+        raise OSError('disk full')
+    monkeypatch.setattr(output.os, 'replace', fail)
+
+    with pytest.raises(OSError):
+        output.write_file(path, b'new')
+    assert path.read_bytes() == b'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['a.html']
+
+@pytest.mark.parametrize('threads', [0, 2])
+def test_writer_records_written_and_unchanged(tmp_path, threads):
+    (tmp_path / 'same.html').write_bytes(b'same')
+
+    with output.OutputWriter(threads) as writer:
+        writer.write(tmp_path / 'same.html', b'same')
+        writer.write(tmp_path / 'new.html', b'new')
+
+    assert writer.written == [tmp_path / 'new.html']
+    assert writer.unchanged == [tmp_path / 'same.html']
+
+def test_writer_raises_the_first_error(tmp_path):
+    with pytest.raises(OSError):
+        with output.OutputWriter(2) as writer:
+            writer.write(tmp_path / 'missing-dir' / 'a.html', b'a')
@@ -0,0 +1,55 @@
+"""Tests of the publish stage's link resolution and output directory handling."""
+
+import pytest
+
+from sitebuild import publish
+
+def test_resolve_relative_and_absolute_links():
+    assert publish.resolve('study/domain-1/page.html', '../index.html') == 'study/index.html'
+    assert publish.resolve('study/domain-1/page.html', 'other.html#top') == 'study/domain-1/other.html'
+    assert publish.resolve('study/page.html', '/styles/main.css') == 'styles/main.css'
+    assert publish.resolve('study/page.html', 'domain-2/') == 'study/domain-2/index.html'
+    assert publish.resolve('study/page.html', 'a%20b.html') == 'study/a b.html'
+
+def test_resolve_leaves_out_external_anchor_and_escaping_links():
+    assert publish.resolve('study/page.html', 'https://aws.amazon.com/') is None
+    assert publish.resolve('study/page.html', '//cdn.example.com/x.js') is None
+    assert publish.resolve('study/page.html', '#section') is None
+    assert publish.resolve('study/page.html', '../../outside.html') is None
+
+def test_resolve_root_is_the_entry_page():
+    assert publish.resolve('study/page.html', '..') == publish.ENTRY_PAGE
+
+def site(root):
+    (root / 'study').mkdir(parents=True)
+    (root / 'index.html').write_text('<a href="study/a.html">A</a>')
+    (root / 'study' / 'a.html').write_text('<p>A</p>')
+    return root
+
+@pytest.mark.parametrize('output', ['.', '..', 'study', 'study/dist', 'questions'])
+def test_refuses_the_repository_and_its_sources(tmp_path, output):
+    root = site(tmp_path / 'repo')
+
+    with pytest.raises(ValueError):
+        publish.publish(root, root / output, ['index.html'])
+    assert (root / 'study' / 'a.html').exists()
+
+def test_refuses_a_directory_it_did_not_publish(tmp_path):
+    root = site(tmp_path / 'repo')
+    (root / 'notes').mkdir()
+    (root / 'notes' / 'draft.md').write_text('draft')
+
+    with pytest.raises(ValueError, match='holds no'):
+        publish.publish(root, root / 'notes', ['index.html'])
+    assert (root / 'notes' / 'draft.md').exists()
+
+def test_republishing_removes_only_what_is_no_longer_published(tmp_path):
+    root = site(tmp_path / 'repo')
+    output = root / 'dist'
+    publish.publish(root, output, ['index.html', 'study/a.html'])
+
+    manifest = publish.publish(root, output, ['index.html'])
+
+    assert manifest['files'] == {'index.html': len('<a href="study/a.html">A</a>')}
+    assert sorted(path.relative_to(output).as_posix() for path in output.rglob('*')) == \
+        [publish.MANIFEST_NAME, 'index.html']
@@ -0,0 +1,57 @@
+"""Tests of question bank validation and of what reads invalid questions."""
+
+import json
+
+import pytest
+
+from sitebuild import questionbank, questions, related, search
+
+VALID = {'question': 'Which service?', 'options': ['A', 'B'], 'correctAnswer': 0, 'explanation': 'A.'}
+
+def write_bank(directory, **files):
+    for name, content in files.items():
+        (directory / f'{name}.json').write_text(json.dumps(content), encoding='utf-8')
+    return directory
+
+def errors(issues):
+    return [(entry['location'], entry['message']) for entry in issues if entry['severity'] == 'error']
+
+def test_valid_question_has_no_problems():
+    assert questionbank.check_question(VALID) == []
+
+def test_null_fields_are_errors():
+    problems = dict((message, severity) for severity, message in
+                    questionbank.check_question(dict(VALID, question=None, options=None)))
+
+    assert problems["missing or empty 'question'"] == 'error'
+    assert problems["'options' must be a list of at least two options"] == 'error'
+
+def test_multi_select_needs_two_answers():
+    problems = questionbank.check_question(dict(VALID, type='multiple', correctAnswer=[1]))
+
+    assert [severity for severity, _ in problems] == ['error']
+
+def test_non_object_file_and_question_are_reported(tmp_path):
+    write_bank(tmp_path, listed=[VALID], mixed={'questions': [VALID, 'not a question']})
+    records, issues = questionbank.load_bank(tmp_path)
+
+    assert len(records) == 1
+    assert errors(issues) == [
+        ('listed.json', 'top level is not an object'),
+        ('mixed.json [no task] #2', 'question is not an object'),
+    ]
+
+def test_aggregation_names_the_file_of_a_non_object(tmp_path):
+    write_bank(tmp_path, mixed={'questions': [VALID, ['not', 'a', 'question']]})
+
+    with pytest.raises(ValueError, match=r'mixed\.json: \[no task\] #2: question is not an object'):
+        questions.aggregate_questions(tmp_path)
+
+def test_null_fields_do_not_break_search_and_related():
+    question = {'id': 'q-1', 'question': None, 'options': None, 'explanation': None}
+    question_set = {'domain': 'Domain 1', 'task': '', 'questions': [question]}
+
+    [(doc, terms)] = search.question_documents([question_set])
+    assert doc[:3] == ['question', 'exam/index.html#q=q-1', '']
+    assert not terms
+    assert not related.question_terms(question)
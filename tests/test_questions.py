@@ -0,0 +1,114 @@
+"""Tests of question aggregation and the exam data written from it."""
+
+import json
+
+from sitebuild import questions
+
+def question(text, answer=0):
+    return {'question': text, 'options': ['A', 'B'], 'correctAnswer': answer, 'explanation': ''}
+
+def write_bank(directory, **files):
+    for name, content in files.items():
+        (directory / f'{name}.json').write_text(json.dumps(content), encoding='utf-8')
+    return directory
+
+def test_normalize_domain_and_task_spellings():
+    assert questions.normalize_domain('Domain 2 - New Solutions') == questions.DOMAIN_NAMES['2']
+    assert questions.normalize_domain('Mixed Domains - Networking') == 'Mixed Domains: Networking'
+    assert questions.normalize_domain(None) == 'Uncategorized'
+    assert questions.normalize_task('task_2.2_business_continuity') == 'Task 2.2: Business Continuity'
+    assert questions.normalize_task(' Task 1.1: Networking ') == 'Task 1.1: Networking'
+
+def test_question_hash_ignores_whitespace_and_ids():
+    first = {'id': 'a', 'question': 'Which  service?', 'options': ['A ', 'B'], 'correctAnswer': 0}
+    second = {'id': 'b', 'question': 'Which service?\n', 'options': ['A', 'B'], 'correctAnswer': 0}
+    third = dict(second, correctAnswer=1)
+
+    assert questions.question_hash(first) == questions.question_hash(second)
+    assert questions.question_hash(second) != questions.question_hash(third)
+    assert questions.question_hash({'question': None, 'options': None})
+
+def test_normalize_question_fills_the_schema():
+    question, digest = questions.normalize_question({
+        'question': 'Pick two', 'options': ['A', 'B', 'C'], 'correctAnswer': [0, 2]
+    })
+
+    assert list(question) == questions.QUESTION_FIELDS
+    assert question['id'] == f'q-{digest[:12]}'
+    assert question['type'] == 'multiple'
+    assert question['explanation'] == ''
+
+def test_aggregation_reads_every_layout(tmp_path):
+    write_bank(
+        tmp_path,
+        flat={'domain': 'Domain 1', 'task': 'Task 1.1: Networking', 'questions': [question('One?')]},
+        nested={'domain': 'Domain 2 - New Solutions', 'tasks': {'task_2.1_deployment': {'questions': [question('Two?')]}}},
+        legacy={'domain': 'Domain 3', 'task_3.1_operations': {'questions': [question('Three?')]}},
+    )
+    question_sets, stats = questions.aggregate_questions(tmp_path)
+
+    assert [(s['filename'], s['domain'], s['task'], s['taskId']) for s in question_sets] == [
+        ('flat.json', questions.DOMAIN_NAMES['1'], 'Task 1.1: Networking', '1.1'),
+        ('legacy.json', questions.DOMAIN_NAMES['3'], 'Task 3.1: Operations', '3.1'),
+        ('nested.json', questions.DOMAIN_NAMES['2'], 'Task 2.1: Deployment', '2.1'),
+    ]
+    assert stats == {'files': 3, 'read': 3, 'duplicates': 0}
+
+def test_aggregation_keeps_the_first_copy_of_a_question(tmp_path):
+    write_bank(
+        tmp_path,
+        a={'domain': 'Domain 1', 'questions': [question('Same?'), question('Other?')]},
+        b={'domain': 'Domain 1', 'questions': [question(' Same? ')]},
+    )
+    question_sets, stats = questions.aggregate_questions(tmp_path)
+
+    assert [[q['question'] for q in s['questions']] for s in question_sets] == [['Same?', 'Other?']]
+    assert stats['duplicates'] == 1
+
+def test_aggregation_rereads_only_changed_files(tmp_path):
+    bank = tmp_path / 'questions'
+    bank.mkdir()
+    write_bank(bank, a={'questions': [question('A?')]}, b={'questions': [question('B?')]})
+    cache = tmp_path / 'cache.json'
+    questions.aggregate_questions(bank, cache)
+
+    write_bank(bank, b={'questions': [question('B?'), question('C?')]})
+    question_sets, stats = questions.aggregate_questions(bank, cache)
+
+    assert stats['read'] == 1
+    assert [s['question_count'] for s in question_sets] == [1, 2]
+
+def test_exam_pools_split_a_full_exam_by_weight():
+    counts = {name: 100 for name in questions.DOMAIN_WEIGHTS}
+    counts['Mixed Domains: Networking'] = 50
+    pools = questions.exam_pools(counts)
+
+    assert [pool['domain'] for pool in pools][:4] == list(questions.DOMAIN_WEIGHTS)
+    assert sum(pool['quota'] for pool in pools) == questions.EXAM_LENGTH
+    assert pools[-1]['quota'] == 0
+
+def test_exam_pools_fill_from_mixed_sets_when_domains_run_out():
+    pools = questions.exam_pools({questions.DOMAIN_NAMES['1']: 10, 'Mixed Domains: All': 100})
+
+    assert [pool['quota'] for pool in pools] == [10, questions.EXAM_LENGTH - 10]
+
+def test_blueprint_positions_are_contiguous_by_domain(tmp_path):
+    question_sets = [
+        {'domain': 'Mixed Domains: All', 'questions': [question(f'Mixed {n}?') for n in range(3)]},
+        {'domain': questions.DOMAIN_NAMES['2'], 'questions': [question(f'Two {n}?') for n in range(30)]},
+        {'domain': questions.DOMAIN_NAMES['1'], 'questions': [question(f'One {n}?') for n in range(5)]},
+    ]
+    blueprint = questions.write_exam_blueprint(question_sets, tmp_path)
+    data_dir = tmp_path / questions.DATA_DIR
+
+    assert [(pool['domain'], pool['start'], pool['count']) for pool in blueprint['pools']] == [
+        (questions.DOMAIN_NAMES['1'], 0, 5),
+        (questions.DOMAIN_NAMES['2'], 5, 30),
+        ('Mixed Domains: All', 35, 3),
+    ]
+    assert blueprint['examLength'] == 38
+
+    # Position n is entry n % BLOCK_SIZE of block n // BLOCK_SIZE
+    position = blueprint['pools'][2]['start']
+    block = json.loads((data_dir / blueprint['blocks'] / f'{position // questions.BLOCK_SIZE}.json').read_text())
+    assert block['questions'][position % questions.BLOCK_SIZE]['question'] == 'Mixed 0?'
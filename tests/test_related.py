@@ -0,0 +1,58 @@
+"""Tests of the related-content vectors and nearest-neighbour lookup."""
+
+from collections import Counter
+
+from sitebuild import related
+
+def test_vectorize_is_unit_length_and_capped():
+    idf = related.idf_table([Counter({'a': 1, 'b': 1}), Counter({'a': 1, 'c': 3})])
+    vector = related.vectorize(Counter({'a': 1, 'b': 2, 'c': 1, 'unknown': 5}), idf, max_terms=2)
+
+    assert len(vector) == 2
+    assert 'unknown' not in dict(vector)
+    assert abs(sum(weight * weight for _, weight in vector) - 1) < 1e-9
+
+def test_nearest_ranks_by_similarity_and_excludes():
+    vectors = [
+        [('vpc', 1.0)],
+        [('vpc', 0.8), ('peering', 0.6)],
+        [('s3', 1.0)],
+    ]
+    postings = related.inverted_index(vectors)
+
+    assert related.nearest(vectors[0], postings, 2) == [0, 1]
+    assert related.nearest(vectors[0], postings, 2, exclude=0) == [1]
+    assert related.nearest([('lambda', 1.0)], postings, 2) == []
+
+def test_related_pages_never_relate_a_page_to_itself():
+    pages = {
+        'vpc.md': Counter({'vpc': 3, 'peering': 2, 'subnet': 1}),
+        'tgw.md': Counter({'vpc': 2, 'transit': 3, 'gateway': 2}),
+        's3.md': Counter({'bucket': 3, 'object': 2}),
+    }
+    result = related.related_pages(pages)
+
+    assert result['vpc.md'] == ['tgw.md']
+    assert all(key not in others for key, others in result.items())
+
+def test_equal_weights_are_cut_by_term():
+    idf = {term: 1.0 for term in 'abcd'}
+
+    assert [term for term, _ in related.vectorize(Counter(dict.fromkeys('dcba', 1)), idf, max_terms=2)] == ['a', 'b']
+
+def test_equal_scores_rank_by_id():
+    vectors = [[('vpc', 1.0)], [('vpc', 1.0)], [('vpc', 1.0)]]
+    postings = related.inverted_index(vectors)
+
+    assert related.nearest(vectors[0], postings, 3, exclude=0) == [1, 2]
+
+def test_related_pages_ignore_the_order_of_terms():
+    words = [f'word{number:02}' for number in range(30)]
+    pages = {
+        'first.md': Counter(dict.fromkeys(reversed(words), 1)),
+        'second.md': Counter(dict.fromkeys(words[:15], 1)),
+        'third.md': Counter(dict.fromkeys(words[15:], 1)),
+    }
+    reordered = {key: Counter(dict(sorted(terms.items()))) for key, terms in pages.items()}
+
+    assert related.related_pages(pages) == related.related_pages(reordered)
@@ -0,0 +1,37 @@
+"""Tests of the content-addressed render cache and its LRU eviction."""
+
+import os
+
+from sitebuild import rendercache
+
+def test_entries_are_keyed_by_source_and_salt(tmp_path):
+    cache = rendercache.RenderCache(tmp_path, salt='v1')
+    cache.put('# A', '<h1>A</h1>')
+
+    assert cache.get('# A') == '<h1>A</h1>'
+    assert cache.get('# B') is None
+    assert rendercache.RenderCache(tmp_path, salt='v2').get('# A') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = rendercache.RenderCache(tmp_path, max_bytes=25)
+    for number, source in enumerate(['old', 'used', 'new']):
+        cache.put(source, 'x' * 10)
+        path = cache.path(cache.key(source))
+        os.utime(path, ns=(number * 10**9, number * 10**9))
+
+    # Reading an entry makes it the most recently used
+    assert cache.get('old') == 'x' * 10
+
+    assert cache.prune() == (2, 20, 1)
+    assert cache.get('used') is None
+    assert cache.get('old') == 'x' * 10
+    assert cache.get('new') == 'x' * 10
+
+def test_unwritable_cache_is_ignored(tmp_path):
+    blocker = tmp_path / 'cache'
+    blocker.write_text('a file where the directory should be')
+    cache = rendercache.RenderCache(blocker)
+
+    cache.put('# A', '<h1>A</h1>')
+    assert cache.get('# A') is None
@@ -0,0 +1,60 @@
+"""Tests of the search index: terms, BM25 postings and the sharded files."""
+
+import json
+from collections import Counter
+
+from sitebuild import search
+
+def test_tokenize_drops_stopwords_and_stems_plurals():
+    assert search.tokenize('The Transit Gateways and policies of S3 buckets') == \
+        ['transit', 'gateway', 'policy', 's3', 'bucket']
+
+def test_tokenize_keeps_words_that_only_look_plural():
+    assert search.tokenize('access status analysis') == ['access', 'status', 'analysis']
+
+def test_build_index_scores_rarer_terms_higher():
+    docs, postings = search.build_index([
+        (['page', 'a.html', 'A', ''], Counter({'vpc': 2, 'peering': 1})),
+        (['page', 'b.html', 'B', ''], Counter({'vpc': 1, 'endpoint': 1})),
+    ])
+
+    assert [doc[1] for doc in docs] == ['a.html', 'b.html']
+    assert list(postings['vpc'][::2]) == [0, 1]
+    assert list(postings['peering'][::2]) == [0]
+    assert all(score >= 1 for entries in postings.values() for score in entries[1::2])
+    assert postings['peering'][1] > postings['vpc'][1]
+
+def test_encode_postings_delta_encodes_doc_ids():
+    postings = search.build_index([
+        (['page', str(doc_id), '', ''], Counter({'vpc': 1})) for doc_id in range(4)
+    ])[1]['vpc']
+    encoded = search.encode_postings(postings)
+
+    assert encoded[::2] == [0, 1, 1, 1]
+    assert encoded[1::2] == list(postings[1::2])
+
+def test_build_index_of_nothing():
+    assert search.build_index([]) == ([], {})
+
+def test_question_results_link_to_the_question():
+    question = {'id': 'q 1/2', 'question': 'Which VPC option?', 'options': ['A', 'B'], 'explanation': ''}
+    [(doc, terms)] = search.question_documents([{'domain': 'Domain 1', 'task': '', 'questions': [question]}])
+
+    assert doc[:3] == ['question', 'exam/index.html#q=q%201%2F2', 'Which VPC option?']
+    assert terms['vpc'] == search.STEM_WEIGHT
+
+def test_index_is_sharded_by_prefix_and_old_shards_pruned(tmp_path):
+    docs, postings = search.build_index([
+        (['page', 'a.html', 'A', ''], Counter({'vpc': 1, 'vpn': 1, 'bucket': 1})),
+    ])
+    manifest = search.write_search_index(docs, postings, tmp_path)
+    terms_dir = tmp_path / search.SEARCH_DIR / search.TERMS_DIR
+
+    assert sorted(manifest['terms']) == ['bu', 'vp']
+    shard = json.loads((terms_dir / manifest['terms']['vp']).read_text())
+    assert shard == {'vpc': [0, postings['vpc'][1]], 'vpn': [0, postings['vpn'][1]]}
+
+    docs, postings = search.build_index([(['page', 'a.html', 'A', ''], Counter({'vpc': 1}))])
+    manifest = search.write_search_index(docs, postings, tmp_path)
+
+    assert sorted(path.name for path in terms_dir.iterdir()) == list(manifest['terms'].values())
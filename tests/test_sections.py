@@ -0,0 +1,76 @@
+"""Tests of splitting large documents into section pages."""
+
+from sitebuild import sections
+
+def document(*parts):
+    return ''.join(parts)
+
+def test_split_at_the_split_level():
+    intro, parts = sections.split_markdown(document(
+        '# Cheatsheet\n\nIntro.\n\n',
+        '## Networking\n\nVPCs.\n\n### Transit Gateway\n\nHubs.\n\n',
+        '## Security\n\nSCPs.\n',
+    ), min_bytes=0)
+
+    assert intro == '# Cheatsheet\n\nIntro.\n\n'
+    assert [(part['anchor'], part['anchors']) for part in parts] == [
+        ('networking', ['networking', 'transit-gateway']),
+        ('security', ['security']),
+    ]
+    assert parts[1]['markdown'] == '## Security\n\nSCPs.\n'
+
+def test_short_sections_stay_with_the_text_before_them():
+    intro, parts = sections.split_markdown(document(
+        '## Long\n\n' + 'word ' * 20 + '\n\n',
+        '## Short\n\nx\n',
+    ), min_bytes=50)
+
+    assert intro == ''
+    assert [part['anchor'] for part in parts] == ['long']
+    assert parts[0]['anchors'] == ['long', 'short']
+    assert parts[0]['markdown'].endswith('## Short\n\nx\n')
+
+def test_headings_in_code_fences_do_not_split():
+    _, parts = sections.split_markdown(document(
+        '## Commands\n\n```bash\n## not a heading\n```\n\n',
+        '## Next\n\nText.\n',
+    ), min_bytes=0)
+
+    assert [part['anchor'] for part in parts] == ['commands', 'next']
+    assert '## not a heading' in parts[0]['markdown']
+
+def test_repeated_section_headings_get_unique_pages():
+    _, parts = sections.split_markdown('## Tips\n\nA.\n\n## Tips\n\nB.\n', min_bytes=0)
+
+    assert [part['anchor'] for part in parts] == ['tips', 'tips_1']
+    assert sections.section_path('study/cheatsheet.html', 'tips_1') == 'study/cheatsheet-tips_1.html'
+
+def test_section_outputs_map_every_heading():
+    text = 'word ' * (sections.MIN_SECTION_BYTES // 5) + '\n\n'
+    body = f'Intro.\n\n## Networking\n\n{text}### Transit Gateway\n\nHubs.\n\n## Security\n\n{text}'
+
+    assert sections.section_outputs(body, 'cheatsheet.html') == {
+        'networking': 'cheatsheet-networking.html',
+        'transit-gateway': 'cheatsheet-networking.html',
+        'security': 'cheatsheet-security.html',
+    }
+
+def test_section_pages_link_toc_pager_and_moved_anchors():
+    parts = [
+        {'anchor': 'networking', 'html': '<h2 id="networking">Networking</h2>\n<p>See <a href="#security">SCPs</a></p>'},
+        {'anchor': 'security', 'html': '<h2 id="security">Security</h2>\n<h3 id="scps">SCPs</h3>'},
+    ]
+    pages = sections.section_pages('cheatsheet.html', 'Cheatsheet', '<p><a href="#scps">x</a></p>', parts)
+
+    assert [(name, title) for name, title, _ in pages] == [
+        ('cheatsheet.html', 'Cheatsheet'),
+        ('cheatsheet-networking.html', 'Networking - Cheatsheet'),
+        ('cheatsheet-security.html', 'Security - Cheatsheet'),
+    ]
+    overview, networking, security = (content for _, _, content in pages)
+
+    assert 'href="cheatsheet-security.html#scps"' in overview
+    assert '<a href="cheatsheet-security.html#scps">SCPs</a>' in overview
+    assert 'href="cheatsheet-security.html#security"' in networking
+    assert 'rel="next"' in networking and 'rel="prev"' not in networking
+    assert 'rel="prev"' in security and 'rel="next"' not in security